@@ -1,45 +1,136 @@
 __all__ = (
+    'AIMD',
+    'AdaptiveLimiter',
     'Body',
+    'BodyCache',
     'ClientBase',
     'ClientArgs',
+    'Chunking',
+    'Columnar',
+    'ConcurrencyLimitExceeded',
+    'ConsistentHash',
     'Cookie',
+    'DeadlineExceeded',
     'lapidary_user_agent',
     'Form',
     'FormExplode',
+    'Gradient',
+    'H11Transport',
     'Header',
+    'HedgePolicy',
     'HttpErrorResponse',
     'HttpxMiddleware',
     'LapidaryError',
+    'Lazy',
+    'LeastOutstanding',
+    'LoadBalancer',
+    'MemoryProfiler',
     'LapidaryResponseError',
     'Metadata',
     'ModelBase',
     'NamedAuth',
+    'OutlierEjection',
     'Path',
+    'PoolGroup',
+    'PowerOfTwoChoices',
+    'PreparedCall',
+    'Priority',
+    'PriorityScheduler',
+    'Projection',
     'Query',
+    'RequestShed',
     'Response',
     'Responses',
+    'RoundRobin',
     'SecurityRequirements',
     'SessionFactory',
+    'ShardedClient',
     'SimpleMultimap',
     'SimpleString',
+    'StaleWhileRevalidate',
     'StatusCode',
     'UnexpectedResponse',
+    'Vegas',
+    'deadline',
     'delete',
+    'expand',
     'get',
     'head',
     'iter_pages',
+    'materialize',
     'patch',
     'post',
+    'priority',
     'put',
     'trace',
 )
 
+import importlib
+
+import typing_extensions as typing
+
 from .annotations import Body, Cookie, Header, Metadata, Path, Query, Response, Responses, StatusCode
 from .client_base import ClientBase, lapidary_user_agent
 from .middleware import HttpxMiddleware
 from .model import ModelBase
-from .model.error import HttpErrorResponse, LapidaryError, LapidaryResponseError, UnexpectedResponse
+from .model.chunking import Chunking
+from .model.columnar import Columnar
+from .model.deadline import deadline
+from .model.error import (
+    ConcurrencyLimitExceeded,
+    DeadlineExceeded,
+    HttpErrorResponse,
+    LapidaryError,
+    LapidaryResponseError,
+    RequestShed,
+    UnexpectedResponse,
+)
+from .model.lazy import Lazy, materialize
+from .model.op import PreparedCall
 from .model.param_serialization import Form, FormExplode, SimpleMultimap, SimpleString
+from .model.pool import PoolGroup
+from .model.projection import Projection
+from .model.swr import StaleWhileRevalidate
 from .operation import delete, get, head, patch, post, put, trace
-from .paging import iter_pages
 from .types_ import ClientArgs, NamedAuth, SecurityRequirements, SessionFactory
+
+if typing.TYPE_CHECKING:
+    from .expansion import expand
+    from .model.balancer import ConsistentHash, LeastOutstanding, LoadBalancer, OutlierEjection, PowerOfTwoChoices, RoundRobin
+    from .model.body_cache import BodyCache
+    from .model.hedge import HedgePolicy
+    from .model.limiter import AIMD, AdaptiveLimiter, Gradient, Vegas
+    from .model.memprof import MemoryProfiler
+    from .model.scheduler import Priority, PriorityScheduler, priority
+    from .model.transport import H11Transport
+    from .paging import iter_pages
+    from .sharding import ShardedClient
+
+# optional features, imported on first use to keep importing the package cheap
+_LAZY_MODULES = {
+    'expand': '.expansion',
+    'BodyCache': '.model.body_cache',
+    'HedgePolicy': '.model.hedge',
+    'MemoryProfiler': '.model.memprof',
+    'H11Transport': '.model.transport',
+    'iter_pages': '.paging',
+    'ShardedClient': '.sharding',
+    **dict.fromkeys(
+        ('ConsistentHash', 'LeastOutstanding', 'LoadBalancer', 'OutlierEjection', 'PowerOfTwoChoices', 'RoundRobin'), '.model.balancer'
+    ),
+    **dict.fromkeys(('AIMD', 'AdaptiveLimiter', 'Gradient', 'Vegas'), '.model.limiter'),
+    **dict.fromkeys(('Priority', 'PriorityScheduler', 'priority'), '.model.scheduler'),
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    module_name = _LAZY_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -8,6 +8,9 @@ import typing_extensions as typing
 from .model.param_serialization import FormExplode, MultimapSerializationStyle, SimpleMultimap, SimpleString, StringSerializationStyle
 from .types_ import MimeType, StatusCodeRange
 
+if typing.TYPE_CHECKING:
+    from .model.chunking import Chunking
+
 
 class WebArg(abc.ABC):
     pass
@@ -73,9 +76,11 @@ class Query(Param):
         /,
         *,
         style: type[MultimapSerializationStyle] = FormExplode,
+        chunking: typing.Optional['Chunking'] = None,
     ) -> None:
         super().__init__(alias)
         self.style = style
+        self.chunking = chunking
 
 
 @dc.dataclass
@@ -1,9 +1,12 @@
 __all__ = [
+    'ClientCredentialsAuth',
     'CookieApiKey',
     'HeaderApiKey',
     'QueryApiKey',
+    'RefreshableAuth',
 ]
 
 from httpx_auth import HeaderApiKey, QueryApiKey
 
 from .model.api_key import CookieApiKey
+from .model.refresh_auth import ClientCredentialsAuth, RefreshableAuth
@@ -0,0 +1,285 @@
+"""
+Offline load generator, measuring the client-side overhead of Lapidary.
+
+Drives a `ClientBase` subclass against an in-process stand-in of an API server, either `httpx.MockTransport`
+or an ASGI application, and reports throughput, latency percentiles and CPU time per request.
+The built-in sample client is used, unless a client factory and an operation are given.
+
+    python -m lapidary.runtime.bench --concurrency 20 --requests 10000 --payload-items 50 --json
+    python -m lapidary.runtime.bench --client my_api.bench:mk_client --operation my_api.bench:get_cat
+"""
+
+import argparse
+import asyncio
+import dataclasses as dc
+import functools as ft
+import importlib
+import json
+import math
+import random
+import sys
+import time
+from collections.abc import Awaitable, Callable, MutableMapping, Sequence
+
+import httpx
+import pydantic
+import typing_extensions as typing
+
+from .annotations import Body, Query, Response, Responses
+from .client_base import ClientBase
+from .model.error import HttpErrorResponse
+from .operation import get
+
+
+class Item(pydantic.BaseModel):
+    id: int
+    name: str
+    tags: list[str]
+
+
+class Error(pydantic.BaseModel):
+    message: str
+
+
+class BenchClient(ClientBase):
+    """Sample client, the stand-in responds to `list_items` with `size` items."""
+
+    @get('/items')
+    async def list_items(  # type: ignore[empty-body]
+        self: typing.Self,
+        size: typing.Annotated[int, Query],
+    ) -> typing.Annotated[
+        tuple[list[Item], None],
+        Responses(
+            {
+                '2XX': Response(Body({'application/json': list[Item]})),
+                '5XX': Response(Body({'application/json': Error})),
+            }
+        ),
+    ]:
+        pass
+
+
+@dc.dataclass(frozen=True)
+class BenchConfig:
+    requests: int = 1000
+    """Number of measured requests."""
+    concurrency: int = 10
+    """Number of concurrent callers."""
+    payload_items: int = 10
+    """Number of items in each response body, unless the request has the `size` query parameter."""
+    delay: float = 0.0
+    """Server-side delay of each response, in seconds."""
+    error_rate: float = 0.0
+    """Fraction of responses with status 500."""
+    warmup: int = 100
+    """Number of requests made before measuring."""
+    transport: typing.Literal['mock', 'asgi'] = 'mock'
+    seed: int = 0
+
+
+@dc.dataclass
+class BenchResult:
+    config: BenchConfig
+    latencies: list[float]
+    errors: int
+    wall_time: float
+    cpu_time: float
+
+    def summary(self) -> dict[str, typing.Any]:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            'config': dc.asdict(self.config),
+            'requests': count,
+            'errors': self.errors,
+            'wall_time': self.wall_time,
+            'throughput': count / self.wall_time if self.wall_time else 0.0,
+            'cpu_per_request': self.cpu_time / count if count else 0.0,
+            'latency': {
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'p99': percentile(latencies, 99),
+                'max': latencies[-1] if latencies else 0.0,
+            },
+        }
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+ClientFactory: typing.TypeAlias = Callable[[httpx.AsyncBaseTransport], ClientBase]
+"""Creates the benchmarked client, given the transport of the stand-in server."""
+
+Operation: typing.TypeAlias = Callable[[typing.Any], Awaitable[typing.Any]]
+"""Makes one call with the client, e.g. `lambda client: client.get_cat(id=1)`."""
+
+
+class _StandIn:
+    """
+    Stand-in API server, shared by both transports.
+
+    Responds to any request with a JSON array of `size` items, taken from the query parameter, or `payload_items` by default.
+    """
+
+    def __init__(self, config: BenchConfig) -> None:
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.bodies: dict[int, bytes] = {}
+        self.error_body = json.dumps({'message': 'error'}).encode()
+
+    def body(self, size: typing.Optional[str]) -> bytes:
+        count = int(size) if size is not None and size.isdigit() else self.config.payload_items
+        try:
+            return self.bodies[count]
+        except KeyError:
+            body = json.dumps([{'id': idx, 'name': f'item {idx}', 'tags': ['a', 'b']} for idx in range(count)]).encode()
+            self.bodies[count] = body
+            return body
+
+    async def respond(self, size: typing.Optional[str]) -> tuple[int, bytes]:
+        if self.config.delay:
+            await asyncio.sleep(self.config.delay)
+        if self.config.error_rate and self.random.random() < self.config.error_rate:
+            return 500, self.error_body
+        return 200, self.body(size)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        status, body = await self.respond(request.url.params.get('size'))
+        return httpx.Response(status, content=body, headers={'Content-Type': 'application/json'})
+
+    async def __call__(
+        self,
+        scope: MutableMapping[str, typing.Any],
+        receive: Callable[[], Awaitable[MutableMapping[str, typing.Any]]],
+        send: Callable[[MutableMapping[str, typing.Any]], Awaitable[None]],
+    ) -> None:
+        """ASGI application interface."""
+        status, body = await self.respond(httpx.QueryParams(scope['query_string'].decode()).get('size'))
+        await send({'type': 'http.response.start', 'status': status, 'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': body})
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        if self.config.transport == 'asgi':
+            return httpx.ASGITransport(app=self)
+        return httpx.MockTransport(self.handle)
+
+
+def _bench_client(transport: httpx.AsyncBaseTransport) -> ClientBase:
+    return BenchClient(base_url='http://bench.local', transport=transport)
+
+
+async def run(
+    config: BenchConfig,
+    client_factory: ClientFactory = _bench_client,
+    operation: typing.Optional[Operation] = None,
+) -> BenchResult:
+    """
+    Measure `operation` called with the client made by `client_factory`, by default `list_items` of the sample client.
+
+    The factory gets the transport of the stand-in server; clients that use their own transport, e.g. to serve other payloads,
+    can ignore it. Operation calls that raise `HttpErrorResponse` are counted as errors.
+    """
+    stand_in = _StandIn(config)
+    if operation is None:
+        if client_factory is not _bench_client:
+            raise TypeError('operation is required with a client_factory')
+        operation = ft.partial(_list_items, size=config.payload_items)
+    async with client_factory(stand_in.transport()) as client:
+        await _drive(client, operation, config, config.warmup, [])
+
+        latencies: list[float] = []
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        errors = await _drive(client, operation, config, config.requests, latencies)
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+    return BenchResult(config, latencies, errors, wall_time, cpu_time)
+
+
+def _list_items(client: BenchClient, size: int) -> Awaitable[typing.Any]:
+    return client.list_items(size=size)
+
+
+async def _drive(client: ClientBase, operation: Operation, config: BenchConfig, count: int, latencies: list[float]) -> int:
+    remaining = count
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                await operation(client)
+            except HttpErrorResponse:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[worker() for _ in range(max(min(config.concurrency, count), 1))])
+    return errors
+
+
+def _import(spec: str) -> typing.Any:
+    """Import `module:name`."""
+    module, _, name = spec.partition(':')
+    if not name:
+        raise argparse.ArgumentTypeError(f'expected module:name, got {spec!r}')
+    return getattr(importlib.import_module(module), name)
+
+
+def _format(summary: dict[str, typing.Any]) -> str:
+    latency = summary['latency']
+    return '\n'.join(
+        (
+            f'requests:     {summary["requests"]} ({summary["errors"]} errors)',
+            f'throughput:   {summary["throughput"]:.1f} req/s',
+            f'latency p50:  {latency["p50"] * 1000:.3f} ms',
+            f'latency p95:  {latency["p95"] * 1000:.3f} ms',
+            f'latency p99:  {latency["p99"] * 1000:.3f} ms',
+            f'latency max:  {latency["max"] * 1000:.3f} ms',
+            f'cpu/request:  {summary["cpu_per_request"] * 1_000_000:.1f} µs',
+        )
+    )
+
+
+def main(argv: typing.Optional[Sequence[str]] = None) -> int:
+    defaults = BenchConfig()
+    parser = argparse.ArgumentParser(prog='python -m lapidary.runtime.bench', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--requests', type=int, default=defaults.requests)
+    parser.add_argument('-c', '--concurrency', type=int, default=defaults.concurrency)
+    parser.add_argument('--payload-items', type=int, default=defaults.payload_items, help='items in each response body')
+    parser.add_argument('--delay', type=float, default=defaults.delay, help='server-side delay, in seconds')
+    parser.add_argument('--error-rate', type=float, default=defaults.error_rate, help='fraction of 500 responses')
+    parser.add_argument('--warmup', type=int, default=defaults.warmup)
+    parser.add_argument('--transport', choices=('mock', 'asgi'), default=defaults.transport)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--client', type=_import, help='module:function creating the client, given the stand-in transport')
+    parser.add_argument('--operation', type=_import, help='module:function making one call, given the client')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args(argv)
+
+    config = BenchConfig(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        payload_items=args.payload_items,
+        delay=args.delay,
+        error_rate=args.error_rate,
+        warmup=args.warmup,
+        transport=args.transport,
+        seed=args.seed,
+    )
+    if args.client is not None and args.operation is None:
+        parser.error('--client requires --operation')
+    summary = asyncio.run(run(config, args.client or _bench_client, args.operation)).summary()
+    print(json.dumps(summary, indent=2) if args.json else _format(summary))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
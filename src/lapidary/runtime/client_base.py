@@ -1,24 +1,37 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import concurrent.futures
+import copy
+import functools as ft
 import logging
 
 import httpx
 import typing_extensions as typing
 
-from .http_consts import USER_AGENT
 from .middleware import HttpxMiddleware
 from .model.auth import AuthRegistry
+from .model.op import OperationPlan, PreparedCall, find_plans
+from .model.pool import PoolGroup, SessionRegistry
+from .model.swr import Refresher
 
 if typing.TYPE_CHECKING:
     import types
-    from collections.abc import Iterable, Sequence
-
+    from collections.abc import Awaitable, Callable, Iterable, Mapping, MutableMapping, Sequence
+
+    from .model.balancer import LoadBalancer
+    from .model.body_cache import BodyCache
+    from .model.hedge import Hedger
+    from .model.limiter import AdaptiveLimiter
+    from .model.memprof import MemoryProfiler
+    from .model.scheduler import PriorityScheduler
     from .types_ import ClientArgs, NamedAuth, SecurityRequirements, SessionFactory
 
 logger = logging.getLogger(__name__)
 
 
+@ft.cache
 def lapidary_user_agent() -> str:
     from importlib.metadata import version
 
@@ -31,17 +44,47 @@ class ClientBase(abc.ABC):
         security: Iterable[SecurityRequirements] | None = None,
         session_factory: SessionFactory = httpx.AsyncClient,
         middlewares: Sequence[HttpxMiddleware] = (),
+        pools: Mapping[str, PoolGroup] | None = None,
+        deadline_header: str | None = None,
+        memory_profiler: MemoryProfiler | None = None,
+        offload_threshold: int | None = None,
+        offload_executor: concurrent.futures.Executor | None = None,
+        load_balancer: LoadBalancer | None = None,
+        limiter: AdaptiveLimiter | None = None,
+        body_cache: BodyCache | None = None,
+        scheduler: PriorityScheduler | None = None,
         **httpx_kwargs: typing.Unpack[ClientArgs],
     ) -> None:
-        self._client = session_factory(**httpx_kwargs)
-        if USER_AGENT not in self._client.headers:
-            self._client.headers[USER_AGENT] = lapidary_user_agent()
+        if load_balancer is not None and 'base_url' not in httpx_kwargs:
+            httpx_kwargs['base_url'] = load_balancer.endpoints[0].url
+        self._sessions = SessionRegistry(session_factory, httpx_kwargs, pools or {})
 
         self._auth_registry = AuthRegistry(security)
+        self._default_headers = httpx.Headers()
+        self._view_of: ClientBase | None = None
+        self._refresher = Refresher()
         self._middlewares = middlewares
+        self._hedgers: MutableMapping[str, Hedger] = {}
+        self._deadline_header = deadline_header
+        self._memory_profiler = memory_profiler
+
+        if isinstance(offload_executor, concurrent.futures.ProcessPoolExecutor):
+            raise TypeError('Response handlers cannot be sent to other processes, use a thread pool executor')
+        self._offload_threshold = offload_threshold
+        self._offload_executor = offload_executor
+        self._load_balancer = load_balancer
+        self._limiter = limiter
+        self._body_cache = body_cache
+        self._scheduler = scheduler
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """The default session, re-created after fork or event loop change."""
+        return self._sessions.default
 
     async def __aenter__(self: typing.Self) -> typing.Self:
-        await self._client.__aenter__()
+        if self._view_of is None:
+            await self._client.__aenter__()
         return self
 
     async def __aexit__(
@@ -50,8 +93,71 @@ class ClientBase(abc.ABC):
         exc_value: BaseException | None = None,
         traceback: types.TracebackType | None = None,
     ) -> bool | None:
+        await self._refresher.aclose()
+        await self._auth_registry.aclose()
+        if self._view_of is not None:
+            # sessions belong to the parent client
+            return None
+        await self._sessions.aclose()
         return await self._client.__aexit__(exc_type, exc_value, traceback)
 
+    def lapidary_view(
+        self: typing.Self,
+        headers: Mapping[str, str] | None = None,
+        security: Iterable[SecurityRequirements] | None = None,
+    ) -> typing.Self:
+        """
+        Create a view of this client, e.g. for a tenant, with its own authentication and default headers.
+
+        The view shares sessions, connection pools and everything else with this client, and closing it doesn't close them.
+        Headers passed to operation methods take precedence over the default headers.
+        """
+        view = copy.copy(self)
+        view._view_of = self
+        view._auth_registry = AuthRegistry(security if security is not None else self._auth_registry._security)
+        view._default_headers = httpx.Headers(self._default_headers)
+        # cached results depend on authentication
+        view._refresher = Refresher()
+        if headers:
+            view._default_headers.update(headers)
+        return view
+
+    def lapidary_prepare(self, method: Callable[..., Awaitable[typing.Any]], /, **bound: typing.Any) -> PreparedCall:
+        """
+        Prepare calls of an operation method with some arguments bound, e.g. `client.lapidary_prepare(client.get_cat, tenant='a')`.
+
+        The bound arguments are validated and serialized once. The returned callable accepts the remaining arguments
+        and returns the same result as calling the method with all of them.
+        """
+        plan = getattr(method, 'lapidary_plan', None)
+        if not isinstance(plan, OperationPlan):
+            raise TypeError('Not an operation method', method)
+        return PreparedCall(self, plan.prepare(self, bound))
+
+    async def lapidary_warm_up(self, connections: int = 1, urls: Iterable[str | httpx.URL] = (), method: str = 'HEAD') -> None:
+        """
+        Prepare the client for traffic, e.g. before reporting readiness.
+
+        Builds validators that are otherwise built when handling the first response, like those of lazily validated fields.
+        Opens `connections` connections to the base URL in the default session and in the sessions of configured pool groups,
+        and to each load balancer endpoint and each of `urls` in the default session.
+        Connections are opened by sending `method` requests concurrently, their response status is ignored. Over HTTP/2,
+        concurrent requests to an origin share a single connection, so only one is opened.
+        """
+        for plan in find_plans(type(self)):
+            plan.warm_up()
+
+        self._sessions.ensure_owner()
+        requests: list[typing.Awaitable[httpx.Response]] = []
+        for session in self._sessions.configured_sessions():
+            if session.base_url.host:
+                requests.extend(session.request(method, '') for _ in range(connections))
+        if self._load_balancer is not None:
+            urls = [*(endpoint.url for endpoint in self._load_balancer.endpoints), *urls]
+        for url in urls:
+            requests.extend(self._sessions.default.request(method, url) for _ in range(connections))
+        await asyncio.gather(*requests)
+
     def lapidary_authenticate(self, *auth_args: NamedAuth, **auth_kwargs: httpx.Auth) -> None:
         """Register named Auth instances for future use with methods that require authentication."""
         if auth_args:
@@ -0,0 +1,58 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any, Optional, TypeVar
+
+T = TypeVar('T')
+K = TypeVar('K', bound=Hashable)
+R = TypeVar('R')
+
+
+async def expand(
+    items: Iterable[T],
+    get_ref: Callable[[T], Optional[K]],
+    fn: Callable[..., Awaitable[R]],
+    param_name: str,
+    /,
+    *,
+    concurrency: Optional[int] = 10,
+    **kwargs: Any,
+) -> dict[K, R]:
+    """
+    Fetch resources referenced by the items, e.g. of a list result, concurrently, instead of one at a time.
+
+    Each distinct reference extracted by :param:`get_ref` is passed once to :param:`fn` as :param:`param_name`,
+    together with :param:`kwargs`. If any call fails, the remaining ones are cancelled and the error is raised.
+
+    **Example:**
+
+    .. code:: python
+
+        cats, _ = await client.list_cats()
+        owners = await expand(cats, lambda cat: cat.owner_id, client.get_person, 'person_id', concurrency=5)
+        for cat in cats:
+            owner, _ = owners[cat.owner_id]
+
+    :param items: Items holding the references.
+    :param get_ref: A function that extracts the reference, e.g. an ID or a link, from an item. Items with `None` are skipped.
+    :param fn: An async function that fetches a referenced resource, typically an operation method.
+    :param param_name: The name of the parameter of :param:`fn` that takes the reference.
+    :param concurrency: Maximum number of calls in flight, or `None` for no limit.
+    :return: A mapping of references to the results of :param:`fn`, in order of their first occurrence.
+    """
+
+    refs = list(dict.fromkeys(ref for item in items if (ref := get_ref(item)) is not None))
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def fetch(ref: K) -> R:
+        if semaphore is None:
+            return await fn(**kwargs, **{param_name: ref})
+        async with semaphore:
+            return await fn(**kwargs, **{param_name: ref})
+
+    tasks = [asyncio.ensure_future(fetch(ref)) for ref in refs]
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return dict(zip(refs, results))
@@ -1,24 +1,54 @@
+import dataclasses as dc
 from collections.abc import Iterable, Mapping, MutableMapping
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import httpx
 
 from .._httpx import AuthType
-from ..types_ import MultiAuth, SecurityRequirements
+from ..types_ import SecurityRequirements
+
+if TYPE_CHECKING:
+    from ..types_ import MultiAuth
+    from .refresh_auth import RefreshableAuth
+
+
+@dc.dataclass(frozen=True)
+class _ResolvedAuth:
+    auth: httpx.Auth
+    schemes: frozenset[str]
+    """Names of all schemes in the security requirements, used to decide which cache entries to drop."""
+    refreshable: tuple['RefreshableAuth', ...]
 
 
 class AuthRegistry:
     def __init__(self, security: Optional[Iterable[SecurityRequirements]]):
         # Every Auth instance the user code authenticated with
-        self._auth: MutableMapping[str, httpx.Auth] = {}
+        self._auth: Mapping[str, httpx.Auth] = {}
 
         # (Multi)Auth instance for every operation and the client
-        self._auth_cache: MutableMapping[str, httpx.Auth] = {}
+        self._auth_cache: MutableMapping[str, _ResolvedAuth] = {}
 
         # Client-wide security requirements
         self._security = security
 
     def resolve_auth(self, name: str, security: Optional[Iterable[SecurityRequirements]]) -> AuthType:
+        resolved = self._resolve(name, security)
+        return resolved.auth if resolved else None
+
+    async def refresh_auth(self, name: str, security: Optional[Iterable[SecurityRequirements]]) -> None:
+        """Make sure the refreshable Auth instances used by the operation have valid tokens."""
+        resolved = self._resolve(name, security)
+        if resolved:
+            for auth in resolved.refreshable:
+                await auth.ensure_token()
+
+    async def aclose(self) -> None:
+        """Stop the token refreshes of the refreshable Auth instances used by the operations."""
+        refreshable = {id(auth): auth for resolved in self._auth_cache.values() for auth in resolved.refreshable}
+        for auth in refreshable.values():
+            await auth.aclose()
+
+    def _resolve(self, name: str, security: Optional[Iterable[SecurityRequirements]]) -> Optional[_ResolvedAuth]:
         if security:
             sec_name = name
             sec_source = security
@@ -32,15 +62,15 @@ class AuthRegistry:
         if sec_source:
             assert sec_name
             if sec_name not in self._auth_cache:
-                auth = self._mk_auth(sec_source)
-                self._auth_cache[sec_name] = auth
+                resolved = self._mk_auth(sec_source)
+                self._auth_cache[sec_name] = resolved
             else:
-                auth = self._auth_cache[sec_name]
-            return auth
+                resolved = self._auth_cache[sec_name]
+            return resolved
         else:
             return None
 
-    def _mk_auth(self, security: Iterable[SecurityRequirements]) -> httpx.Auth:
+    def _mk_auth(self, security: Iterable[SecurityRequirements]) -> _ResolvedAuth:
         security = list(security)
         assert security
         last_error: Optional[Exception] = None
@@ -55,22 +85,38 @@ class AuthRegistry:
             assert last_error
             # due to asserts and break above, we never enter here, unless ValueError was raised
             raise last_error  # noqa
-        return auth
+        # httpx_auth is imported only once it's needed
+        from .refresh_auth import RefreshableAuth
+
+        return _ResolvedAuth(
+            auth,
+            frozenset(scheme for requirements in security for scheme in requirements),
+            tuple(flow for flow in auth.authentication_modes if isinstance(flow, RefreshableAuth)),
+        )
 
     def authenticate(self, auth_models: Mapping[str, httpx.Auth]) -> None:
-        self._auth.update(auth_models)
-        self._auth_cache.clear()
+        # Build new mappings and swap them, so concurrent calls see either the old or the new state,
+        # and keep the resolved Auth of operations that don't use any of the changed schemes.
+        auth = {**self._auth, **auth_models}
+        self._auth_cache, self._auth = self._evict(auth_models.keys()), auth
 
     def deauthenticate(self, sec_names: Iterable[str]) -> None:
         if sec_names:
+            auth = dict(self._auth)
             for sec_name in sec_names:
-                del self._auth[sec_name]
+                del auth[sec_name]
+            self._auth_cache, self._auth = self._evict(sec_names), auth
         else:
-            self._auth.clear()
-        self._auth_cache.clear()
+            self._auth_cache, self._auth = {}, {}
+
+    def _evict(self, sec_names: Iterable[str]) -> MutableMapping[str, _ResolvedAuth]:
+        changed = frozenset(sec_names)
+        return {name: resolved for name, resolved in self._auth_cache.items() if not resolved.schemes & changed}
+
 
+def _build_auth(schemes: Mapping[str, httpx.Auth], requirements: SecurityRequirements) -> 'MultiAuth':
+    from ..types_ import MultiAuth
 
-def _build_auth(schemes: Mapping[str, httpx.Auth], requirements: SecurityRequirements) -> httpx.Auth:
     auth_flows = []
     for scheme, scopes in requirements.items():
         auth_flow = schemes.get(scheme)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import abc
+import bisect
+import dataclasses as dc
+import hashlib
+import itertools
+import random
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+
+import httpx
+
+
+@dc.dataclass(eq=False)
+class Endpoint:
+    """State of a single replica, as seen by this client."""
+
+    url: httpx.URL
+    outstanding: int = 0
+    """Number of requests in flight."""
+    latency: float = 0.0
+    """Moving average of response time, in seconds."""
+    failures: int = 0
+    """Number of consecutive failures."""
+    ejections: int = 0
+    ejected_until: float = 0.0
+
+
+class Strategy(abc.ABC):
+    """Chooses the endpoint for a request from the ones that are not ejected."""
+
+    @abc.abstractmethod
+    def choose(self, endpoints: Sequence[Endpoint], request: httpx.Request) -> Endpoint:
+        pass
+
+
+class RoundRobin(Strategy):
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def choose(self, endpoints: Sequence[Endpoint], request: httpx.Request) -> Endpoint:
+        return endpoints[next(self._counter) % len(endpoints)]
+
+
+class LeastOutstanding(Strategy):
+    """Choose the endpoint with the fewest requests in flight, rotating between ties."""
+
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def choose(self, endpoints: Sequence[Endpoint], request: httpx.Request) -> Endpoint:
+        offset = next(self._counter)
+        size = len(endpoints)
+        return min((endpoints[(offset + idx) % size] for idx in range(size)), key=lambda endpoint: endpoint.outstanding)
+
+
+class PowerOfTwoChoices(Strategy):
+    """Pick two random endpoints and choose the one with fewer requests in flight, or the faster one if even."""
+
+    def __init__(self, seed: int | None = None) -> None:
+        self._random = random.Random(seed)
+
+    def choose(self, endpoints: Sequence[Endpoint], request: httpx.Request) -> Endpoint:
+        if len(endpoints) == 1:
+            return endpoints[0]
+        first, second = self._random.sample(endpoints, 2)
+        return min(first, second, key=lambda endpoint: (endpoint.outstanding, endpoint.latency))
+
+
+def _default_key(request: httpx.Request) -> str:
+    return request.url.path
+
+
+class ConsistentHash(Strategy):
+    """
+    Route requests with the same key to the same endpoint, e.g. to make better use of server-side caches.
+
+    When an endpoint is ejected, only the keys routed to it move to other endpoints.
+    """
+
+    def __init__(self, key: Callable[[httpx.Request], str] = _default_key, replicas: int = 100) -> None:
+        self.key = key
+        self.replicas = replicas
+        self._ring: tuple[tuple[Endpoint, ...], list[int], list[Endpoint]] | None = None
+
+    def choose(self, endpoints: Sequence[Endpoint], request: httpx.Request) -> Endpoint:
+        hashes, ring_endpoints = self._get_ring(tuple(endpoints))
+        idx = bisect.bisect(hashes, _hash(self.key(request))) % len(hashes)
+        return ring_endpoints[idx]
+
+    def _get_ring(self, endpoints: tuple[Endpoint, ...]) -> tuple[list[int], list[Endpoint]]:
+        ring = self._ring
+        if ring is None or ring[0] != endpoints:
+            points = sorted(
+                (_hash(f'{endpoint.url}#{idx}'), endpoint_idx)
+                for endpoint_idx, endpoint in enumerate(endpoints)
+                for idx in range(self.replicas)
+            )
+            ring = endpoints, [point for point, _ in points], [endpoints[endpoint_idx] for _, endpoint_idx in points]
+            self._ring = ring
+        return ring[1], ring[2]
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big')
+
+
+@dc.dataclass(frozen=True)
+class OutlierEjection:
+    """
+    Passive health checking. Responses with status 5xx, transport errors and, if `max_latency` is set, slower responses
+    count as failures. After `consecutive_failures` of them, the endpoint is not used for `ejection_time` seconds,
+    multiplied by the number of its recent ejections.
+    """
+
+    consecutive_failures: int = 5
+    max_latency: float | None = None
+    ejection_time: float = 30.0
+    max_ejected_ratio: float = 0.5
+    """Never eject more than this fraction of endpoints."""
+
+
+class LoadBalancer:
+    """Client-side load balancing of requests across replicas of an API, each with its own base URL."""
+
+    def __init__(
+        self,
+        endpoints: Iterable[str | httpx.URL],
+        strategy: Strategy | None = None,
+        ejection: OutlierEjection | None = OutlierEjection(),
+    ) -> None:
+        self.endpoints = [Endpoint(_with_trailing_slash(httpx.URL(url))) for url in endpoints]
+        if not self.endpoints:
+            raise ValueError('At least one endpoint is required')
+        self.strategy = strategy or RoundRobin()
+        self.ejection = ejection
+
+    def available(self) -> Sequence[Endpoint]:
+        now = time.monotonic()
+        return [endpoint for endpoint in self.endpoints if endpoint.ejected_until <= now] or self.endpoints
+
+    async def send(
+        self,
+        request: httpx.Request,
+        base_url: httpx.URL,
+        send: Callable[[httpx.Request], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        endpoint = self.strategy.choose(self.available(), request)
+        _rewrite(request, base_url, endpoint.url)
+        endpoint.outstanding += 1
+        start = time.monotonic()
+        try:
+            response = await send(request)
+        except httpx.TransportError:
+            self._record(endpoint, True, time.monotonic() - start)
+            raise
+        finally:
+            endpoint.outstanding -= 1
+        latency = time.monotonic() - start
+        self._record(endpoint, response.status_code >= 500 or self._too_slow(latency), latency)
+        return response
+
+    def _too_slow(self, latency: float) -> bool:
+        return self.ejection is not None and self.ejection.max_latency is not None and latency > self.ejection.max_latency
+
+    def _record(self, endpoint: Endpoint, failed: bool, latency: float) -> None:
+        endpoint.latency = latency if not endpoint.latency else 0.8 * endpoint.latency + 0.2 * latency
+        if not failed:
+            endpoint.failures = 0
+            endpoint.ejections = max(endpoint.ejections - 1, 0)
+            return
+
+        endpoint.failures += 1
+        ejection = self.ejection
+        if ejection is None or endpoint.failures < ejection.consecutive_failures:
+            return
+        now = time.monotonic()
+        ejected = sum(1 for endpoint_ in self.endpoints if endpoint_.ejected_until > now)
+        if ejected + 1 > ejection.max_ejected_ratio * len(self.endpoints):
+            return
+        endpoint.failures = 0
+        endpoint.ejections += 1
+        endpoint.ejected_until = now + ejection.ejection_time * endpoint.ejections
+
+
+def _with_trailing_slash(url: httpx.URL) -> httpx.URL:
+    return url if url.raw_path.endswith(b'/') else url.copy_with(raw_path=url.raw_path + b'/')
+
+
+def _rewrite(request: httpx.Request, base_url: httpx.URL, endpoint: httpx.URL) -> None:
+    """Point the request, built against the client base URL, at the endpoint."""
+    raw_path = request.url.raw_path
+    base_path = base_url.raw_path
+    if base_path and raw_path.startswith(base_path):
+        raw_path = endpoint.raw_path + raw_path[len(base_path) :]
+    request.url = request.url.copy_with(scheme=endpoint.scheme, netloc=endpoint.netloc, raw_path=raw_path)
+    request.headers['Host'] = request.url.netloc.decode('ascii')
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import collections
+from collections.abc import Callable, Hashable, Iterable
+
+import pydantic
+import typing_extensions as typing
+
+Encoded: typing.TypeAlias = tuple[str, bytes]
+"""Media type and the encoded body."""
+
+
+class BodyCache:
+    """
+    Cache of encoded request bodies, shared by all operations of a client, so a body sent many times is encoded once.
+
+    Only bodies that are instances of frozen pydantic models or of `immutable_types` are cached. They're keyed by identity,
+    so they must not be mutated after they're first sent. Up to `max_entries` most recently used bodies are kept alive by the cache.
+    """
+
+    def __init__(self, max_entries: int = 128, immutable_types: Iterable[type] = ()) -> None:
+        if max_entries < 1:
+            raise ValueError('max_entries must be positive', max_entries)
+        self.max_entries = max_entries
+        self.immutable_types = tuple(immutable_types)
+        self._entries: collections.OrderedDict[tuple[int, Hashable], tuple[typing.Any, Encoded]] = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def is_immutable(self, value: typing.Any) -> bool:
+        if isinstance(value, pydantic.BaseModel) and type(value).model_config.get('frozen'):
+            return True
+        return isinstance(value, self.immutable_types)
+
+    def encode(self, value: typing.Any, key: Hashable, dump: Callable[[], Encoded]) -> Encoded:
+        """Return the cached encoding of the value, or dump and cache it. `key` identifies the media type and serializers."""
+        if not self.is_immutable(value):
+            return dump()
+        cache_key = id(value), key
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(cache_key)
+            return entry[1]
+
+        self.misses += 1
+        encoded = dump()
+        # keep the value alive, so its id isn't reused while cached
+        self._entries[cache_key] = value, encoded
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return encoded
+
+    def clear(self) -> None:
+        self._entries.clear()
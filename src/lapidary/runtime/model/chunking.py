@@ -0,0 +1,125 @@
+import asyncio
+import dataclasses as dc
+import itertools
+import urllib.parse
+from collections.abc import Awaitable, Callable, Sequence
+
+import pydantic
+import typing_extensions as typing
+
+from ..annotations import Query, WebArg
+from ..metattype import make_not_optional
+from ..types_ import Signature
+from .annotations import find_annotation
+
+if typing.TYPE_CHECKING:
+    from ..client_base import ClientBase
+    from .request import QueryContributor, RequestAdapter
+
+Result: typing.TypeAlias = tuple[typing.Any, typing.Any]
+
+
+def concat_results(results: Sequence[Result]) -> Result:
+    """Concatenate list bodies of the chunk results. Metadata of the first result is returned."""
+    bodies = [body for body, _ in results]
+    if not all(isinstance(body, (list, tuple)) for body in bodies):
+        raise TypeError('Default merge supports only list bodies, provide Chunking.merge')
+    return list(itertools.chain.from_iterable(bodies)), results[0][1]
+
+
+@dc.dataclass(frozen=True)
+class Chunking:
+    """
+    Split a large array query parameter into multiple requests, sent concurrently, and merge their results.
+
+    A chunk is limited to `max_items` items and to the URL length of `max_url_length` characters, whichever is hit first.
+    """
+
+    max_items: typing.Optional[int] = None
+    max_url_length: typing.Optional[int] = None
+    concurrency: typing.Optional[int] = None
+    merge: Callable[[Sequence[Result]], Result] = concat_results
+
+
+@dc.dataclass
+class Chunker:
+    python_name: str
+    policy: Chunking
+    contributor: 'QueryContributor'
+    item_adapter: pydantic.TypeAdapter
+
+    def split(self, client: 'ClientBase', request_adapter: 'RequestAdapter', kwargs: typing.Mapping[str, typing.Any]) -> list[list]:
+        value = kwargs.get(self.python_name)
+        if not value:
+            return []
+        items = list(value)
+        policy = self.policy
+
+        if policy.max_url_length is None:
+            if policy.max_items is None or len(items) <= policy.max_items:
+                return []
+            return [items[idx : idx + policy.max_items] for idx in range(0, len(items), policy.max_items)]
+
+        request, _ = request_adapter.build_request(client, {**kwargs, self.python_name: []})
+        base_length = len(str(request.url))
+
+        chunks: list[list] = [[]]
+        length = base_length
+        for item in items:
+            item_length = self._encoded_length(item)
+            chunk = chunks[-1]
+            if chunk and (length + item_length > policy.max_url_length or len(chunk) == policy.max_items):
+                chunk = []
+                chunks.append(chunk)
+                length = base_length
+            chunk.append(item)
+            length += item_length
+        return chunks if len(chunks) > 1 else []
+
+    def _encoded_length(self, item: typing.Any) -> int:
+        raw = self.item_adapter.dump_python(item, mode='json')
+        entries = self.contributor._serialize(self.contributor.http_name(), [raw])
+        # one extra character for the separator; over-estimates styles that put all items in a single entry
+        return len(urllib.parse.urlencode(list(entries))) + 1
+
+    async def gather(
+        self,
+        exchange: Callable[[dict[str, typing.Any]], Awaitable[Result]],
+        kwargs: typing.Mapping[str, typing.Any],
+        chunks: list[list],
+    ) -> Result:
+        semaphore = asyncio.Semaphore(self.policy.concurrency) if self.policy.concurrency else None
+
+        async def exchange_chunk(chunk: list) -> Result:
+            chunk_kwargs = {**kwargs, self.python_name: chunk}
+            if semaphore is None:
+                return await exchange(chunk_kwargs)
+            async with semaphore:
+                return await exchange(chunk_kwargs)
+
+        tasks = [asyncio.ensure_future(exchange_chunk(chunk)) for chunk in chunks]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return self.policy.merge(results)
+
+
+def mk_chunker(sig: Signature) -> typing.Optional[Chunker]:
+    from .request import QueryContributor
+
+    chunkers = []
+    for param in sig.values():
+        if param.annotation is typing.Self:
+            continue
+        typ, web_arg = find_annotation(param.annotation, WebArg)
+        if not isinstance(web_arg, Query) or web_arg.chunking is None:
+            continue
+        item_types = typing.get_args(make_not_optional(typ))
+        item_adapter = pydantic.TypeAdapter(item_types[0] if item_types else typing.Any)
+        chunkers.append(Chunker(param.name, web_arg.chunking, QueryContributor(web_arg, param.name, typ), item_adapter))
+
+    if len(chunkers) > 1:
+        raise TypeError('Only one parameter per operation can be chunked')
+    return chunkers[0] if chunkers else None
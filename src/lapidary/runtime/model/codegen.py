@@ -0,0 +1,209 @@
+"""
+Generation of straight-line request building and response extraction functions for an operation, in the manner of dataclasses.
+
+The generated functions replace the `build_request` and `handle_response` methods of the adapter instances, so copies made
+with `dataclasses.replace()`, e.g. for prepared calls, fall back to the generic methods.
+Operations with parameters the generator doesn't support keep using the generic methods.
+"""
+
+import dataclasses as dc
+import functools as ft
+import itertools
+import linecache
+import string
+from collections.abc import Callable, Mapping
+
+import httpx
+import pydantic
+import typing_extensions as typing
+
+from ..http_consts import ACCEPT, CONTENT_TYPE, MIME_JSON
+from .error import UnexpectedResponse
+from .lazy import LazyAdapter
+from .request import HeaderContributor, PathContributor, QueryContributor, RequestAdapter, RequestObjectContributor
+from .response import NoopExtractor, ResponseExtractorMap, ResponseMessageExtractor, TupleExtractor
+
+_counter = itertools.count()
+_MISSING = object()
+
+
+def _create_fn(name: str, args: str, body: list[str], namespace: dict[str, typing.Any]) -> Callable:
+    source = f'def {name}({args}):\n' + ''.join(f'    {line}\n' for line in body)
+    filename = f'<lapidary generated {name} {next(_counter)}>'
+    exec(compile(source, filename, 'exec'), namespace)  # noqa: S102
+    # make the source visible in tracebacks
+    linecache.cache[filename] = len(source), None, source.splitlines(True), filename
+    return namespace[name]
+
+
+def _path_expr(template: str) -> typing.Optional[str]:
+    """Return an f-string expression formatting the path template with `path_params`, if the template is simple enough."""
+    parts = []
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+        parts.append(literal.replace('\\', '\\\\').replace("'", "\\'").replace('{', '{{').replace('}', '}}'))
+        if field_name is None:
+            continue
+        if format_spec or conversion or not field_name.isidentifier():
+            return None
+        parts.append(f'{{path_params["{field_name}"]}}')
+    return "f'" + ''.join(parts) + "'"
+
+
+def generate_build_request(adapter: RequestAdapter) -> typing.Optional[Callable[..., tuple[httpx.Request, typing.Optional[httpx.Auth]]]]:
+    """Return the generated `build_request` for the adapter, or None if it has parameters that aren't supported."""
+    contributor = adapter.contributor
+    if adapter.bound is not None or not isinstance(contributor, RequestObjectContributor) or contributor.contributors:
+        return None
+    free = contributor.free_param_contributor
+    free_contributors: Mapping[str, typing.Any] = free.contributors if free else {}
+    if not all(isinstance(param, (PathContributor, QueryContributor, HeaderContributor)) for param in free_contributors.values()):
+        return None
+    path = _path_expr(adapter.http_path_template)
+
+    namespace: dict[str, typing.Any] = {
+        'httpx': httpx,
+        'pydantic': pydantic,
+        'ft': ft,
+        '_MISSING': _MISSING,
+        '_names': frozenset(free_contributors) | ({contributor.body_param} if contributor.body_param else set()),
+        '_model_type': free.model_type if free else None,
+        '_body': contributor.body_contributor,
+        '_query_params': tuple(adapter.query_params),
+        '_accept': [(ACCEPT, value) for value in set(adapter.accept)] if adapter.accept is not None else [],
+        '_name': adapter.name,
+        '_security': adapter.security,
+        '_method': adapter.http_method,
+        '_path': adapter.http_path_template,
+        '_MIME_JSON': MIME_JSON,
+    }
+    body = [
+        'if not kwargs.keys() <= _names:',
+        '    raise TypeError("Unexpected argument", next(iter(kwargs.keys() - _names)))',
+        'headers = httpx.Headers()',
+        'query_params = []',
+        'path_params = {}',
+        'content = None',
+    ]
+
+    if contributor.body_param:
+        body += [
+            f'body = kwargs.get({contributor.body_param!r}, _MISSING)',
+            f'free_params = {{name: value for name, value in kwargs.items() if name != {contributor.body_param!r}}}',
+        ]
+    else:
+        body.append('free_params = kwargs')
+
+    if free is not None:
+        body += [
+            'try:',
+            '    model = _model_type.model_validate(free_params)',
+            'except pydantic.ValidationError as e:',
+            '    raise TypeError from e',
+            "raw = model.model_dump(mode='json', exclude_unset=True)",
+        ]
+        body += _param_lines(free_contributors, namespace)
+
+    if contributor.body_param:
+        body += [
+            'if body is not _MISSING:',
+            '    cache = client._body_cache',
+            '    if cache is None:',
+            '        media_type, content = _body._dump(body)',
+            '    else:',
+            '        media_type, content = cache.encode(body, (_MIME_JSON, _body.cache_key), ft.partial(_body._dump, body, _MIME_JSON))',
+            f'    headers[{CONTENT_TYPE!r}] = media_type',
+        ]
+
+    body += _tail_lines(adapter, path)
+    return _create_fn(f'build_request_{adapter.name}', 'client, kwargs', body, namespace)
+
+
+def _param_lines(free_contributors: Mapping[str, typing.Any], namespace: dict[str, typing.Any]) -> list[str]:
+    body = []
+    for idx, (python_name, param) in enumerate(free_contributors.items()):
+        serialize = f'_serialize_{idx}'
+        namespace[serialize] = param._serialize
+        http_name = param.http_name()
+        body += [f'value = raw.get({python_name!r})', 'if value is not None:']
+        if isinstance(param, PathContributor):
+            body.append(f'    path_params[{http_name!r}] = {serialize}({http_name!r}, value)')
+        elif isinstance(param, QueryContributor):
+            body.append(f'    query_params.extend({serialize}({http_name!r}, value))')
+        else:
+            body.append(f'    headers.update({serialize}({http_name!r}, value))')
+    return body
+
+
+def _tail_lines(adapter: RequestAdapter, path: typing.Optional[str]) -> list[str]:
+    body = [
+        'default_headers = client._default_headers',
+        'if default_headers:',
+        '    defaults = [(name, value) for name, value in default_headers.multi_items() if name not in headers]',
+        '    headers = httpx.Headers([*defaults, *headers.multi_items()])',
+    ]
+    if adapter.query_params:
+        body += [
+            'call_params = {name for name, _ in query_params}',
+            'query_params.extend(param for param in _query_params if param[0] not in call_params)',
+        ]
+    if adapter.accept is not None:
+        body += [f'if {ACCEPT!r} not in headers:', '    headers.update(_accept)']
+    body += [
+        'auth = client._auth_registry.resolve_auth(_name, _security)',
+        'request = client._client.build_request(',
+        f'    _method, {path or "_path.format_map(path_params)"}, content=content, params=httpx.QueryParams(query_params), headers=headers',
+        ')',
+        'return request, auth',
+    ]
+    return body
+
+
+def _generate_tuple_extractor(name: str, extractor: TupleExtractor) -> Callable[[httpx.Response], tuple]:
+    namespace: dict[str, typing.Any] = {'UnexpectedResponse': UnexpectedResponse}
+    body = []
+    values = []
+    for idx, item in enumerate(extractor.response_extractors):
+        if isinstance(item, NoopExtractor):
+            values.append('None')
+            continue
+        type_adapter = getattr(item, 'type_adapter', _MISSING)
+        if type_adapter is None:
+            values.append('None')
+        elif type_adapter is not _MISSING:
+            # BodyExtractor
+            namespace[f'_adapter_{idx}'] = type_adapter
+            # lazy proxies keep the response to report validation errors
+            args = 'response.text, response' if isinstance(type_adapter, LazyAdapter) else 'response.text'
+            body += [
+                'try:',
+                f'    value_{idx} = _adapter_{idx}({args})',
+                'except ValueError as e:',
+                '    raise UnexpectedResponse(response) from e',
+            ]
+            values.append(f'value_{idx}')
+        else:
+            namespace[f'_extract_{idx}'] = item.handle_response
+            values.append(f'_extract_{idx}(response)')
+    body.append(f'return ({", ".join(values)},)')
+    return _create_fn(f'handle_response_{name}', 'response', body, namespace)
+
+
+def generate_response_handler(name: str, extractor: ResponseMessageExtractor) -> ResponseMessageExtractor:
+    """Return a copy of the response extractor with generated extractors of responses of each status code and media type."""
+    response_map: ResponseExtractorMap = {}
+    for status_code, mime_map in extractor.response_map.items():
+        response_map[status_code] = {}
+        for media_type, tuple_extractor in mime_map.items():
+            if isinstance(tuple_extractor, TupleExtractor):
+                tuple_extractor = dc.replace(tuple_extractor)
+                tuple_extractor.handle_response = _generate_tuple_extractor(name, tuple_extractor)  # type: ignore[method-assign, assignment]
+            response_map[status_code][media_type] = tuple_extractor
+    return ResponseMessageExtractor(response_map)
+
+
+def generate(name: str, adapter: RequestAdapter, extractor: ResponseMessageExtractor) -> tuple[RequestAdapter, ResponseMessageExtractor]:
+    build_request = generate_build_request(adapter)
+    if build_request is not None:
+        adapter = dc.replace(adapter)
+        adapter.build_request = build_request  # type: ignore[method-assign]
+    return adapter, generate_response_handler(name, extractor)
@@ -0,0 +1,123 @@
+"""
+Columnar decoding of JSON arrays of objects.
+
+Each column is validated as a whole, against the declared type of the model field, so no per-row model instances are created.
+"""
+
+import array
+import dataclasses as dc
+import functools as ft
+import importlib
+import inspect
+from collections.abc import Callable, Sequence
+
+import pydantic
+import pydantic_core
+import typing_extensions as typing
+
+# array.array type codes of the field types that can be stored in one
+_ARRAY_CODES: typing.Mapping[type, str] = {int: 'q', float: 'd'}
+_NUMPY_DTYPES: typing.Mapping[type, str] = {int: 'int64', float: 'float64', bool: 'bool'}
+
+
+@dc.dataclass(frozen=True)
+class Columnar:
+    """
+    Annotation for list response body types, that decodes the body into a mapping of field names to columns,
+    e.g. `Annotated[list[Cat], Columnar()]`.
+
+    Non-optional `int` and `float` fields are decoded to `array.array`, or with `numpy=True`, `int`, `float` and `bool` fields
+    are decoded to numpy arrays. Other fields are decoded to lists, and so are `int` columns with values that don't fit
+    in 64 bits, which with `numpy=True` are decoded to numpy arrays of objects instead.
+    """
+
+    numpy: bool = False
+
+
+@dc.dataclass(frozen=True)
+class _Column:
+    name: str
+    key: str
+    adapter: pydantic.TypeAdapter
+    default: typing.Optional[Callable[[], typing.Any]]
+    """Returns the default value, called for each row without the field, so mutable defaults aren't shared. `None` if required."""
+    convert: Callable[[list], Sequence]
+
+
+def find_columnar(typ: typing.Any) -> typing.Optional[tuple[typing.Any, Columnar]]:
+    """Return the annotated type and its `Columnar` annotation, if there is one."""
+    if typing.get_origin(typ) is not typing.Annotated:
+        return None
+    inner, *annotations = typing.get_args(typ)
+    for anno in annotations:
+        if anno is Columnar:
+            return inner, Columnar()
+        if isinstance(anno, Columnar):
+            return inner, anno
+    return None
+
+
+def mk_columnar_adapter(typ: typing.Any, columnar: Columnar) -> Callable[[typing.Union[str, bytes]], dict[str, Sequence]]:
+    model = _item_model(typ)
+    numpy = importlib.import_module('numpy') if columnar.numpy else None
+    columns = [_mk_column(name, field, numpy) for name, field in model.model_fields.items()]
+
+    def parse(raw: typing.Union[str, bytes]) -> dict[str, Sequence]:
+        rows = pydantic_core.from_json(raw)
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError('Expected an array of objects', model.__name__)
+        return {column.name: column.convert(column.adapter.validate_python(_values(rows, column))) for column in columns}
+
+    return parse
+
+
+def _values(rows: list[dict], column: _Column) -> list:
+    if column.default is None:
+        try:
+            return [row[column.key] for row in rows]
+        except KeyError:
+            raise ValueError('Missing required field', column.key) from None
+    key, default = column.key, column.default
+    return [row[key] if key in row else default() for row in rows]
+
+
+def _item_model(typ: typing.Any) -> type[pydantic.BaseModel]:
+    args = typing.get_args(typ)
+    if typing.get_origin(typ) in (list, Sequence) and args and inspect.isclass(args[0]) and issubclass(args[0], pydantic.BaseModel):
+        return args[0]
+    raise TypeError('Columnar requires a list of models', typ)
+
+
+def _mk_column(name: str, field: pydantic.fields.FieldInfo, numpy: typing.Any) -> _Column:
+    annotation = field.annotation
+    typ = typing.Annotated[(annotation,) + tuple(field.metadata)] if field.metadata else annotation
+    key = field.validation_alias if isinstance(field.validation_alias, str) else field.alias or name
+    default = ft.partial(field.get_default, call_default_factory=True) if not field.is_required() else None
+
+    # optional fields are not in the mappings, since array elements can't be None
+    convert: Callable[[list], Sequence] = _identity
+    if numpy is not None and annotation in _NUMPY_DTYPES:
+        dtype = _NUMPY_DTYPES[annotation]  # type: ignore[index]
+        convert = ft.partial(_to_numpy, numpy, dtype)
+    elif numpy is None and annotation in _ARRAY_CODES:
+        convert = ft.partial(_to_array, _ARRAY_CODES[annotation])  # type: ignore[index]
+    return _Column(name, key, pydantic.TypeAdapter(list[typ]), default, convert)  # type: ignore[valid-type]
+
+
+def _identity(values: list) -> list:
+    return values
+
+
+def _to_array(code: str, values: list) -> Sequence:
+    try:
+        return array.array(code, values)
+    except OverflowError:
+        # ints beyond 64 bits
+        return values
+
+
+def _to_numpy(numpy: typing.Any, dtype: str, values: list) -> Sequence:
+    try:
+        return numpy.asarray(values, dtype=dtype)
+    except OverflowError:
+        return numpy.asarray(values, dtype=object)
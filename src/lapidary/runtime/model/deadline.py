@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import time
+from collections.abc import Iterator
+
+import httpx
+import typing_extensions as typing
+
+from .error import DeadlineExceeded
+
+# absolute deadline, in time.monotonic() terms
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar('lapidary_deadline', default=None)
+
+
+@contextlib.contextmanager
+def deadline(timeout: float) -> Iterator[None]:
+    """
+    Limit the total time of all operation calls made within the block to `timeout` seconds.
+
+    Nested blocks can only shorten the deadline. Calls still running when it passes are cancelled and raise `DeadlineExceeded`.
+    """
+    with deadline_at(time.monotonic() + timeout):
+        yield
+
+
+@contextlib.contextmanager
+def deadline_at(at: float | None) -> Iterator[None]:
+    current = _deadline.get()
+    if at is None or (current is not None and current <= at):
+        yield
+        return
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def clear_deadline() -> None:
+    """Remove the deadline from the current context, e.g. in a background task that must not inherit it."""
+    _deadline.set(None)
+
+
+def resolve_deadline(timeout: float | None) -> float | None:
+    """Return the earlier of the current deadline and the operation time budget."""
+    current = _deadline.get()
+    if timeout is None:
+        return current
+    at = time.monotonic() + timeout
+    return at if current is None else min(current, at)
+
+
+def remaining(at: float) -> float:
+    remaining_ = at - time.monotonic()
+    if remaining_ <= 0:
+        raise DeadlineExceeded
+    return remaining_
+
+
+def apply_deadline(request: httpx.Request, at: float, header: str | None) -> None:
+    """Limit request timeouts to the remaining time and optionally send it to the server, in milliseconds."""
+    remaining_ = remaining(at)
+    timeouts: typing.Mapping[str, float | None] = request.extensions.get('timeout') or httpx.Timeout(None).as_dict()
+    request.extensions['timeout'] = {name: remaining_ if value is None else min(value, remaining_) for name, value in timeouts.items()}
+    if header:
+        request.headers[header] = str(int(remaining_ * 1000))
@@ -15,6 +15,18 @@ class LapidaryError(Exception):
     pass
 
 
+class DeadlineExceeded(LapidaryError, TimeoutError):
+    """Raised when the time budget of an operation call runs out"""
+
+
+class ConcurrencyLimitExceeded(LapidaryError):
+    """Raised when a request waits too long for the concurrency limit"""
+
+
+class RequestShed(LapidaryError):
+    """Raised when a low priority request is dropped, because requests wait too long for the scheduler"""
+
+
 class LapidaryResponseError(LapidaryError):
     """Base class for errors that wrap the response"""
 
@@ -35,6 +47,9 @@ class HttpErrorResponse(typing.Generic[Body, Headers], LapidaryResponseError):
         self.headers = headers
         self.body = body
 
+    def __reduce__(self) -> tuple:
+        return type(self), (self.status_code, self.headers, self.body)
+
 
 class UnexpectedResponse(LapidaryResponseError):
     """Base error class for undeclared responses"""
@@ -42,3 +57,6 @@ class UnexpectedResponse(LapidaryResponseError):
     def __init__(self, response: httpx.Response):
         self.response = response
         self.content_type = response.headers.get('content-type')
+
+    def __reduce__(self) -> tuple:
+        return type(self), (self.response,)
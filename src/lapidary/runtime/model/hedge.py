@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import dataclasses as dc
+import time
+from collections.abc import Awaitable, Callable, Collection
+
+import httpx
+
+HEDGEABLE_METHODS = frozenset(('GET', 'HEAD'))
+
+
+@dc.dataclass(frozen=True)
+class HedgePolicy:
+    """
+    Send a duplicate of a slow idempotent request and use whichever response arrives first.
+
+    The duplicate is sent after `delay` seconds or, with `percentile` set and at least `min_samples` latencies observed,
+    after that percentile of the recent latencies of the operation. Requests with a streamed body are not hedged,
+    since the body can only be sent once.
+    """
+
+    delay: float = 0.1
+    percentile: float | None = None
+    min_samples: int = 20
+    window: int = 100
+    """Number of recent latencies used to calculate the percentile."""
+
+    max_ratio: float = 0.1
+    """Maximum fraction of requests that may be hedged."""
+
+    retry_statuses: Collection[int] = frozenset((502, 503, 504))
+    """Response statuses treated like errors while the other request is in flight, used only if it fails too."""
+
+    def __post_init__(self) -> None:
+        if self.percentile is not None and not 0 < self.percentile < 1:
+            raise ValueError('percentile must be between 0 and 1', self.percentile)
+        if not 0 <= self.max_ratio <= 1:
+            raise ValueError('max_ratio must be between 0 and 1', self.max_ratio)
+
+
+# Hedging budget, in requests, that can be saved up during quiet periods
+_MAX_TOKENS = 10.0
+
+
+class Hedger:
+    """Per-operation hedging state: recent latencies and the budget of hedged requests."""
+
+    def __init__(self, policy: HedgePolicy) -> None:
+        self.policy = policy
+        self._latencies: collections.deque[float] = collections.deque(maxlen=policy.window)
+        self._new_samples = 0
+        self._delay = policy.delay
+        self._tokens = 0.0
+
+    def delay(self) -> float:
+        policy = self.policy
+        if policy.percentile is None or len(self._latencies) < policy.min_samples:
+            return policy.delay
+        # re-calculating on every request would cost more than it's worth
+        if self._new_samples >= policy.window // 10:
+            latencies = sorted(self._latencies)
+            self._delay = latencies[min(int(len(latencies) * policy.percentile), len(latencies) - 1)]
+            self._new_samples = 0
+        return self._delay
+
+    def record(self, latency: float) -> None:
+        self._latencies.append(latency)
+        self._new_samples += 1
+
+    async def send(self, send: Callable[[httpx.Request], Awaitable[httpx.Response]], request: httpx.Request) -> httpx.Response:
+        if not isinstance(request.stream, httpx.ByteStream):
+            return await send(request)
+        self._tokens = min(self._tokens + self.policy.max_ratio, _MAX_TOKENS)
+        start = time.monotonic()
+        primary = asyncio.ensure_future(send(request))
+        done, _ = await _wait_or_cancel({primary}, self.delay())
+        if done or self._tokens < 1:
+            response = await primary
+            self.record(time.monotonic() - start)
+            return response
+
+        self._tokens -= 1
+        hedged = asyncio.ensure_future(send(_copy_request(request)))
+        response = await _first_successful(self.policy.retry_statuses, primary, hedged)
+        self.record(time.monotonic() - start)
+        return response
+
+
+async def _wait_or_cancel(tasks: set[asyncio.Future], timeout: float | None) -> tuple[set[asyncio.Future], set[asyncio.Future]]:
+    try:
+        return await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def _first_successful(retry_statuses: Collection[int], *tasks: asyncio.Future[httpx.Response]) -> httpx.Response:
+    """
+    Return the first response with a status other than `retry_statuses`. If there's none, return the response of the primary
+    request, or else of any request, and if they all failed, raise the error of the primary one.
+    """
+    pending = set(tasks)
+    failed: set[asyncio.Future[httpx.Response]] = set()
+    try:
+        while pending:
+            done, pending = await _wait_or_cancel(pending, None)
+            for task in done:
+                if task.exception() is None and task.result().status_code not in retry_statuses:
+                    await _discard(pending, failed | done - {task})
+                    return task.result()
+            failed |= done
+    finally:
+        for task in pending:
+            task.cancel()
+    responses = [task for task in tasks if task.exception() is None]
+    if not responses:
+        error = tasks[0].exception()
+        assert error is not None
+        raise error
+    await _discard(set(), failed - {responses[0]})
+    return responses[0].result()
+
+
+async def _discard(pending: set[asyncio.Future[httpx.Response]], done: set[asyncio.Future[httpx.Response]]) -> None:
+    """Cancel the losing requests and release their connections."""
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+    for task in pending:
+        if not task.cancelled() and task.exception() is None:
+            done.add(task)
+    for task in done:
+        if task.exception() is None:
+            await task.result().aclose()
+
+
+def _copy_request(request: httpx.Request) -> httpx.Request:
+    # the byte stream can be sent any number of times
+    return httpx.Request(
+        request.method,
+        request.url,
+        headers=request.headers,
+        stream=request.stream,
+        extensions=dict(request.extensions),
+    )
@@ -0,0 +1,296 @@
+"""
+Lazily validated response bodies.
+
+The body is parsed into plain python objects, and wrapped in proxies that validate model fields when they're first read.
+Field constraints are checked, but model and field validators only run on `materialize()`.
+
+Properties and methods defined in the model class are bound to the proxy, so they read fields lazily too. Other attributes,
+like pydantic methods, are read from the fully validated model.
+"""
+
+import collections.abc
+import functools as ft
+import inspect
+import types
+from collections.abc import Iterator, Mapping, Sequence
+
+import httpx
+import pydantic
+import pydantic_core
+import typing_extensions as typing
+
+from ..metattype import make_not_optional
+from .error import UnexpectedResponse
+
+
+class Lazy:
+    """Annotation for response body types that should be validated lazily, e.g. `Annotated[Cat, Lazy]`"""
+
+
+class LazyModel:
+    """
+    Proxy with the attribute interface of a pydantic model, validating each field on first access.
+
+    It passes `isinstance()` checks for the model class. Invalid fields raise `UnexpectedResponse` caused by a
+    `pydantic.ValidationError` of the model, or just the latter if the proxy wasn't created from a response.
+    """
+
+    __slots__ = ('_lapidary_type', '_lapidary_raw', '_lapidary_response', '_lapidary_cache', '_lapidary_model')
+
+    def __init__(
+        self,
+        model_type: type[pydantic.BaseModel],
+        raw: Mapping[str, typing.Any],
+        response: typing.Optional[httpx.Response] = None,
+    ) -> None:
+        self._lapidary_type = model_type
+        self._lapidary_raw = raw
+        self._lapidary_response = response
+        self._lapidary_cache: dict[str, typing.Any] = {}
+        self._lapidary_model: typing.Optional[pydantic.BaseModel] = None
+
+    @property  # type: ignore[misc]
+    def __class__(self) -> type[pydantic.BaseModel]:  # type: ignore[override]
+        return self._lapidary_type
+
+    def __getattr__(self, name: str) -> typing.Any:
+        try:
+            return self._lapidary_cache[name]
+        except KeyError:
+            pass
+        model_type = self._lapidary_type
+        if name not in model_type.model_fields and not _is_extra(model_type, name, self._lapidary_raw):
+            return self._lapidary_class_attr(name)
+        try:
+            value = _validate_field(model_type, name, self._lapidary_raw, self._lapidary_response)
+        except pydantic.ValidationError as error:
+            _raise(model_type, error, self._lapidary_response, (name,))
+        self._lapidary_cache[name] = value
+        return value
+
+    def _lapidary_class_attr(self, name: str) -> typing.Any:
+        model_type = self._lapidary_type
+        for klass in model_type.__mro__:
+            if klass is pydantic.BaseModel:
+                break
+            attr = vars(klass).get(name, _MISSING)
+            if attr is _MISSING:
+                continue
+            if isinstance(attr, (property, types.FunctionType, staticmethod, classmethod)):
+                return attr.__get__(self, model_type)
+            if not hasattr(attr, '__get__'):
+                return attr
+            break
+        if not hasattr(model_type, name):
+            raise AttributeError(name)
+        return getattr(self._lapidary_materialize(), name)
+
+    def _lapidary_materialize(self) -> pydantic.BaseModel:
+        if self._lapidary_model is None:
+            try:
+                self._lapidary_model = self._lapidary_type.model_validate(self._lapidary_raw)
+            except pydantic.ValidationError as error:
+                _raise(self._lapidary_type, error, self._lapidary_response, ())
+        return self._lapidary_model
+
+    def __dir__(self) -> Iterator[str]:
+        return iter(sorted({*self._lapidary_type.model_fields, *dir(self._lapidary_type)}))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyModel):
+            return self._lapidary_type is other._lapidary_type and self._lapidary_raw == other._lapidary_raw
+        if isinstance(other, pydantic.BaseModel):
+            return materialize(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'Lazy[{self._lapidary_type.__name__}]({self._lapidary_raw!r})'
+
+
+def _raise(
+    model_type: type[pydantic.BaseModel],
+    error: pydantic.ValidationError,
+    response: typing.Optional[httpx.Response],
+    loc: tuple[typing.Union[str, int], ...],
+) -> typing.NoReturn:
+    """Re-raise the validation error of a field as an error of the model, wrapped in UnexpectedResponse if there's a response."""
+    if error.title != model_type.__name__ or loc:
+        line_errors = [
+            typing.cast(
+                pydantic_core.InitErrorDetails,
+                {'type': err['type'], 'loc': (*loc, *err['loc']), 'input': err['input'], **({'ctx': err['ctx']} if 'ctx' in err else {})},
+            )
+            for err in error.errors(include_url=False)
+        ]
+        error = pydantic.ValidationError.from_exception_data(model_type.__name__, line_errors)
+    if response is None:
+        raise error
+    raise UnexpectedResponse(response) from error
+
+
+class LazyList(Sequence):
+    """Sequence of lazily validated models, each one wrapped on first access."""
+
+    def __init__(
+        self, item_type: type[pydantic.BaseModel], raw: list[typing.Any], response: typing.Optional[httpx.Response] = None
+    ) -> None:
+        self._item_type = item_type
+        self._raw = raw
+        self._response = response
+        self._items: list[typing.Any] = [_MISSING] * len(raw)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> typing.Any: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> list[typing.Any]: ...
+
+    def __getitem__(self, index: typing.Union[int, slice]) -> typing.Any:
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(len(self))[index]]
+        item = self._items[index]
+        if item is _MISSING:
+            item = lazy_value(self._item_type, self._raw[index], self._response)
+            self._items[index] = item
+        return item
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'Lazy[list[{self._item_type.__name__}]]({self._raw!r})'
+
+
+_MISSING = object()
+
+
+def lazy_value(typ: typing.Any, raw: typing.Any, response: typing.Optional[httpx.Response] = None) -> typing.Any:
+    """Wrap raw models and lists of models in lazy proxies, validate everything else."""
+    non_optional = make_not_optional(typ)
+    if _is_model(non_optional) and isinstance(raw, dict):
+        return LazyModel(non_optional, raw, response)
+    if typing.get_origin(non_optional) in (list, collections.abc.Sequence) and isinstance(raw, list):
+        args = typing.get_args(non_optional)
+        if args and _is_model(args[0]):
+            return LazyList(args[0], raw, response)
+    return _type_adapter(typ).validate_python(raw)
+
+
+def materialize(value: typing.Any) -> typing.Any:
+    """Fully validate a lazy value, returning the declared model instance or list."""
+    if type(value) is LazyModel:
+        return value._lapidary_materialize()
+    if isinstance(value, LazyList):
+        try:
+            return _type_adapter(list[value._item_type]).validate_python(value._raw)  # type: ignore[name-defined]
+        except pydantic.ValidationError as error:
+            if value._response is None:
+                raise
+            raise UnexpectedResponse(value._response) from error
+    return value
+
+
+class LazyAdapter:
+    """Parses a JSON body into lazy proxies, which keep the response to report validation errors."""
+
+    def __init__(self, typ: typing.Any) -> None:
+        self.typ = typ
+
+    def __call__(self, raw: typing.Union[str, bytes], response: typing.Optional[httpx.Response] = None) -> typing.Any:
+        return lazy_value(self.typ, pydantic_core.from_json(raw), response)
+
+    def warm_up(self) -> None:
+        """Build validators of all fields reachable from the type, otherwise built when a field is first read."""
+        _warm_up(self.typ, set())
+
+
+def _warm_up(typ: typing.Any, seen: set[type[pydantic.BaseModel]]) -> None:
+    non_optional = make_not_optional(typ)
+    if typing.get_origin(non_optional) in (list, collections.abc.Sequence):
+        args = typing.get_args(non_optional)
+        if args and _is_model(args[0]):
+            _type_adapter(list[args[0]])  # type: ignore[valid-type]
+            _warm_up(args[0], seen)
+            return
+    if not _is_model(non_optional):
+        _type_adapter(typ)
+        return
+    if non_optional in seen:
+        return
+    seen.add(non_optional)
+    for field in non_optional.model_fields.values():
+        _warm_up(typing.Annotated[(field.annotation,) + tuple(field.metadata)] if field.metadata else field.annotation, seen)
+
+
+def mk_lazy_adapter(typ: typing.Any) -> LazyAdapter:
+    return LazyAdapter(typ)
+
+
+def find_lazy(typ: typing.Any) -> typing.Optional[typing.Any]:
+    """Return the annotated type if it's annotated with `Lazy`, otherwise `None`."""
+    if typing.get_origin(typ) is not typing.Annotated:
+        return None
+    inner, *annotations = typing.get_args(typ)
+    if any(anno is Lazy or isinstance(anno, Lazy) for anno in annotations):
+        return inner
+    return None
+
+
+def _is_model(typ: typing.Any) -> bool:
+    return inspect.isclass(typ) and issubclass(typ, pydantic.BaseModel)
+
+
+def _type_adapter(typ: typing.Any) -> pydantic.TypeAdapter:
+    try:
+        return _cached_type_adapter(typ)
+    except TypeError:
+        # unhashable annotation metadata
+        return pydantic.TypeAdapter(typ)
+
+
+@ft.cache
+def _cached_type_adapter(typ: typing.Any) -> pydantic.TypeAdapter:
+    return pydantic.TypeAdapter(typ)
+
+
+def _is_extra(model_type: type[pydantic.BaseModel], name: str, raw: Mapping[str, typing.Any]) -> bool:
+    return model_type.model_config.get('extra') == 'allow' and name in raw
+
+
+def _validate_field(
+    model_type: type[pydantic.BaseModel],
+    name: str,
+    raw: Mapping[str, typing.Any],
+    response: typing.Optional[httpx.Response],
+) -> typing.Any:
+    field = model_type.model_fields.get(name)
+    if field is None:
+        return raw[name]
+
+    for key in _field_keys(model_type, name):
+        if key in raw:
+            break
+    else:
+        if field.is_required():
+            raise pydantic.ValidationError.from_exception_data(
+                model_type.__name__,
+                [{'type': 'missing', 'loc': (name,), 'input': raw}],
+            )
+        return field.get_default(call_default_factory=True)
+
+    typ = typing.Annotated[(field.annotation,) + tuple(field.metadata)] if field.metadata else field.annotation
+    return lazy_value(typ, raw[key], response)
+
+
+@ft.cache
+def _field_keys(model_type: type[pydantic.BaseModel], name: str) -> tuple[str, ...]:
+    field = model_type.model_fields[name]
+    alias = field.validation_alias if isinstance(field.validation_alias, str) else field.alias
+    if alias is None:
+        return (name,)
+    return (alias, name) if model_type.model_config.get('populate_by_name') else (alias,)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import collections
+import dataclasses as dc
+import math
+import time
+from collections.abc import Awaitable, Callable, Mapping
+
+import httpx
+
+from .error import ConcurrencyLimitExceeded
+from .pool import LoopOwner
+
+
+@dc.dataclass
+class LimitAlgorithm(abc.ABC):
+    """
+    Calculates the concurrency limit from observed requests.
+
+    Each limited host gets its own copy of the algorithm, created with `dataclasses.replace()`, so keep state in fields with `init=False`.
+    """
+
+    initial: float = 20
+    min_limit: float = 1
+    max_limit: float = 1000
+
+    @abc.abstractmethod
+    def update(self, limit: float, rtt: float, in_flight: int, dropped: bool) -> float:
+        """Return the new limit, after a request that took `rtt` seconds, while `in_flight` requests were in flight."""
+
+    def clamp(self, limit: float) -> float:
+        return min(max(limit, self.min_limit), self.max_limit)
+
+
+@dc.dataclass
+class AIMD(LimitAlgorithm):
+    """Additive increase, multiplicative decrease, on failures or responses slower than `max_latency`."""
+
+    backoff: float = 0.9
+    max_latency: float | None = None
+
+    def update(self, limit: float, rtt: float, in_flight: int, dropped: bool) -> float:
+        if dropped or (self.max_latency is not None and rtt > self.max_latency):
+            return self.clamp(limit * self.backoff)
+        # only grow when the limit is actually used
+        if in_flight * 2 >= limit:
+            return self.clamp(limit + 1)
+        return limit
+
+
+@dc.dataclass
+class Gradient(LimitAlgorithm):
+    """
+    Compares the latest latency with a long-term average. While they're close, the limit grows by its square root,
+    as the latency grows above the average, the limit shrinks proportionally.
+    """
+
+    tolerance: float = 1.5
+    smoothing: float = 0.2
+    long_window: int = 600
+    _long_rtt: float = dc.field(default=0.0, init=False)
+
+    def update(self, limit: float, rtt: float, in_flight: int, dropped: bool) -> float:
+        if not self._long_rtt:
+            self._long_rtt = rtt
+        else:
+            self._long_rtt += (rtt - self._long_rtt) / self.long_window
+        if dropped:
+            gradient = 0.5
+        else:
+            gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / rtt)) if rtt else 1.0
+        new_limit = limit * gradient + math.sqrt(limit)
+        return self.clamp(limit * (1 - self.smoothing) + new_limit * self.smoothing)
+
+
+@dc.dataclass
+class Vegas(LimitAlgorithm):
+    """
+    Estimates the number of queued requests from the ratio of the lowest observed latency to the current one,
+    and keeps it between `alpha` and `beta` times the logarithm of the limit.
+    """
+
+    alpha: float = 3
+    beta: float = 6
+    _min_rtt: float = dc.field(default=0.0, init=False)
+
+    def update(self, limit: float, rtt: float, in_flight: int, dropped: bool) -> float:
+        step = max(math.log10(limit), 1.0)
+        if dropped:
+            return self.clamp(limit - step)
+        if not self._min_rtt or rtt < self._min_rtt:
+            self._min_rtt = rtt
+        if not rtt:
+            return limit
+        queue = limit * (1 - self._min_rtt / rtt)
+        if queue <= self.alpha * step:
+            return self.clamp(limit + step)
+        if queue >= self.beta * step:
+            return self.clamp(limit - step)
+        return limit
+
+
+class _Gate:
+    def __init__(self, algorithm: LimitAlgorithm) -> None:
+        self.algorithm = algorithm
+        self.limit = algorithm.clamp(algorithm.initial)
+        self.in_flight = 0
+        self._waiters: collections.deque[asyncio.Future] = collections.deque()
+
+    async def acquire(self, timeout: float | None) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+            if waiter.done() and not waiter.cancelled():
+                # got the slot just as the wait ended
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(error, asyncio.TimeoutError):
+                raise ConcurrencyLimitExceeded from None
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def reset(self) -> None:
+        # requests and waiters of another loop or of the parent process never release their slots here
+        self.in_flight = 0
+        self._waiters = collections.deque()
+
+    def update(self, rtt: float, dropped: bool) -> None:
+        self.limit = self.algorithm.update(self.limit, rtt, self.in_flight, dropped)
+
+
+class AdaptiveLimiter:
+    """
+    Limits the number of requests in flight, adjusting the limit to the observed latency and failures.
+
+    Requests over the limit wait in a queue, for at most `queue_timeout` seconds, and then raise `ConcurrencyLimitExceeded`.
+    Responses with status 5xx or 429 and transport errors count as dropped requests.
+    Used in a forked process or in another event loop, the limiter forgets the requests in flight and keeps the limits.
+    """
+
+    def __init__(self, algorithm: LimitAlgorithm | None = None, per_host: bool = False, queue_timeout: float | None = None) -> None:
+        self.algorithm = algorithm or AIMD()
+        self.per_host = per_host
+        self.queue_timeout = queue_timeout
+        self._gates: dict[str | None, _Gate] = {}
+        self._owner = LoopOwner()
+
+    def limit(self, host: str | None = None) -> int:
+        """Current concurrency limit, of the host if limiting per host."""
+        gate = self._gates.get(host)
+        return int(gate.limit if gate else self.algorithm.clamp(self.algorithm.initial))
+
+    @property
+    def limits(self) -> Mapping[str | None, int]:
+        return {key: int(gate.limit) for key, gate in self._gates.items()}
+
+    def in_flight(self, host: str | None = None) -> int:
+        gate = self._gates.get(host)
+        return gate.in_flight if gate else 0
+
+    async def send(self, request: httpx.Request, send: Callable[[httpx.Request], Awaitable[httpx.Response]]) -> httpx.Response:
+        if self._owner.changed():
+            for gate in self._gates.values():
+                gate.reset()
+        key = request.url.host if self.per_host else None
+        gate = self._gates.get(key) or self._gates.setdefault(key, _Gate(dc.replace(self.algorithm)))
+        await gate.acquire(self.queue_timeout)
+        start = time.monotonic()
+        dropped = None
+        try:
+            response = await send(request)
+            dropped = response.status_code >= 500 or response.status_code == 429
+            return response
+        except httpx.TransportError:
+            dropped = True
+            raise
+        finally:
+            # cancelled requests, e.g. hedging losers, don't affect the limit
+            if dropped is not None:
+                gate.update(time.monotonic() - start, dropped)
+            gate.release()
@@ -0,0 +1,109 @@
+import contextlib
+import dataclasses as dc
+import random
+import sys
+import tracemalloc
+from collections.abc import Iterator
+
+import typing_extensions as typing
+
+Phase: typing.TypeAlias = typing.Literal['build', 'read', 'extract']
+SortKey: typing.TypeAlias = typing.Literal['retained', 'peak']
+
+
+@dc.dataclass
+class AllocationStats:
+    operation: str
+    phase: Phase
+    samples: int = 0
+    retained: int = 0
+    """Total bytes allocated during the phase and still alive at its end, over all samples."""
+    peak: int = 0
+    """Highest number of bytes allocated during a single sample of the phase."""
+
+    @property
+    def mean_retained(self) -> float:
+        return self.retained / self.samples if self.samples else 0.0
+
+
+class _Phase:
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.peak = start
+
+
+class MemoryProfiler:
+    """
+    Opt-in diagnostic that attributes memory allocations to operations and phases of a call:
+    building the request, reading the response body and extracting the result.
+
+    A fraction of calls, given by `sample_rate`, is traced with `tracemalloc`. It's started by the first sampled call,
+    unless it was started elsewhere, and keeps running until `stop()`, so that concurrent calls don't stop it for each other.
+
+    Each phase is measured by the change of traced memory, and its peak by the highest traced memory while it was in progress.
+    Phases that await, i.e. `read`, also count allocations made meanwhile by concurrent tasks.
+    """
+
+    def __init__(self, sample_rate: float = 0.01, frames: int = 1) -> None:
+        if not 0 < sample_rate <= 1:
+            raise ValueError('sample_rate must be in (0, 1]', sample_rate)
+        self.sample_rate = sample_rate
+        self.frames = frames
+        self._random = random.Random()
+        self._stats: dict[tuple[str, Phase], AllocationStats] = {}
+        self._phases: set[_Phase] = set()
+        self._started = False
+
+    def sample(self) -> bool:
+        return self.sample_rate >= 1 or self._random.random() < self.sample_rate
+
+    def start(self) -> None:
+        """Start tracemalloc, unless it's running."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+
+    def stop(self) -> None:
+        """Stop tracemalloc, if it was started by this profiler. Collected stats are kept."""
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    @contextlib.contextmanager
+    def phase(self, operation: str, phase: Phase) -> Iterator[None]:
+        # the peak of tracemalloc is global, so record it in the phases in progress before resetting it for this one
+        self._record_peak()
+        tracemalloc.reset_peak()
+        current = _Phase(tracemalloc.get_traced_memory()[0])
+        self._phases.add(current)
+        try:
+            yield
+        finally:
+            self._record_peak()
+            self._phases.discard(current)
+            now, _ = tracemalloc.get_traced_memory()
+            key = operation, phase
+            stats = self._stats.get(key) or self._stats.setdefault(key, AllocationStats(operation, phase))
+            stats.samples += 1
+            stats.retained += max(now - current.start, 0)
+            stats.peak = max(stats.peak, current.peak - current.start)
+
+    def _record_peak(self) -> None:
+        _, peak = tracemalloc.get_traced_memory()
+        for phase in self._phases:
+            phase.peak = max(phase.peak, peak)
+
+    def top(self, limit: int = 10, key: SortKey = 'retained') -> list[AllocationStats]:
+        """Return the operation phases with the most retained or peak allocations."""
+        return sorted(self._stats.values(), key=lambda stats: getattr(stats, key), reverse=True)[:limit]
+
+    def dump(self, limit: int = 10, key: SortKey = 'retained', file: typing.Optional[typing.TextIO] = None) -> None:
+        """Print the top offenders as a table."""
+        file = file or sys.stderr
+        print(f'{"operation":<30} {"phase":<8} {"samples":>8} {"retained":>12} {"mean":>10} {"peak":>10}', file=file)
+        for stats in self.top(limit, key):
+            mean = f'{stats.mean_retained:.0f}'
+            print(f'{stats.operation:<30} {stats.phase:<8} {stats.samples:>8} {stats.retained:>12} {mean:>10} {stats.peak:>10}', file=file)
+
+    def reset(self) -> None:
+        self._stats.clear()
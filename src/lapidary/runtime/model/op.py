@@ -1,15 +1,24 @@
+import asyncio
+import contextlib
+import dataclasses as dc
+import functools as ft
 import inspect
-from collections.abc import Awaitable, Callable
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
 
+import httpx
 import typing_extensions as typing
 
-from .error import HttpErrorResponse
+from .deadline import apply_deadline, deadline_at, remaining, resolve_deadline
+from .error import DeadlineExceeded, HttpErrorResponse
+from .projection import projection_query_params
 from .request import RequestAdapter, prepare_request_adapter
 from .response import ResponseMessageExtractor, mk_response_extractor
 
 if typing.TYPE_CHECKING:
     from ..client_base import ClientBase
     from ..operation import Operation
+    from .memprof import Phase
 
 
 def process_operation_method(fn: Callable, op: 'Operation') -> tuple[RequestAdapter, ResponseMessageExtractor]:
@@ -18,36 +27,216 @@ def process_operation_method(fn: Callable, op: 'Operation') -> tuple[RequestAdap
     params = {name: param.replace(annotation=type_hints[name]) for name, param in sig.parameters.items()}
     try:
         response_extractor, media_types = mk_response_extractor(type_hints['return'])
-        request_adapter = prepare_request_adapter(fn.__name__, params, op, media_types)
+        query_params = projection_query_params(type_hints['return'])
+        request_adapter = prepare_request_adapter(fn.__name__, params, op, media_types, query_params)
+        if op.codegen:
+            from .codegen import generate
+
+            return generate(fn.__name__, request_adapter, response_extractor)
         return request_adapter, response_extractor
     except TypeError as error:
         raise TypeError(fn.__name__) from error
 
 
-def mk_exchange_fn(
-    op_method: Callable,
-    op_decorator: 'Operation',
-) -> Callable[..., Awaitable[typing.Any]]:
-    request_adapter, response_handler = process_operation_method(op_method, op_decorator)
+@dc.dataclass
+class OperationPlan:
+    """
+    Everything needed to call an operation, prepared once from the operation method declaration.
 
-    async def exchange(self: 'ClientBase', **kwargs) -> typing.Any:
-        request, auth = request_adapter.build_request(self, kwargs)
+    Adapters are compiled when the operation method is defined, so badly declared operations fail early.
+    """
+
+    name: str
+    operation: 'Operation'
+    method: Callable
+    bound: Mapping[str, typing.Any] = dc.field(default_factory=dict)
+    """Arguments bound by `prepare()`, already applied by the request adapter."""
+    _compiled: typing.Optional[tuple[RequestAdapter, ResponseMessageExtractor]] = dc.field(default=None, init=False)
+
+    def compile(self) -> tuple[RequestAdapter, ResponseMessageExtractor]:
+        if self._compiled is None:
+            self._compiled = process_operation_method(self.method, self.operation)
+        return self._compiled
+
+    @property
+    def request_adapter(self) -> RequestAdapter:
+        return self.compile()[0]
+
+    @property
+    def response_handler(self) -> ResponseMessageExtractor:
+        return self.compile()[1]
+
+    def warm_up(self) -> None:
+        """Build what's otherwise built when handling the first response, like validators of lazily validated fields."""
+        _, response_handler = self.compile()
+        for mime_map in response_handler.response_map.values():
+            for extractor in mime_map.values():
+                for item in getattr(extractor, 'response_extractors', ()):
+                    warm_up = getattr(getattr(item, 'type_adapter', None), 'warm_up', None)
+                    if warm_up is not None:
+                        warm_up()
+
+    def prepare(self, client: 'ClientBase', bound: Mapping[str, typing.Any]) -> 'OperationPlan':
+        """Return the plan of calls with the `bound` arguments, validated and serialized once."""
+        request_adapter, response_handler = self.compile()
+        plan = OperationPlan(self.name, self.operation, self.method, {**self.bound, **bound})
+        plan._compiled = request_adapter.bind(client, bound), response_handler
+        return plan
+
+    async def exchange(self, client: 'ClientBase', kwargs: dict[str, typing.Any]) -> typing.Any:
+        client._sessions.ensure_owner()
+        swr = self.operation.swr
+        if swr is not None:
+            key_kwargs = {**self.bound, **kwargs} if self.bound else kwargs
+            return await client._refresher.get(self.name, key_kwargs, swr, ft.partial(self._exchange_deadline, client, kwargs))
+        return await self._exchange_deadline(client, kwargs)
+
+    async def _exchange_deadline(self, client: 'ClientBase', kwargs: dict[str, typing.Any]) -> typing.Any:
+        deadline = resolve_deadline(self.operation.deadline)
+        if deadline is None:
+            return await self._exchange_chunks(client, kwargs, None)
+
+        timeout = remaining(deadline)
+        with deadline_at(deadline):
+            try:
+                return await asyncio.wait_for(self._exchange_chunks(client, kwargs, deadline), timeout)
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded from None
+
+    async def _exchange_chunks(self, client: 'ClientBase', kwargs: dict[str, typing.Any], deadline: typing.Optional[float]) -> typing.Any:
+        chunker = self.request_adapter.chunker
+        chunks = chunker.split(client, self.request_adapter, kwargs) if chunker else None
+        if not chunks:
+            return await self._exchange(client, kwargs, deadline)
+        assert chunker
+        return await chunker.gather(lambda chunk_kwargs: self._exchange(client, chunk_kwargs, deadline), kwargs, chunks)
+
+    async def _exchange(self, client: 'ClientBase', kwargs: dict[str, typing.Any], deadline: typing.Optional[float]) -> typing.Any:
+        profiler = client._memory_profiler
+        if profiler is None or not profiler.sample():
+            return await self._exchange_phases(client, kwargs, deadline, _no_phase)
+        profiler.start()
+        return await self._exchange_phases(client, kwargs, deadline, ft.partial(profiler.phase, self.name))
+
+    async def _exchange_phases(
+        self,
+        client: 'ClientBase',
+        kwargs: dict[str, typing.Any],
+        deadline: typing.Optional[float],
+        phase: Callable[['Phase'], typing.ContextManager[None]],
+    ) -> typing.Any:
+        await client._auth_registry.refresh_auth(self.name, self.operation.security)
+        with phase('build'):
+            request, auth = self.request_adapter.build_request(client, kwargs)
 
         mw_state = []
-        for mw in self._middlewares:
+        for mw in client._middlewares:
             mw_state.append(await mw.handle_request(request))
 
-        response = await self._client.send(request, auth=auth)
+        if deadline is not None:
+            apply_deadline(request, deadline, client._deadline_header)
 
-        await response.aread()
+        with phase('read'):
+            response = await self._send(client, request, auth, deadline)
+            await response.aread()
 
-        for mw, state in zip(reversed(self._middlewares), reversed(mw_state)):
+        for mw, state in zip(reversed(client._middlewares), reversed(mw_state)):
             await mw.handle_response(response, request, state)
 
-        status_code, result = response_handler.handle_response(response)
+        with phase('extract'):
+            status_code, result = await self._extract(client, response)
         if status_code >= 400:
             raise HttpErrorResponse(status_code, result[1], result[0])
         else:
             return result
 
+    async def _extract(self, client: 'ClientBase', response: httpx.Response) -> tuple[int, typing.Any]:
+        threshold = client._offload_threshold
+        if threshold is None or len(response.content) < threshold:
+            return self.response_handler.handle_response(response)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(client._offload_executor, self.response_handler.handle_response, response)
+
+    async def _send(
+        self,
+        client: 'ClientBase',
+        request: httpx.Request,
+        auth: typing.Optional[httpx.Auth],
+        deadline: typing.Optional[float],
+    ) -> httpx.Response:
+        operation = self.operation
+        pool = client._sessions.pool_name(self.name, operation.pool)
+        send = _mk_send(client, pool, auth, operation.priority)
+        try:
+            if operation.hedge is None:
+                return await send(request)
+            else:
+                from .hedge import Hedger
+
+                hedger = client._hedgers.get(self.name) or client._hedgers.setdefault(self.name, Hedger(operation.hedge))
+                return await hedger.send(send, request)
+        except httpx.TimeoutException as error:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise DeadlineExceeded from error
+            raise
+
+
+def _mk_send(
+    client: 'ClientBase',
+    pool: typing.Optional[str],
+    auth: typing.Optional[httpx.Auth],
+    priority: typing.Optional[int] = None,
+) -> Callable[[httpx.Request], Awaitable[httpx.Response]]:
+    """Compose sending a single request: scheduling, load balancing, adaptive concurrency limit and the pool group session."""
+    send: Callable[[httpx.Request], Awaitable[httpx.Response]] = ft.partial(client._sessions.send, pool, auth=auth)
+    if client._limiter is not None:
+        send = ft.partial(client._limiter.send, send=send)
+    if client._load_balancer is not None:
+        send = ft.partial(client._load_balancer.send, base_url=client._client.base_url, send=send)
+    if client._scheduler is not None:
+        from .scheduler import resolve_priority
+
+        send = ft.partial(client._scheduler.send, priority=resolve_priority(priority), send=send)
+    return send
+
+
+def _no_phase(_: 'Phase') -> typing.ContextManager[None]:
+    return contextlib.nullcontext()
+
+
+def mk_exchange_fn(
+    op_method: Callable,
+    op_decorator: 'Operation',
+) -> Callable[..., Awaitable[typing.Any]]:
+    plan = OperationPlan(op_method.__name__, op_decorator, op_method)
+    plan.compile()
+
+    async def exchange(self: 'ClientBase', **kwargs) -> typing.Any:
+        return await plan.exchange(self, kwargs)
+
+    exchange.lapidary_plan = plan  # type: ignore[attr-defined]
     return exchange
+
+
+@dc.dataclass(frozen=True)
+class PreparedCall:
+    """An operation method of a client with some arguments bound, called with the remaining ones."""
+
+    client: 'ClientBase'
+    lapidary_plan: OperationPlan
+
+    async def __call__(self, **kwargs: typing.Any) -> typing.Any:
+        return await self.lapidary_plan.exchange(self.client, kwargs)
+
+
+def find_plans(client_type: type) -> Iterable[OperationPlan]:
+    """Find plans of all operation methods of the client class, including inherited ones."""
+    seen = set()
+    for klass in client_type.__mro__:
+        for name, attr in vars(klass).items():
+            if name in seen:
+                continue
+            seen.add(name)
+            plan = getattr(attr, 'lapidary_plan', None)
+            if isinstance(plan, OperationPlan):
+                yield plan
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses as dc
+import functools as ft
+import logging
+import os
+import ssl
+from collections.abc import Collection, Mapping, MutableMapping
+
+import httpx
+import typing_extensions as typing
+
+from ..http_consts import USER_AGENT
+
+if typing.TYPE_CHECKING:
+    from ..types_ import ClientArgs, SessionFactory
+
+
+@dc.dataclass(frozen=True)
+class PoolGroup:
+    """
+    Settings for a named group of operations that get their own connection pool.
+
+    Operations join a group either with the `pool` argument of the operation decorator, or by being listed in `operations`.
+    Settings left as `None` fall back to the client-wide arguments.
+    """
+
+    limits: httpx.Limits | None = None
+    http1: bool | None = None
+    http2: bool | None = None
+    max_concurrency: int | None = None
+    """Maximum number of requests in flight in this group, including the ones waiting for a connection."""
+
+    operations: Collection[str] = ()
+    """Names of operation methods assigned to this group, overriding the decorator."""
+
+    def client_args(self) -> Mapping[str, typing.Any]:
+        return {name: value for name in ('limits', 'http1', 'http2') if (value := getattr(self, name)) is not None}
+
+
+_DEFAULT_GROUP = PoolGroup()
+
+logger = logging.getLogger(__name__)
+
+_fork_generation = 0
+"""Number of forks in the history of this process, so sessions can tell they were inherited from the parent."""
+
+
+def _after_fork() -> None:
+    global _fork_generation
+    _fork_generation += 1
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+class LoopOwner:
+    """
+    Remembers the event loop and process that use some asyncio state, so the state can be re-created after a fork
+    or when it's used in another event loop, the way `SessionRegistry.ensure_owner()` does with sessions.
+    """
+
+    def __init__(self) -> None:
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.generation = _fork_generation
+
+    @property
+    def forked(self) -> bool:
+        """Whether the state was inherited from the parent process."""
+        return self.generation != _fork_generation
+
+    def changed(self) -> bool:
+        """Claim the running loop, and return whether the state was used by another loop or by the parent process."""
+        loop = asyncio.get_running_loop()
+        if self.loop is loop and self.generation == _fork_generation:
+            return False
+        changed = self.loop is not None or self.forked
+        self.loop = loop
+        self.generation = _fork_generation
+        return changed
+
+
+def _renew_transport(transport: httpx.AsyncBaseTransport | None) -> httpx.AsyncBaseTransport | None:
+    """Return a transport for use in a forked child process or in another event loop."""
+    if transport is None or isinstance(transport, (httpx.MockTransport, httpx.ASGITransport)):
+        # they hold no connections
+        return transport
+    renew = getattr(transport, 'renew', None)
+    if renew is None:
+        raise RuntimeError(
+            f'{type(transport).__name__} cannot be used in a forked process or in another event loop. '
+            'Create it in a session_factory, or use a transport with a renew() method.'
+        )
+    return renew()
+
+
+def default_ssl_context(trust_env: bool, http1: bool, http2: bool) -> ssl.SSLContext:
+    """
+    Loading CA certificates takes most of the time of creating an httpx client, so share the default SSL context.
+
+    It's shared by clients with the same settings that affect it, and must not be modified; pass `verify` with your own
+    context to change it. The transport sets ALPN protocols on the context when connecting, depending on the HTTP versions,
+    and with `trust_env` the certificates are loaded from `SSL_CERT_FILE` or `SSL_CERT_DIR`, so they're part of the key.
+    """
+    cert_env = (os.environ.get('SSL_CERT_FILE'), os.environ.get('SSL_CERT_DIR')) if trust_env else (None, None)
+    return _ssl_context(trust_env, http1, http2, *cert_env)
+
+
+@ft.cache
+def _ssl_context(trust_env: bool, http1: bool, http2: bool, cert_file: str | None, cert_dir: str | None) -> ssl.SSLContext:
+    return httpx.create_ssl_context(trust_env=trust_env)
+
+
+async def _aclose_quietly(session: httpx.AsyncClient) -> None:
+    try:
+        await session.aclose()
+    except RuntimeError:
+        # the loop of its connections is closed, the transport closes what it can, e.g. H11Transport shuts down its sockets
+        logger.debug('Could not close all connections of a closed event loop', exc_info=True)
+
+
+class SessionRegistry:
+    """Holds the default httpx session and lazily created sessions for named pool groups."""
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        httpx_kwargs: ClientArgs,
+        pools: Mapping[str, PoolGroup],
+    ) -> None:
+        self._session_factory = session_factory
+        self._httpx_kwargs = httpx_kwargs
+        self._pools = pools
+        self._operation_pools = {operation: pool for pool, group in pools.items() for operation in group.operations}
+
+        self.default = self._mk_session(_DEFAULT_GROUP)
+        self._sessions: MutableMapping[str, httpx.AsyncClient] = {}
+        self._semaphores: MutableMapping[str, asyncio.Semaphore | None] = {}
+        self._owner = LoopOwner()
+        self._closing: set[asyncio.Task] = set()
+
+    def ensure_owner(self) -> None:
+        """
+        Re-create the sessions when used in a forked child process or in another event loop than before.
+
+        Connections and asyncio objects of the sessions can't be shared with the parent process or used in another loop.
+        After a fork the old sessions are dropped without closing, since that would close the connections of the parent.
+        Otherwise they're closed in their loop if it's still running, or else in the current one.
+        Transports passed by the user are replaced by the result of their `renew()` method.
+        """
+        old_loop, forked = self._owner.loop, self._owner.forked
+        if not self._owner.changed():
+            return
+        logger.debug('Re-creating sessions after fork or event loop change')
+        old_sessions = [self.default, *self._sessions.values()]
+        self._renew_transports()
+        self.default = self._mk_session(_DEFAULT_GROUP)
+        self._sessions = {}
+        self._semaphores = {}
+        if not forked:
+            self._close_abandoned(old_sessions, old_loop)
+
+    def _close_abandoned(self, sessions: list[httpx.AsyncClient], loop: asyncio.AbstractEventLoop | None) -> None:
+        for session in sessions:
+            if loop is not None and loop.is_running():
+                # not awaited in aclose(), the other loop may stop before running it
+                asyncio.run_coroutine_threadsafe(session.aclose(), loop)
+            else:
+                task = asyncio.ensure_future(_aclose_quietly(session))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+
+    def _renew_transports(self) -> None:
+        kwargs: dict[str, typing.Any] = dict(self._httpx_kwargs)
+        if 'transport' in kwargs:
+            kwargs['transport'] = _renew_transport(kwargs['transport'])
+        if 'mounts' in kwargs:
+            kwargs['mounts'] = {pattern: _renew_transport(transport) for pattern, transport in kwargs['mounts'].items()}
+        self._httpx_kwargs = typing.cast('ClientArgs', kwargs)
+
+    def pool_name(self, operation_name: str, operation_pool: str | None) -> str | None:
+        return self._operation_pools.get(operation_name, operation_pool)
+
+    def session(self, pool_name: str | None) -> httpx.AsyncClient:
+        if pool_name is None:
+            return self.default
+        try:
+            return self._sessions[pool_name]
+        except KeyError:
+            session = self._mk_session(self._pools.get(pool_name, _DEFAULT_GROUP))
+            self._sessions[pool_name] = session
+            return session
+
+    def semaphore(self, pool_name: str | None) -> asyncio.Semaphore | None:
+        if pool_name is None:
+            return None
+        try:
+            return self._semaphores[pool_name]
+        except KeyError:
+            group = self._pools.get(pool_name, _DEFAULT_GROUP)
+            # created lazily, so that it binds to the running event loop
+            semaphore = asyncio.Semaphore(group.max_concurrency) if group.max_concurrency is not None else None
+            self._semaphores[pool_name] = semaphore
+            return semaphore
+
+    async def send(self, pool_name: str | None, request: httpx.Request, auth: typing.Any) -> httpx.Response:
+        session = self.session(pool_name)
+        semaphore = self.semaphore(pool_name)
+        if semaphore is None:
+            return await session.send(request, auth=auth)
+        async with semaphore:
+            response = await session.send(request, auth=auth)
+            await response.aread()
+            return response
+
+    def configured_sessions(self) -> list[httpx.AsyncClient]:
+        """Return the default session and sessions of all configured pool groups, creating them if necessary."""
+        return [self.default, *(self.session(pool_name) for pool_name in self._pools)]
+
+    async def aclose(self) -> None:
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        self._semaphores.clear()
+        for session in sessions:
+            await session.aclose()
+        await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def _mk_session(self, group: PoolGroup) -> httpx.AsyncClient:
+        kwargs: dict[str, typing.Any] = {**self._httpx_kwargs, **group.client_args()}
+        # custom factories get exactly the arguments of the client
+        if self._session_factory is httpx.AsyncClient and 'verify' not in kwargs and 'cert' not in kwargs:
+            kwargs['verify'] = default_ssl_context(kwargs.get('trust_env', True), kwargs.get('http1', True), kwargs.get('http2', False))
+        session = self._session_factory(**kwargs)
+        if USER_AGENT not in session.headers:
+            from ..client_base import lapidary_user_agent
+
+            session.headers[USER_AGENT] = lapidary_user_agent()
+        return session
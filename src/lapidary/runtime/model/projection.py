@@ -0,0 +1,140 @@
+import dataclasses as dc
+import functools as ft
+import inspect
+from collections.abc import Iterable, Mapping
+
+import pydantic
+import typing_extensions as typing
+
+from ..annotations import Responses
+from ..pycompat import UNION_TYPES
+from .annotations import find_annotation
+
+
+@dc.dataclass(frozen=True)
+class Projection:
+    """
+    Annotation for response body types, that limits parsing to a subset of fields, e.g. `Annotated[Cat, Projection({'id', 'owner.name'})]`.
+
+    `fields` is either a model with a subset of fields of the body type, or a collection of dotted field paths.
+    Nested models and lists of models are projected too, fields outside of the projection are skipped without being validated.
+
+    With `query_param` set, the projected field names (or their aliases) are also sent as that query parameter,
+    for APIs that support sparse fieldsets.
+    """
+
+    fields: typing.Union[type[pydantic.BaseModel], Iterable[str]]
+    query_param: typing.Optional[str] = None
+    separator: str = ','
+
+    def __hash__(self) -> int:
+        return hash((self.fields if inspect.isclass(self.fields) else frozenset(self.fields), self.query_param, self.separator))
+
+    def projected_type(self, typ: typing.Any) -> typing.Any:
+        if inspect.isclass(self.fields):
+            return _replace_models(typ, lambda _: _ignore_extra(typing.cast(type[pydantic.BaseModel], self.fields)))
+        return _replace_models(typ, lambda model: _project(model, frozenset(typing.cast(Iterable[str], self.fields))))
+
+    def query_value(self, typ: typing.Any) -> str:
+        if inspect.isclass(self.fields):
+            names: Iterable[str] = (field.alias or name for name, field in self.fields.model_fields.items())
+        else:
+            model = _find_model(typ)
+            names = (_alias_path(model, path) if model else path for path in self.fields)
+        return self.separator.join(sorted(names))
+
+
+def find_projection(typ: typing.Any) -> typing.Optional[tuple[typing.Any, Projection]]:
+    """Return the annotated type and its `Projection`, if there is one."""
+    if typing.get_origin(typ) is not typing.Annotated:
+        return None
+    inner, *annotations = typing.get_args(typ)
+    for anno in annotations:
+        if isinstance(anno, Projection):
+            return inner, anno
+    return None
+
+
+def projection_query_params(return_type: typing.Any) -> list[tuple[str, str]]:
+    """Collect query parameters forwarding projections of all the response bodies of an operation."""
+    _, responses = find_annotation(return_type, Responses)
+    params: dict[str, str] = {}
+    for response in responses.responses.values():
+        for typ in response.body.content.values():
+            found = find_projection(typ)
+            if found and found[1].query_param:
+                inner, projection = found
+                params.setdefault(typing.cast(str, projection.query_param), projection.query_value(inner))
+    return list(params.items())
+
+
+def _replace_models(typ: typing.Any, replace: typing.Callable[[type[pydantic.BaseModel]], typing.Any]) -> typing.Any:
+    """Replace models in the type, including models inside Optional, Union and generic collections."""
+    if inspect.isclass(typ) and issubclass(typ, pydantic.BaseModel):
+        return replace(typ)
+    origin = typing.get_origin(typ)
+    args = typing.get_args(typ)
+    if origin is None or not args or origin is typing.Annotated:
+        return typ
+    new_args = tuple(_replace_models(arg, replace) for arg in args)
+    if origin in UNION_TYPES:
+        return typing.Union[new_args]
+    return origin[new_args if len(new_args) > 1 else new_args[0]]
+
+
+def _find_model(typ: typing.Any) -> typing.Optional[type[pydantic.BaseModel]]:
+    if inspect.isclass(typ) and issubclass(typ, pydantic.BaseModel):
+        return typ
+    for arg in typing.get_args(typ):
+        if model := _find_model(arg):
+            return model
+    return None
+
+
+def _split_paths(paths: Iterable[str]) -> Mapping[str, frozenset[str]]:
+    result: dict[str, set[str]] = {}
+    for path in paths:
+        head, _, tail = path.partition('.')
+        result.setdefault(head, set())
+        if tail:
+            result[head].add(tail)
+    return {head: frozenset(tails) for head, tails in result.items()}
+
+
+@ft.cache
+def _project(model: type[pydantic.BaseModel], paths: frozenset[str]) -> type[pydantic.BaseModel]:
+    fields: dict[str, typing.Any] = {}
+    for name, sub_paths in _split_paths(paths).items():
+        try:
+            field = model.model_fields[name]
+        except KeyError:
+            raise TypeError('Unknown field in projection', model.__name__, name) from None
+        annotation = field.annotation
+        if sub_paths:
+            annotation = _replace_models(annotation, lambda sub_model: _project(sub_model, sub_paths))
+        fields[name] = (annotation, field)
+    return pydantic.create_model(  # type: ignore[call-overload, no-any-return]
+        f'{model.__name__}Projection',
+        __config__=pydantic.ConfigDict(extra='ignore', populate_by_name=bool(model.model_config.get('populate_by_name'))),
+        __module__=model.__module__,
+        **fields,
+    )
+
+
+@ft.cache
+def _ignore_extra(model: type[pydantic.BaseModel]) -> type[pydantic.BaseModel]:
+    if model.model_config.get('extra') in (None, 'ignore'):
+        return model
+    return type(model.__name__, (model,), {'model_config': pydantic.ConfigDict(extra='ignore'), '__module__': model.__module__})
+
+
+def _alias_path(model: type[pydantic.BaseModel], path: str) -> str:
+    head, _, tail = path.partition('.')
+    field = model.model_fields.get(head)
+    if field is None:
+        return path
+    alias = field.alias or head
+    if not tail:
+        return alias
+    sub_model = _find_model(field.annotation)
+    return f'{alias}.{_alias_path(sub_model, tail) if sub_model else tail}'
@@ -0,0 +1,159 @@
+import abc
+import asyncio
+import logging
+import time
+from collections.abc import Generator
+
+import httpx
+import httpx_auth as authx
+import typing_extensions as typing
+
+from .pool import LoopOwner
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshableAuth(httpx.Auth, authx.SupportMultiAuth, abc.ABC):
+    """
+    Base class for token based Auth that fetches tokens asynchronously and refreshes them before they expire.
+
+    A refresh is scheduled `refresh_margin` seconds before the token expires, and runs in the background while calls keep
+    using the current token. Only calls made without a valid token wait, and concurrent callers share a single refresh.
+    Scheduled refreshes only continue while the token is used, so idle clients stop fetching tokens until the next call.
+    After a failed refresh, the next one starts no sooner than `error_backoff` seconds later, unless a call has no valid token.
+
+    Refreshing stops when the client is closed, and moves to the new event loop when the Auth is used in a forked process
+    or in another loop. The token is kept in both cases.
+    """
+
+    def __init__(self, refresh_margin: float = 30.0, error_backoff: float = 5.0) -> None:
+        self.refresh_margin = refresh_margin
+        self.error_backoff = error_backoff
+        # (token, expiry in time.monotonic() terms), swapped as a whole
+        self._token: typing.Optional[tuple[str, float]] = None
+        self._refresh_task: typing.Optional[asyncio.Task] = None
+        self._retry_at = 0.0
+        self._timer: typing.Optional[asyncio.TimerHandle] = None
+        self._used = False
+        self._owner = LoopOwner()
+
+    @abc.abstractmethod
+    async def fetch_token(self) -> tuple[str, float]:
+        """Obtain a new token. Return the token and its lifetime in seconds."""
+
+    def apply_token(self, request: httpx.Request, token: str) -> None:
+        request.headers['Authorization'] = f'Bearer {token}'
+
+    async def ensure_token(self) -> None:
+        if self._owner.changed():
+            self._reset()
+        now = time.monotonic()
+        token = self._token
+        if token is not None and now < token[1] - self.refresh_margin:
+            return
+        if token is None or now >= token[1]:
+            # shield the shared task from cancellation of any single waiter
+            await asyncio.shield(self._refresh())
+        elif now >= self._retry_at:
+            self._refresh()
+
+    def _refresh(self) -> asyncio.Task:
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._fetch())
+            self._refresh_task.add_done_callback(self._refresh_done)
+        return self._refresh_task
+
+    async def _fetch(self) -> None:
+        try:
+            token, lifetime = await self.fetch_token()
+        except Exception:
+            now = time.monotonic()
+            self._retry_at = now + self.error_backoff
+            if self._token is not None and now < self._token[1]:
+                self._schedule(self.error_backoff)
+            raise
+        self._token = token, time.monotonic() + lifetime
+        self._used = False
+        if lifetime > self.refresh_margin:
+            self._schedule(lifetime - self.refresh_margin)
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._scheduled_refresh)
+
+    def _scheduled_refresh(self) -> None:
+        self._timer = None
+        if self._used:
+            self._refresh()
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        if self._refresh_task is task:
+            self._refresh_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning('Token refresh failed', exc_info=task.exception())
+
+    def _reset(self) -> None:
+        # the task and timer belong to another loop, or to the parent process
+        logger.debug('Re-creating token refresh after fork or event loop change')
+        timer, self._timer, self._refresh_task = self._timer, None, None
+        if timer is not None:
+            timer.cancel()
+            # loops use the monotonic clock
+            self._schedule(max(timer.when() - asyncio.get_running_loop().time(), 0.0))
+
+    async def aclose(self) -> None:
+        """Cancel the scheduled and running refresh. The next call without a valid token starts a new one."""
+        if self._owner.changed():
+            self._reset()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        task = self._refresh_task
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
+        token = self._token
+        if token is None:
+            raise ValueError('No token, call ensure_token() first')
+        self._used = True
+        self.apply_token(request, token[0])
+        yield request
+
+
+class ClientCredentialsAuth(RefreshableAuth):
+    """OAuth2 client credentials flow with refresh ahead of token expiry."""
+
+    def __init__(
+        self,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        scope: typing.Optional[str] = None,
+        *,
+        refresh_margin: float = 30.0,
+        error_backoff: float = 5.0,
+        session: typing.Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        super().__init__(refresh_margin, error_backoff)
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self._session = session
+
+    async def fetch_token(self) -> tuple[str, float]:
+        data = {'grant_type': 'client_credentials'}
+        if self.scope:
+            data['scope'] = self.scope
+        session = self._session or httpx.AsyncClient()
+        try:
+            response = await session.post(self.token_url, data=data, auth=(self.client_id, self.client_secret))
+        finally:
+            if self._session is None:
+                await session.aclose()
+        response.raise_for_status()
+        body = response.json()
+        return body['access_token'], float(body.get('expires_in', 3600))
@@ -2,10 +2,9 @@ import abc
 import dataclasses as dc
 import functools as ft
 import inspect
-from collections.abc import Callable, Iterable, Mapping, MutableMapping
+from collections.abc import Callable, Hashable, Iterable, Mapping, MutableMapping
 
 import httpx
-import mimeparse
 import pydantic
 import typing_extensions as typing
 
@@ -17,11 +16,13 @@ from .annotations import (
     find_annotation,
     find_field_annotation,
 )
+from .chunking import Chunker, mk_chunker
 from .param_serialization import SCALAR_TYPES, Multimap, ScalarType
 
 if typing.TYPE_CHECKING:
     from ..client_base import ClientBase
     from ..operation import Operation
+    from .body_cache import BodyCache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -45,6 +46,7 @@ class RequestBuilder:  # pylint: disable=too-many-instance-attributes
     query_params: list[tuple[str, str]] = dc.field(default_factory=list)
 
     content: typing.Optional[httpx._types.RequestContent] = None
+    body_cache: typing.Optional['BodyCache'] = None
 
     def __call__(self) -> httpx.Request:
         assert self.method
@@ -59,6 +61,16 @@ class RequestBuilder:  # pylint: disable=too-many-instance-attributes
             cookies=self.cookies,
         )
 
+    def copy(self, request_factory: RequestFactory) -> 'RequestBuilder':
+        return dc.replace(
+            self,
+            request_factory=request_factory,
+            cookies=httpx.Cookies(self.cookies),
+            headers=self.headers.copy(),
+            path_params=dict(self.path_params),
+            query_params=list(self.query_params),
+        )
+
 
 class RequestContributor(abc.ABC):
     @abc.abstractmethod
@@ -174,13 +186,30 @@ class FreeParamsContributor(ParamsContributor):
             raise TypeError from e
         super().update_builder(builder, model)
 
+    def subset(self, names: typing.Collection[str]) -> typing.Optional['FreeParamsContributor']:
+        """Return the contributor of the named parameters only."""
+        if not names:
+            return None
+        model_fields = {name: (field.annotation, field) for name, field in self.model_type.model_fields.items() if name in names}
+        return FreeParamsContributor(
+            contributors={name: contributor for name, contributor in self.contributors.items() if name in names},
+            model_type=pydantic.create_model(self.model_type.__name__, **model_fields),  # type: ignore[call-overload]
+        )
+
 
 @dc.dataclass
 class BodyContributor:
     serializers: list[tuple[pydantic.TypeAdapter, str]]
+    cache_key: Hashable = dc.field(default_factory=object)
+    """Identifies the serializers in `BodyCache`, equal for equal body declarations."""
 
     def update_builder(self, builder: 'RequestBuilder', value: typing.Any, media_type: MimeType = MIME_JSON) -> None:
-        matched_media_type, content = self._dump(value, media_type)
+        if builder.body_cache is None:
+            matched_media_type, content = self._dump(value, media_type)
+        else:
+            matched_media_type, content = builder.body_cache.encode(
+                value, (media_type, self.cache_key), ft.partial(self._dump, value, media_type)
+            )
         builder.headers[CONTENT_TYPE] = matched_media_type
         builder.content = content
 
@@ -201,15 +230,21 @@ class BodyContributor:
     def for_parameter(cls, annotation: type) -> typing.Self:
         body: Body
         _, body = find_annotation(annotation, Body)
-        serializers = [
-            (pydantic.TypeAdapter(python_type), media_type)
-            for media_type, python_type in body.content.items()
-            if BodyContributor._media_matches(media_type)
+        content = [
+            (media_type, python_type) for media_type, python_type in body.content.items() if BodyContributor._media_matches(media_type)
         ]
-        return cls(serializers)
+        serializers = [(pydantic.TypeAdapter(typ), media_type) for media_type, typ in content]
+        cache_key = tuple(content)
+        try:
+            hash(cache_key)
+        except TypeError:
+            return cls(serializers)
+        return cls(serializers, cache_key)
 
     @staticmethod
     def _media_matches(media_type: str, match: str = MIME_JSON) -> bool:
+        import mimeparse
+
         m_type, m_subtype, _ = mimeparse.parse_media_range(media_type)
         return f'{m_type}/{m_subtype}' == match
 
@@ -224,7 +259,13 @@ class RequestObjectContributor(RequestContributor):
     free_param_contributor: typing.Optional[FreeParamsContributor]
     free_param_names: Iterable[str]
 
-    def update_builder(self, builder: RequestBuilder, kwargs: dict[str, typing.Any]) -> None:
+    def update_builder(self, builder: RequestBuilder, kwargs: Mapping[str, typing.Any]) -> None:
+        free_params = self._update_builder(builder, kwargs)
+        if self.free_param_contributor:
+            self.free_param_contributor.update_builder(builder, free_params)
+
+    def _update_builder(self, builder: RequestBuilder, kwargs: Mapping[str, typing.Any]) -> dict[str, typing.Any]:
+        """Apply all arguments but free parameters, and return those."""
         free_params: dict[str, typing.Any] = {}
         for name, value in kwargs.items():
             if name == self.body_param:
@@ -238,8 +279,27 @@ class RequestObjectContributor(RequestContributor):
                 except KeyError:
                     raise TypeError('Unexpected argument', name) from None
                 contributor.update_builder(builder, value)
-        if self.free_param_contributor:
-            self.free_param_contributor.update_builder(builder, free_params)
+        return free_params
+
+    def bind(self, builder: RequestBuilder, bound: Mapping[str, typing.Any]) -> typing.Self:
+        """Apply the bound arguments to the builder, and return the contributor of the remaining ones."""
+        free_params = self._update_builder(builder, bound)
+        free_param_contributor = self.free_param_contributor
+        free_param_names = set(self.free_param_names)
+        if free_params:
+            assert free_param_contributor is not None
+            free_param_contributor.subset(free_params.keys()).update_builder(builder, free_params)  # type: ignore[union-attr]
+            free_param_names -= free_params.keys()
+            free_param_contributor = free_param_contributor.subset(free_param_names)
+        body_bound = self.body_param is not None and self.body_param in bound
+        return dc.replace(
+            self,
+            contributors={name: contributor for name, contributor in self.contributors.items() if name not in bound},
+            body_param=None if body_bound else self.body_param,
+            body_contributor=None if body_bound else self.body_contributor,
+            free_param_contributor=free_param_contributor,
+            free_param_names=free_param_names,
+        )
 
     @classmethod
     def for_signature(cls, sig: Signature) -> typing.Self:
@@ -300,19 +360,26 @@ class RequestAdapter:
     contributor: RequestContributor
     accept: typing.Optional[Iterable[str]]
     security: typing.Optional[Iterable[SecurityRequirements]]
+    chunker: typing.Optional['Chunker'] = None
+    query_params: typing.Sequence[tuple[str, str]] = ()
+    """Constant query parameters, sent unless the call sets them."""
+    bound: typing.Optional[RequestBuilder] = None
+    """Request parts serialized from bound arguments, copied into each request."""
 
     def build_request(
         self,
         client: 'ClientBase',
-        kwargs: dict[str, typing.Any],
+        kwargs: Mapping[str, typing.Any],
     ) -> tuple[httpx.Request, typing.Optional[httpx.Auth]]:
-        builder = RequestBuilder(
-            typing.cast(RequestFactory, client._client.build_request),
-            self.http_method,
-            self.http_path_template,
-        )
+        builder = self._new_builder(client)
 
         self.contributor.update_builder(builder, kwargs)
+        if client._default_headers:
+            defaults = [(name, value) for name, value in client._default_headers.multi_items() if name not in builder.headers]
+            builder.headers = httpx.Headers([*defaults, *builder.headers.multi_items()])
+        if self.query_params:
+            call_params = {name for name, _ in builder.query_params}
+            builder.query_params.extend(param for param in self.query_params if param[0] not in call_params)
 
         accept_values: set[str] = set()
         if ACCEPT not in builder.headers and self.accept is not None:
@@ -321,8 +388,31 @@ class RequestAdapter:
         auth = client._auth_registry.resolve_auth(self.name, self.security)
         return builder(), auth
 
-
-def prepare_request_adapter(name: str, sig: Signature, operation: 'Operation', accept: Iterable[str]) -> RequestAdapter:
+    def bind(self, client: 'ClientBase', bound: Mapping[str, typing.Any]) -> 'RequestAdapter':
+        """Return the adapter of the remaining arguments, with the bound ones validated and serialized once."""
+        if self.chunker is not None and self.chunker.python_name in bound:
+            raise TypeError('Chunked argument cannot be bound', self.chunker.python_name)
+        assert isinstance(self.contributor, RequestObjectContributor)
+        template = self._new_builder(client)
+        contributor = self.contributor.bind(template, bound)
+        return dc.replace(self, contributor=contributor, bound=template)
+
+    def _new_builder(self, client: 'ClientBase') -> RequestBuilder:
+        request_factory = typing.cast(RequestFactory, client._client.build_request)
+        if self.bound is None:
+            return RequestBuilder(request_factory, self.http_method, self.http_path_template, body_cache=client._body_cache)
+        builder = self.bound.copy(request_factory)
+        builder.body_cache = client._body_cache
+        return builder
+
+
+def prepare_request_adapter(
+    name: str,
+    sig: Signature,
+    operation: 'Operation',
+    accept: Iterable[str],
+    query_params: typing.Sequence[tuple[str, str]] = (),
+) -> RequestAdapter:
     return RequestAdapter(
         name,
         operation.method,
@@ -330,6 +420,8 @@ def prepare_request_adapter(name: str, sig: Signature, operation: 'Operation', a
         RequestObjectContributor.for_signature(sig),
         accept,
         operation.security,
+        mk_chunker(sig),
+        query_params,
     )
 
 
@@ -15,6 +15,7 @@ from ..type_adapter import TypeAdapter, mk_type_adapter
 from ..types_ import MimeType, StatusCodeRange, StatusCodeType
 from .annotations import find_annotation, find_field_annotation
 from .error import UnexpectedResponse
+from .lazy import LazyAdapter
 from .param_serialization import SCALAR_TYPES, ValueType
 
 
@@ -38,8 +39,10 @@ class BodyExtractor(ResponseExtractor):
 
     def handle_response(self, response: httpx.Response) -> typing.Any:
         try:
+            if isinstance(self.type_adapter, LazyAdapter):
+                return self.type_adapter(response.text, response)
             return self.type_adapter(response.text) if self.type_adapter else None
-        except pydantic.ValidationError as e:
+        except ValueError as e:  # includes pydantic.ValidationError
             raise UnexpectedResponse(response) from e
 
 
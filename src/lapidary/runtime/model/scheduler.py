@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import enum
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Callable, Iterator
+
+import httpx
+
+from .error import RequestShed
+from .pool import LoopOwner
+
+
+class Priority(enum.IntEnum):
+    """Common priorities, any int can be used. Requests with higher priority are sent first."""
+
+    BACKGROUND = 0
+    NORMAL = 10
+    INTERACTIVE = 20
+
+
+_priority: contextvars.ContextVar[int | None] = contextvars.ContextVar('lapidary_priority', default=None)
+
+
+@contextlib.contextmanager
+def priority(value: int) -> Iterator[None]:
+    """Set the priority of all operation calls made within the block, over the priority of their operations."""
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def resolve_priority(operation_priority: int | None) -> int:
+    current = _priority.get()
+    if current is not None:
+        return current
+    return operation_priority if operation_priority is not None else Priority.NORMAL
+
+
+class PriorityScheduler:
+    """
+    Limits the number of requests in flight to `max_in_flight`, e.g. the size of the connection pool, and when it's reached,
+    admits the waiting requests by priority, then in order of arrival.
+
+    With `shed_after` set, requests with priority up to `shed_priority` raise `RequestShed` after waiting that many seconds,
+    or right away when any queued request has already waited that long.
+    Used in a forked process or in another event loop, the scheduler forgets the requests in flight and in the queue.
+    """
+
+    def __init__(self, max_in_flight: int, shed_after: float | None = None, shed_priority: int = Priority.BACKGROUND) -> None:
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be positive', max_in_flight)
+        self.max_in_flight = max_in_flight
+        self.shed_after = shed_after
+        self.shed_priority = shed_priority
+        self._in_flight = 0
+        # heap of (-priority, arrival number, arrival time, waiter)
+        self._waiters: list[tuple[int, int, float, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._owner = LoopOwner()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def send(
+        self,
+        request: httpx.Request,
+        priority: int,
+        send: Callable[[httpx.Request], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        if self._owner.changed():
+            # they belong to another loop or to the parent process, and never release their slots here
+            self._in_flight = 0
+            self._waiters = []
+        await self._acquire(priority)
+        try:
+            return await send(request)
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int) -> None:
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            return
+
+        now = time.monotonic()
+        timeout = self.shed_after if priority <= self.shed_priority else None
+        if timeout is not None and self._waiters and now - min(entry[2] for entry in self._waiters) > timeout:
+            raise RequestShed
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = -priority, next(self._counter), now, waiter
+        heapq.heappush(self._waiters, entry)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+            if waiter.done() and not waiter.cancelled():
+                # admitted just as the wait ended
+                self._release()
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            if isinstance(error, asyncio.TimeoutError):
+                raise RequestShed from None
+            raise
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        while self._waiters and self._in_flight < self.max_in_flight:
+            *_, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
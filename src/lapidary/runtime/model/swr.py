@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import dataclasses as dc
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+
+import typing_extensions as typing
+
+from .deadline import clear_deadline
+from .pool import LoopOwner
+
+logger = logging.getLogger(__name__)
+
+
+@dc.dataclass(frozen=True)
+class StaleWhileRevalidate:
+    """
+    Cache results of an operation per set of arguments, and serve stale results while they're refreshed in the background.
+
+    Results younger than `ttl` seconds are returned as they are. Older ones are returned too, but the first such call starts
+    a refresh. Results older than `ttl + max_stale` aren't used, calls wait for a fresh one.
+    After a failed background refresh, the next one starts no sooner than `error_backoff` seconds later.
+    """
+
+    ttl: float
+    max_stale: float | None = None
+    error_backoff: float = 5.0
+    max_entries: int = 128
+    """Maximum number of argument sets cached per operation, least recently used are dropped first."""
+
+
+@dc.dataclass
+class _Entry:
+    value: typing.Any = None
+    fetched_at: float = -math.inf
+    retry_at: float = 0.0
+    task: asyncio.Task | None = None
+
+
+class Refresher:
+    """
+    Results of operations with `StaleWhileRevalidate` policy, and their refresh tasks. Owned by a client.
+
+    Used in a forked process or in another event loop, it keeps the results and forgets the refresh tasks.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, collections.OrderedDict[Hashable, _Entry]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._owner = LoopOwner()
+
+    async def get(
+        self,
+        name: str,
+        kwargs: Mapping[str, typing.Any],
+        policy: StaleWhileRevalidate,
+        fetch: Callable[[], Awaitable[typing.Any]],
+    ) -> typing.Any:
+        if self._owner.changed():
+            self._reset()
+        entries = self._entries.get(name) or self._entries.setdefault(name, collections.OrderedDict())
+        key = _key(kwargs)
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = _Entry()
+            if len(entries) > policy.max_entries:
+                entries.popitem(last=False)
+        else:
+            entries.move_to_end(key)
+
+        now = time.monotonic()
+        age = now - entry.fetched_at
+        if age < policy.ttl:
+            return entry.value
+        if age != math.inf and (policy.max_stale is None or age < policy.ttl + policy.max_stale):
+            if entry.task is None and now >= entry.retry_at:
+                entry.task = self._start(entry, policy, fetch, background=True)
+            return entry.value
+
+        # no usable result, wait for a fetch shared by concurrent callers
+        if entry.task is None:
+            entry.task = self._start(entry, policy, fetch, background=False)
+        await asyncio.shield(entry.task)
+        return entry.value
+
+    def _start(
+        self, entry: _Entry, policy: StaleWhileRevalidate, fetch: Callable[[], Awaitable[typing.Any]], background: bool
+    ) -> asyncio.Task:
+        task = asyncio.ensure_future(self._fetch(entry, policy, fetch, background))
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+        return task
+
+    @staticmethod
+    async def _fetch(entry: _Entry, policy: StaleWhileRevalidate, fetch: Callable[[], Awaitable[typing.Any]], background: bool) -> None:
+        if background:
+            # the refresh is not part of the call that started it
+            clear_deadline()
+        try:
+            entry.value = await fetch()
+            entry.fetched_at = time.monotonic()
+        except Exception:
+            entry.retry_at = time.monotonic() + policy.error_backoff
+            if not background:
+                raise
+            logger.warning('Background refresh failed', exc_info=True)
+        finally:
+            entry.task = None
+
+    def _done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled():
+            # retrieved by waiting callers, if any are left
+            task.exception()
+
+    def _reset(self) -> None:
+        # the tasks belong to another loop or to the parent process
+        self._tasks = set()
+        for entries in self._entries.values():
+            for entry in entries.values():
+                entry.task = None
+
+    async def aclose(self) -> None:
+        if self._owner.changed():
+            self._reset()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._entries.clear()
+
+
+def _key(kwargs: Mapping[str, typing.Any]) -> Hashable:
+    items = tuple(sorted(kwargs.items()))
+    try:
+        hash(items)
+    except TypeError:
+        return repr(items)
+    return items
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import os
+import socket
+import ssl
+import time
+from collections.abc import Iterator, Mapping
+
+import httpx
+import typing_extensions as typing
+
+from .pool import default_ssl_context
+
+if typing.TYPE_CHECKING:
+    import h11
+
+Origin: typing.TypeAlias = tuple[str, str, int]
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+_READ_SIZE = 64 * 1024
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        import h11
+
+        self.reader = reader
+        self.writer = writer
+        self.h11 = h11.Connection(h11.CLIENT)
+        self.idle_since = 0.0
+        self.loop = asyncio.get_running_loop()
+        self.pid = os.getpid()
+
+    def is_usable(self, expire_before: float) -> bool:
+        return self.idle_since >= expire_before and not self.reader.at_eof() and not self.writer.is_closing()
+
+    async def exchange(self, request: httpx.Request, timeouts: Mapping[str, float | None]) -> tuple[h11.Response, bytes]:
+        import h11
+
+        headers = [(name, value) for name, value in request.headers.raw]
+        await self._send(h11.Request(method=request.method, target=request.url.raw_path, headers=headers), timeouts)
+        async for chunk in typing.cast(typing.AsyncIterable[bytes], request.stream):
+            await self._send(h11.Data(data=chunk), timeouts)
+        await self._send(h11.EndOfMessage(), timeouts)
+
+        response = None
+        body = []
+        while True:
+            event = await self._next_event(timeouts)
+            if isinstance(event, h11.Response):
+                response = event
+            elif isinstance(event, h11.Data):
+                body.append(event.data)
+            elif isinstance(event, (h11.EndOfMessage, h11.ConnectionClosed)):
+                break
+            # informational responses are skipped
+        if response is None:
+            raise httpx.RemoteProtocolError('Server disconnected without sending a response.', request=request)
+        return response, b''.join(body)
+
+    def reusable(self) -> bool:
+        import h11
+
+        if self.h11.our_state is h11.DONE and self.h11.their_state is h11.DONE:
+            self.h11.start_next_cycle()
+            return True
+        return False
+
+    async def _send(self, event: h11.Event, timeouts: Mapping[str, float | None]) -> None:
+        data = self.h11.send(event)
+        if data:
+            self.writer.write(data)
+            try:
+                await asyncio.wait_for(self.writer.drain(), timeouts.get('write'))
+            except asyncio.TimeoutError as error:
+                raise httpx.WriteTimeout(str(error)) from error
+
+    async def _next_event(self, timeouts: Mapping[str, float | None]) -> h11.Event | type[h11.NEED_DATA] | type[h11.PAUSED]:
+        import h11
+
+        while True:
+            event = self.h11.next_event()
+            if event is not h11.NEED_DATA:
+                return event
+            data = await asyncio.wait_for(self.reader.read(_READ_SIZE), timeouts.get('read'))
+            self.h11.receive_data(data)
+
+    def close(self) -> None:
+        if self.pid != os.getpid():
+            # the socket is shared with the parent process, closing it here would break the parent's connection
+            return
+        if self.loop.is_closed():
+            # the transport can't run its callbacks, so end the connection at the socket
+            sock = self.writer.get_extra_info('socket')
+            if sock is not None:
+                with contextlib.suppress(OSError):
+                    sock.shutdown(socket.SHUT_RDWR)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self.writer.close()
+        else:
+            self.loop.call_soon_threadsafe(self.writer.close)
+
+
+class H11Transport(httpx.AsyncBaseTransport):
+    """
+    HTTP/1.1 transport on asyncio streams and h11, with a simple keep-alive pool. Use it with `transport=H11Transport()`.
+
+    It skips most of the general-purpose machinery of the default transport, at the cost of features: there is no HTTP/2,
+    proxy or Unix socket support, and response bodies are read fully before the response is returned.
+    The number of connections isn't limited, use pool groups with `max_concurrency` or an `AdaptiveLimiter` for that.
+    """
+
+    def __init__(
+        self,
+        ssl_context: ssl.SSLContext | None = None,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+    ) -> None:
+        self.ssl_context = ssl_context
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._idle: dict[Origin, collections.deque[_Connection]] = {}
+
+    def renew(self) -> H11Transport:
+        """
+        Return a transport with the same settings and no connections, used by clients in a forked process or another event loop.
+
+        Idle connections of this transport are closed, except in a forked child process, where they belong to the parent.
+        """
+        self._close_idle()
+        return H11Transport(self.ssl_context, self.max_keepalive_connections, self.keepalive_expiry)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.scheme not in _DEFAULT_PORTS:
+            raise httpx.UnsupportedProtocol(f'Request URL has an unsupported protocol {request.url.scheme!r}.', request=request)
+        origin = request.url.scheme, request.url.host, request.url.port or _DEFAULT_PORTS[request.url.scheme]
+        timeouts: Mapping[str, float | None] = request.extensions.get('timeout', {})
+        connection = self._checkout(origin) or await self._connect(origin, request, timeouts)
+
+        try:
+            with _map_errors(request):
+                response, content = await connection.exchange(request, timeouts)
+        except BaseException:
+            # also on cancellation, the connection is in an unknown state
+            connection.close()
+            raise
+
+        if connection.reusable():
+            self._checkin(origin, connection)
+        else:
+            connection.close()
+
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(content),
+            extensions={'http_version': b'HTTP/' + response.http_version, 'reason_phrase': response.reason},
+            request=request,
+        )
+
+    def _checkout(self, origin: Origin) -> _Connection | None:
+        idle = self._idle.get(origin)
+        expire_before = time.monotonic() - self.keepalive_expiry
+        while idle:
+            connection = idle.pop()
+            if connection.is_usable(expire_before):
+                return connection
+            connection.close()
+        return None
+
+    def _checkin(self, origin: Origin, connection: _Connection) -> None:
+        idle = self._idle.get(origin) or self._idle.setdefault(origin, collections.deque())
+        if len(idle) >= self.max_keepalive_connections:
+            connection.close()
+            return
+        connection.idle_since = time.monotonic()
+        idle.append(connection)
+
+    async def _connect(self, origin: Origin, request: httpx.Request, timeouts: Mapping[str, float | None]) -> _Connection:
+        scheme, host, port = origin
+        ssl_context = None
+        if scheme == 'https':
+            ssl_context = self.ssl_context or default_ssl_context(True, True, False)
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=ssl_context, server_hostname=host if ssl_context else None, limit=_READ_SIZE),
+                timeouts.get('connect'),
+            )
+        except asyncio.TimeoutError as error:
+            raise httpx.ConnectTimeout(str(error), request=request) from error
+        except OSError as error:
+            raise httpx.ConnectError(str(error), request=request) from error
+        return _Connection(reader, writer)
+
+    async def aclose(self) -> None:
+        self._close_idle()
+
+    def _close_idle(self) -> None:
+        for idle in self._idle.values():
+            for connection in idle:
+                connection.close()
+        self._idle.clear()
+
+
+@contextlib.contextmanager
+def _map_errors(request: httpx.Request) -> Iterator[None]:
+    """Translate errors of an exchange to httpx exceptions."""
+    import h11
+
+    try:
+        yield
+    except asyncio.TimeoutError as error:
+        raise httpx.ReadTimeout(str(error), request=request) from error
+    except h11.RemoteProtocolError as error:
+        raise httpx.RemoteProtocolError(str(error), request=request) from error
+    except h11.LocalProtocolError as error:
+        raise httpx.LocalProtocolError(str(error), request=request) from error
+    except OSError as error:
+        raise httpx.ReadError(str(error), request=request) from error
@@ -5,8 +5,12 @@ from collections.abc import Callable, Iterable
 import typing_extensions as typing
 
 from .model.op import mk_exchange_fn
+from .model.swr import StaleWhileRevalidate
 from .types_ import SecurityRequirements
 
+if typing.TYPE_CHECKING:
+    from .model.hedge import HedgePolicy
+
 OperationMethod = typing.TypeVar('OperationMethod', bound=typing.Callable)
 SimpleDecorator: typing.TypeAlias = Callable[[OperationMethod], OperationMethod]
 
@@ -16,6 +20,24 @@ class Operation:
     method: str
     path: str
     security: typing.Optional[Iterable[SecurityRequirements]] = None
+    pool: typing.Optional[str] = None
+    """Name of the connection pool group, see `PoolGroup`."""
+    hedge: typing.Optional['HedgePolicy'] = None
+    deadline: typing.Optional[float] = None
+    """Time budget of a call in seconds, including all attempts and reading the response."""
+    swr: typing.Optional[StaleWhileRevalidate] = None
+    priority: typing.Optional[int] = None
+    """Priority of calls in `PriorityScheduler`, unless set for the call with `priority()`."""
+    codegen: bool = False
+    """Generate specialized functions building requests and extracting responses of this operation when it is defined."""
+
+    def __post_init__(self) -> None:
+        if self.hedge is None:
+            return
+        from .model.hedge import HEDGEABLE_METHODS
+
+        if self.method not in HEDGEABLE_METHODS:
+            raise ValueError('Only GET and HEAD operations can be hedged', self.method)
 
     def __call__(self, fn: OperationMethod) -> OperationMethod:
         exchange_fn = mk_exchange_fn(fn, self)
@@ -23,7 +45,17 @@ class Operation:
 
 
 class MethodProto(typing.Protocol):
-    def __call__(self, path: str, security: typing.Optional[Iterable[SecurityRequirements]] = None) -> typing.Callable:
+    def __call__(
+        self,
+        path: str,
+        security: typing.Optional[Iterable[SecurityRequirements]] = None,
+        pool: typing.Optional[str] = None,
+        hedge: typing.Optional['HedgePolicy'] = None,
+        deadline: typing.Optional[float] = None,
+        swr: typing.Optional[StaleWhileRevalidate] = None,
+        priority: typing.Optional[int] = None,
+        codegen: bool = False,
+    ) -> typing.Callable:
         pass
 
 
@@ -1,8 +1,11 @@
+import time
 from collections.abc import AsyncIterable, Awaitable, Callable
 from typing import Optional, TypeVar
 
 from typing_extensions import ParamSpec
 
+from .model.deadline import deadline_at
+
 P = ParamSpec('P')
 R = TypeVar('R')
 C = TypeVar('C')
@@ -12,6 +15,7 @@ def iter_pages(
     fn: Callable[P, Awaitable[R]],
     cursor_param_name: str,
     get_cursor: Callable[[R], Optional[C]],
+    deadline: Optional[float] = None,
 ) -> Callable[P, AsyncIterable[R]]:
     """
     Create a function that returns an async iterator over pages from the async operation function :param:`fn`.
@@ -41,16 +45,23 @@ def iter_pages(
     :param fn: An async function that retrieves a page of data.
     :param cursor_param_name: The name of the cursor parameter in :param:`fn`.
     :param get_cursor: A function that extracts a cursor value from the result of :param:`fn`. Return `None` to end the iteration.
+    :param deadline: Optional time budget in seconds for the whole iteration, counted from the first call.
+        Once it's exceeded, `DeadlineExceeded` is raised.
     """
 
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> AsyncIterable[R]:
-        result = await fn(*args, **kwargs)  # type: ignore[call-arg]
+        at = time.monotonic() + deadline if deadline is not None else None
+
+        # the deadline is set around each call, since context changes made in async generators leak to the caller
+        with deadline_at(at):
+            result = await fn(*args, **kwargs)  # type: ignore[call-arg]
         yield result
         cursor = get_cursor(result)
 
         while cursor:
             kwargs[cursor_param_name] = cursor
-            result = await fn(*args, **kwargs)  # type: ignore[call-arg]
+            with deadline_at(at):
+                result = await fn(*args, **kwargs)  # type: ignore[call-arg]
             yield result
 
             cursor = get_cursor(result)
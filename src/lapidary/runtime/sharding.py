@@ -0,0 +1,325 @@
+"""Running copies of a client in several event loops, in threads or processes, to use more than one CPU core."""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import concurrent.futures
+import contextvars
+import functools as ft
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+from collections.abc import Callable
+
+import typing_extensions as typing
+
+from .model.deadline import _deadline
+from .model.scheduler import _priority
+
+if typing.TYPE_CHECKING:
+    import multiprocessing.connection
+    import multiprocessing.context
+    import types
+
+    from .client_base import ClientBase
+
+    if sys.platform == 'win32':
+        MpContext: typing.TypeAlias = typing.Union[multiprocessing.context.DefaultContext, multiprocessing.context.SpawnContext]
+    else:
+        MpContext: typing.TypeAlias = typing.Union[
+            multiprocessing.context.DefaultContext,
+            multiprocessing.context.SpawnContext,
+            multiprocessing.context.ForkContext,
+            multiprocessing.context.ForkServerContext,
+        ]
+
+C = typing.TypeVar('C', bound='ClientBase')
+Mode: typing.TypeAlias = typing.Literal['auto', 'thread', 'process']
+
+
+_CONTEXT_VARS: tuple[contextvars.ContextVar[typing.Any], ...] = (_deadline, _priority)
+"""Context variables that apply to operation calls, passed from the calling context to the shard."""
+
+_Context: typing.TypeAlias = 'tuple[typing.Any, ...]'
+
+
+def _capture_context() -> _Context:
+    return tuple(var.get() for var in _CONTEXT_VARS)
+
+
+async def _call(client: ClientBase, name: str, kwargs: dict[str, typing.Any], context: _Context) -> typing.Any:
+    # each call runs in its own task, so the values don't leak to other calls
+    for var, value in zip(_CONTEXT_VARS, context):
+        var.set(value)
+    return await getattr(client, name)(**kwargs)
+
+
+async def _open(factory: Callable[[], ClientBase]) -> ClientBase:
+    client = factory()
+    await client.__aenter__()
+    return client
+
+
+class _Shard(abc.ABC):
+    def __init__(self) -> None:
+        self.in_flight = 0
+
+    @abc.abstractmethod
+    async def start(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def submit(self, name: str, kwargs: dict[str, typing.Any], context: _Context) -> concurrent.futures.Future:
+        """Start the call in the shard. Cancelling the returned future cancels the call."""
+
+    @abc.abstractmethod
+    async def stop(self) -> None:
+        pass
+
+
+class _ThreadShard(_Shard):
+    def __init__(self, factory: Callable[[], ClientBase], idx: int) -> None:
+        super().__init__()
+        self._factory = factory
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name=f'lapidary-shard-{idx}', daemon=True)
+        self._client: ClientBase | None = None
+
+    async def start(self) -> None:
+        self._thread.start()
+        self._client = await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_open(self._factory), self._loop))
+
+    def submit(self, name: str, kwargs: dict[str, typing.Any], context: _Context) -> concurrent.futures.Future:
+        assert self._client is not None
+        # cancelling the future cancels the task in the shard loop
+        return asyncio.run_coroutine_threadsafe(_call(self._client, name, kwargs, context), self._loop)
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._client.__aexit__(), self._loop))
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+        self._loop.close()
+
+
+class _ProcessShard(_Shard):
+    """
+    Client in a child process, receiving calls and sending back results through a pipe.
+
+    Calls are sent as `(call_id, name, kwargs, context)`, cancellations as `(call_id,)`, and `None` stops the shard.
+    """
+
+    def __init__(self, factory: Callable[[], ClientBase], context: MpContext) -> None:
+        super().__init__()
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_serve, args=(factory, child_conn), daemon=True)
+        self._send_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        # call 0 is the readiness of the client
+        self._ids = itertools.count(1)
+        self._futures: dict[int, concurrent.futures.Future] = {0: concurrent.futures.Future()}
+
+    async def start(self) -> None:
+        ready = self._futures[0]
+        self._process.start()
+        self._reader.start()
+        await asyncio.wrap_future(ready)
+
+    def submit(self, name: str, kwargs: dict[str, typing.Any], context: _Context) -> concurrent.futures.Future:
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        call_id = next(self._ids)
+        self._futures[call_id] = future
+        try:
+            with self._send_lock:
+                self._conn.send((call_id, name, kwargs, context))
+        except BaseException:
+            del self._futures[call_id]
+            raise
+        future.add_done_callback(ft.partial(self._done, call_id))
+        return future
+
+    def _done(self, call_id: int, future: concurrent.futures.Future) -> None:
+        if not future.cancelled():
+            return
+        self._futures.pop(call_id, None)
+        try:
+            with self._send_lock:
+                self._conn.send((call_id,))
+        except OSError:
+            # the shard is stopped
+            pass
+
+    def _read(self) -> None:
+        while True:
+            try:
+                call_id, ok, value = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            future = self._futures.pop(call_id, None)
+            if future is None or future.done():
+                # cancelled by the caller
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        for future in self._futures.values():
+            if not future.done():
+                future.set_exception(ConnectionError('Shard process exited'))
+        self._futures.clear()
+
+    async def stop(self) -> None:
+        with self._send_lock:
+            self._conn.send(None)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._process.join)
+        self._conn.close()
+        await loop.run_in_executor(None, self._reader.join)
+
+
+def _serve(factory: Callable[[], ClientBase], conn: multiprocessing.connection.Connection) -> None:
+    asyncio.run(_serve_async(factory, conn))
+
+
+async def _serve_async(factory: Callable[[], ClientBase], conn: multiprocessing.connection.Connection) -> None:
+    try:
+        client = await _open(factory)
+    except Exception as error:
+        conn.send((0, False, error))
+        return
+    conn.send((0, True, None))
+
+    loop = asyncio.get_running_loop()
+    stopped = loop.create_future()
+    tasks: dict[int, asyncio.Task] = {}
+
+    def dispatch(message: tuple[int, str, dict[str, typing.Any], _Context] | tuple[int]) -> None:
+        call_id = message[0]
+        if len(message) == 1:
+            task = tasks.get(call_id)
+            if task is not None:
+                task.cancel()
+            return
+        task = loop.create_task(_serve_call(client, conn, *message))
+        tasks[call_id] = task
+        task.add_done_callback(lambda _: tasks.pop(call_id, None))
+
+    def receive() -> None:
+        try:
+            while (message := conn.recv()) is not None:
+                loop.call_soon_threadsafe(dispatch, message)
+        except (EOFError, OSError):
+            # the parent process died without stopping the shard
+            pass
+        loop.call_soon_threadsafe(stopped.set_result, None)
+
+    threading.Thread(target=receive, daemon=True).start()
+    await stopped
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+    await client.__aexit__()
+
+
+async def _serve_call(
+    client: ClientBase,
+    conn: multiprocessing.connection.Connection,
+    call_id: int,
+    name: str,
+    kwargs: dict[str, typing.Any],
+    context: _Context,
+) -> None:
+    try:
+        result = call_id, True, await _call(client, name, kwargs, context)
+    except Exception as error:
+        result = call_id, False, error
+    try:
+        conn.send(result)
+    except Exception as error:
+        # the result or the error can't be pickled
+        conn.send((call_id, False, RuntimeError(f'Cannot send the result of {name}: {error!r}')))
+
+
+def free_threaded() -> bool:
+    """Return True if running on CPython with the GIL disabled."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+class ShardedClient(typing.Generic[C]):
+    """
+    Runs `shards` copies of a client, each in its own event loop, and dispatches calls to the shard with the fewest calls in flight.
+
+    Shards run in threads on free-threaded CPython, otherwise in processes, unless `mode` is set. Each shard creates its own
+    client with `factory`. In processes, the factory, the arguments and the results must be picklable, and the `spawn` start
+    method is used unless `mp_context` is given. The deadline and priority of the calling context apply to calls in shards,
+    and cancelling a call cancels it in the shard.
+
+    Operation methods are available as attributes, e.g. `await sharded.get_cat(id=1)`, or can be called by name with `call()`.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], C],
+        shards: int | None = None,
+        mode: Mode = 'auto',
+        mp_context: MpContext | None = None,
+    ) -> None:
+        self.shards = shards or os.cpu_count() or 1
+        if mode == 'auto':
+            mode = 'thread' if free_threaded() else 'process'
+        self.mode = mode
+        self._factory = factory
+        self._mp_context = mp_context or multiprocessing.get_context('spawn')
+        self._shards: list[_Shard] = []
+
+    async def __aenter__(self) -> typing.Self:
+        if self.mode == 'thread':
+            self._shards = [_ThreadShard(self._factory, idx) for idx in range(self.shards)]
+        else:
+            self._shards = [_ProcessShard(self._factory, self._mp_context) for _ in range(self.shards)]
+        try:
+            await asyncio.gather(*(shard.start() for shard in self._shards))
+        except BaseException:
+            await self.aclose()
+            raise
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_value: BaseException | None = None,
+        traceback: types.TracebackType | None = None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        shards = self._shards
+        self._shards = []
+        await asyncio.gather(*(shard.stop() for shard in shards), return_exceptions=True)
+
+    @property
+    def in_flight(self) -> list[int]:
+        """Number of calls in flight in each shard."""
+        return [shard.in_flight for shard in self._shards]
+
+    async def call(self, name: str, /, **kwargs: typing.Any) -> typing.Any:
+        """Call the operation method `name` in the least loaded shard."""
+        if not self._shards:
+            raise RuntimeError('ShardedClient is not open')
+        shard = min(self._shards, key=lambda shard_: shard_.in_flight)
+        shard.in_flight += 1
+        try:
+            return await asyncio.wrap_future(shard.submit(name, kwargs, _capture_context()))
+        finally:
+            shard.in_flight -= 1
+
+    def __getattr__(self, name: str) -> Callable[..., typing.Awaitable[typing.Any]]:
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        async def call(**kwargs: typing.Any) -> typing.Any:
+            return await self.call(name, **kwargs)
+
+        return call
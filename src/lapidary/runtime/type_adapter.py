@@ -3,9 +3,27 @@ from collections.abc import Callable
 import pydantic
 import typing_extensions as typing
 
+from .model.columnar import find_columnar, mk_columnar_adapter
+from .model.lazy import find_lazy, mk_lazy_adapter
+from .model.projection import find_projection
+
 TypeAdapter: typing.TypeAlias = Callable[[typing.Any], typing.Any]
 
 
 def mk_type_adapter(typ: type, json: bool) -> TypeAdapter:
+    if json:
+        lazy_type = find_lazy(typ)
+        columnar = find_columnar(typ)
+        if (projected := find_projection(typ)) is not None:
+            inner, projection = projected
+            typ = projection.projected_type(inner)
+        elif lazy_type is not None:
+            typ = lazy_type
+        elif columnar is not None:
+            typ = columnar[0]
+        if columnar is not None:
+            return mk_columnar_adapter(typ, columnar[1])
+        if lazy_type is not None:
+            return mk_lazy_adapter(typ)
     adapter = pydantic.TypeAdapter(typ)
     return adapter.validate_json if json else adapter.validate_python
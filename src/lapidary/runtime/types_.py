@@ -5,12 +5,14 @@ from collections.abc import Callable, Mapping, MutableMapping
 
 import httpx
 import httpx._transports.base
-import httpx_auth
 import typing_extensions as typing
 
 from . import _httpx
 
-MultiAuth: typing.TypeAlias = httpx_auth._authentication._MultiAuth  # pylint: disable=protected-access
+if typing.TYPE_CHECKING:
+    import httpx_auth
+
+    MultiAuth: typing.TypeAlias = httpx_auth._authentication._MultiAuth  # pylint: disable=protected-access
 NamedAuth: typing.TypeAlias = tuple[str, httpx.Auth]
 SecurityRequirements: typing.TypeAlias = typing.Mapping[str, typing.Iterable[str]]
 
@@ -77,3 +79,12 @@ class ClientArgs(typing.TypedDict):
     app: typing.NotRequired[typing.Callable[..., typing.Any]]
     trust_env: typing.NotRequired[bool]
     default_encoding: typing.NotRequired[str | typing.Callable[[bytes], str]]
+
+
+def __getattr__(name: str) -> typing.Any:
+    # httpx_auth is slow to import and only needed for operations with security requirements
+    if name == 'MultiAuth':
+        import httpx_auth
+
+        return httpx_auth._authentication._MultiAuth  # pylint: disable=protected-access
+    raise AttributeError(name)
@@ -0,0 +1,165 @@
+import asyncio
+
+import httpx
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, Response, Responses, get
+from lapidary.runtime.auth import ClientCredentialsAuth, HeaderApiKey, RefreshableAuth
+from lapidary.runtime.model.auth import AuthRegistry
+
+RESPONSES = Responses({'2XX': Response(Body({'application/json': str}))})
+
+
+class CountingAuth(RefreshableAuth):
+    def __init__(self, lifetime: float, refresh_margin: float, error_backoff: float = 5.0) -> None:
+        super().__init__(refresh_margin, error_backoff)
+        self.lifetime = lifetime
+        self.fetches = 0
+        self.fail = False
+
+    async def fetch_token(self) -> tuple[str, float]:
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise httpx.ConnectError('Token endpoint down')
+        return f'token{self.fetches}', self.lifetime
+
+
+class AuthClient(ClientBase):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(security=[{'oauth': []}], **kwargs)
+
+    @get('/me')
+    async def me(self: typing.Self) -> typing.Annotated[tuple[str, None], RESPONSES]:
+        pass
+
+
+def echo_auth(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=request.headers.get('Authorization'))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_refresh():
+    auth = CountingAuth(lifetime=60, refresh_margin=1)
+    client = AuthClient(transport=httpx.MockTransport(echo_auth), base_url='http://example.com')
+    client.lapidary_authenticate(oauth=auth)
+
+    results = await asyncio.gather(*[client.me() for _ in range(10)])
+
+    assert auth.fetches == 1
+    assert {body for body, _ in results} == {'Bearer token1'}
+
+
+@pytest.mark.asyncio
+async def test_refresh_ahead_of_expiry():
+    auth = CountingAuth(lifetime=60, refresh_margin=120)
+    client = AuthClient(transport=httpx.MockTransport(echo_auth), base_url='http://example.com')
+    client.lapidary_authenticate(oauth=auth)
+
+    body, _ = await client.me()
+    assert body == 'Bearer token1'
+
+    # token is within the refresh margin, so the call doesn't wait for the new one
+    body, _ = await client.me()
+    assert body == 'Bearer token1'
+    await asyncio.sleep(0.05)
+    assert auth.fetches == 2
+
+    body, _ = await client.me()
+    assert body == 'Bearer token2'
+
+
+@pytest.mark.asyncio
+async def test_refresh_backoff_after_failure():
+    auth = CountingAuth(lifetime=60, refresh_margin=120, error_backoff=60)
+    client = AuthClient(transport=httpx.MockTransport(echo_auth), base_url='http://example.com')
+    client.lapidary_authenticate(oauth=auth)
+    await client.me()
+
+    auth.fail = True
+    await client.me()
+    await asyncio.sleep(0.05)
+    assert auth.fetches == 2
+
+    # within the backoff, calls keep using the current token without fetching another
+    for _ in range(5):
+        body, _ = await client.me()
+        assert body == 'Bearer token1'
+    await asyncio.sleep(0.05)
+    assert auth.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduled_refresh():
+    auth = CountingAuth(lifetime=0.2, refresh_margin=0.1)
+    client = AuthClient(transport=httpx.MockTransport(echo_auth), base_url='http://example.com')
+    client.lapidary_authenticate(oauth=auth)
+
+    await client.me()
+    await asyncio.sleep(0.16)
+    # refreshed without a call in the margin
+    assert auth.fetches == 2
+    body, _ = await client.me()
+    assert body == 'Bearer token2'
+
+    # not used since the last refresh, so refreshing stops
+    await asyncio.sleep(0.4)
+    assert auth.fetches == 3
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_refresh():
+    auth = CountingAuth(lifetime=0.2, refresh_margin=0.1)
+    client = AuthClient(transport=httpx.MockTransport(echo_auth), base_url='http://example.com')
+    client.lapidary_authenticate(oauth=auth)
+
+    async with client:
+        await client.me()
+    await asyncio.sleep(0.16)
+    # the scheduled refresh was cancelled
+    assert auth.fetches == 1
+
+
+def test_refresh_in_another_loop():
+    auth = CountingAuth(lifetime=0.2, refresh_margin=0.1)
+    client = AuthClient(transport=httpx.MockTransport(echo_auth), base_url='http://example.com')
+    client.lapidary_authenticate(oauth=auth)
+
+    async def call_and_wait() -> str:
+        body, _ = await client.me()
+        await asyncio.sleep(0.16)
+        return body
+
+    assert asyncio.run(call_and_wait()) == 'Bearer token1'
+    assert auth.fetches == 2
+    # the token and the scheduled refresh carry over to the new loop
+    assert asyncio.run(call_and_wait()) == 'Bearer token2'
+    assert auth.fetches == 3
+
+
+def test_authenticate_keeps_unrelated_cache_entries():
+    registry = AuthRegistry(None)
+    registry.authenticate({'a': HeaderApiKey('a'), 'b': HeaderApiKey('b')})
+    auth_a = registry.resolve_auth('op_a', [{'a': []}])
+    auth_b = registry.resolve_auth('op_b', [{'b': []}])
+
+    registry.authenticate({'b': HeaderApiKey('b2')})
+
+    assert registry.resolve_auth('op_a', [{'a': []}]) is auth_a
+    assert registry.resolve_auth('op_b', [{'b': []}]) is not auth_b
+
+
+@pytest.mark.asyncio
+async def test_client_credentials():
+    def token_endpoint(request: httpx.Request) -> httpx.Response:
+        assert request.content == b'grant_type=client_credentials&scope=read'
+        return httpx.Response(200, json={'access_token': 'abc', 'expires_in': 300})
+
+    session = httpx.AsyncClient(transport=httpx.MockTransport(token_endpoint))
+    auth = ClientCredentialsAuth('http://auth.example.com/token', 'id', 'secret', 'read', session=session)
+    client = AuthClient(transport=httpx.MockTransport(echo_auth), base_url='http://example.com')
+    client.lapidary_authenticate(oauth=auth)
+
+    body, _ = await client.me()
+    assert body == 'Bearer abc'
@@ -0,0 +1,96 @@
+import collections
+
+import httpx
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import (
+    Body,
+    ClientBase,
+    ConsistentHash,
+    HttpErrorResponse,
+    LeastOutstanding,
+    LoadBalancer,
+    OutlierEjection,
+    Path,
+    PowerOfTwoChoices,
+    Response,
+    Responses,
+    get,
+)
+from lapidary.runtime.model.balancer import Endpoint
+
+ENDPOINTS = ['http://a.local/api', 'http://b.local/v2/', 'http://c.local:8080/']
+
+
+class BalancedClient(ClientBase):
+    @get('/cats/{id}')
+    async def cat(
+        self: typing.Self,
+        id: typing.Annotated[int, Path],
+    ) -> typing.Annotated[
+        tuple[str, None],
+        Responses({'2XX': Response(Body({'application/json': str})), '5XX': Response(Body({'application/json': str}))}),
+    ]:
+        pass
+
+
+def mk_client(balancer: LoadBalancer, failing: typing.Container[str] = ()) -> tuple[BalancedClient, list[httpx.Request]]:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(500 if request.url.host in failing else 200, json=request.url.host)
+
+    return BalancedClient(load_balancer=balancer, transport=httpx.MockTransport(handler)), requests
+
+
+@pytest.mark.asyncio
+async def test_round_robin_rewrites_urls() -> None:
+    client, requests = mk_client(LoadBalancer(ENDPOINTS))
+    for _ in range(3):
+        await client.cat(id=1)
+    assert [str(request.url) for request in requests] == [
+        'http://a.local/api/cats/1',
+        'http://b.local/v2/cats/1',
+        'http://c.local:8080/cats/1',
+    ]
+    assert [request.headers['Host'] for request in requests] == ['a.local', 'b.local', 'c.local:8080']
+
+
+@pytest.mark.asyncio
+async def test_consistent_hash() -> None:
+    client, requests = mk_client(LoadBalancer(ENDPOINTS, ConsistentHash()))
+    for id_ in (1, 2, 3, 1, 2, 3):
+        await client.cat(id=id_)
+    hosts = [request.url.host for request in requests]
+    assert hosts[:3] == hosts[3:]
+
+
+@pytest.mark.asyncio
+async def test_outlier_ejection() -> None:
+    balancer = LoadBalancer(ENDPOINTS, ejection=OutlierEjection(consecutive_failures=2))
+    client, requests = mk_client(balancer, failing={'b.local'})
+    for _ in range(12):
+        try:
+            await client.cat(id=1)
+        except HttpErrorResponse:
+            pass
+    counts = collections.Counter(request.url.host for request in requests)
+    assert counts['b.local'] == 2
+    assert balancer.endpoints[1].ejected_until > 0
+
+
+def test_least_outstanding() -> None:
+    endpoints = [Endpoint(httpx.URL(url), outstanding=outstanding) for url, outstanding in zip(ENDPOINTS, (3, 1, 2))]
+    request = httpx.Request('GET', 'http://a.local/')
+    assert LeastOutstanding().choose(endpoints, request) is endpoints[1]
+    strategy = PowerOfTwoChoices(seed=0)
+    # the busiest endpoint loses against any other
+    assert all(strategy.choose(endpoints, request) is not endpoints[0] for _ in range(20))
+
+
+def test_max_ejected_ratio() -> None:
+    balancer = LoadBalancer(ENDPOINTS[:1], ejection=OutlierEjection(consecutive_failures=1))
+    balancer._record(balancer.endpoints[0], True, 0.1)
+    assert balancer.endpoints[0].ejected_until == 0
@@ -0,0 +1,87 @@
+import json
+
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, Query, Response, Responses, get
+from lapidary.runtime.bench import BenchConfig, main, percentile, run
+
+
+class Name(pydantic.BaseModel):
+    name: str
+
+
+class NamesClient(ClientBase):
+    @get('/items')
+    async def names(
+        self: typing.Self,
+        size: typing.Annotated[int, Query],
+    ) -> typing.Annotated[
+        tuple[list[Name], None],
+        Responses({'2XX': Response(Body({'application/json': list[Name]})), '5XX': Response(Body({'application/json': dict}))}),
+    ]:
+        pass
+
+
+def mk_names_client(transport: httpx.AsyncBaseTransport) -> NamesClient:
+    return NamesClient(base_url='http://bench.local', transport=transport)
+
+
+sizes: list[int] = []
+
+
+async def three_names(client: NamesClient) -> None:
+    names, _ = await client.names(size=3)
+    sizes.append(len(names))
+
+
+def test_percentile() -> None:
+    values = [float(idx) for idx in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 50) == 0.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('transport', ['mock', 'asgi'])
+async def test_run(transport: str) -> None:
+    config = BenchConfig(requests=50, concurrency=5, warmup=5, error_rate=0.5, transport=transport)  # type: ignore[arg-type]
+    summary = (await run(config)).summary()
+    assert summary['requests'] == 50
+    assert 0 < summary['errors'] < 50
+    assert summary['latency']['p50'] <= summary['latency']['p99'] <= summary['latency']['max']
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('transport', ['mock', 'asgi'])
+async def test_run_custom_client(transport: str) -> None:
+    sizes.clear()
+    config = BenchConfig(requests=10, concurrency=2, warmup=0, payload_items=50, transport=transport)  # type: ignore[arg-type]
+    summary = (await run(config, mk_names_client, three_names)).summary()
+    assert summary['requests'] == 10
+    # the stand-in serves the size requested by the operation
+    assert sizes == [3] * 10
+
+
+@pytest.mark.asyncio
+async def test_run_requires_operation_with_client_factory() -> None:
+    with pytest.raises(TypeError):
+        await run(BenchConfig(), mk_names_client)
+
+
+def test_main_custom_client(capsys: pytest.CaptureFixture) -> None:
+    sizes.clear()
+    args = ['-n', '5', '--warmup', '0', '--json', '--client', f'{__name__}:mk_names_client', '--operation', f'{__name__}:three_names']
+    assert main(args) == 0
+    assert json.loads(capsys.readouterr().out)['requests'] == 5
+    assert sizes == [3] * 5
+
+
+def test_main_json(capsys: pytest.CaptureFixture) -> None:
+    assert main(['-n', '20', '-c', '2', '--warmup', '0', '--json']) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary['requests'] == 20
+    assert summary['config']['concurrency'] == 2
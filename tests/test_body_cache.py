@@ -0,0 +1,111 @@
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, BodyCache, ClientBase, Response, Responses, post, put
+
+
+class Cat(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
+    name: str
+
+
+class MutableCat(pydantic.BaseModel):
+    name: str
+
+
+class Kitten(Cat):
+    age: int
+
+
+class CatClient(ClientBase):
+    @post('/cat')
+    async def add_cat(
+        self: typing.Self,
+        cat: typing.Annotated[Cat, Body({'application/json': Cat})],
+    ) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+    @put('/cat')
+    async def put_cat(
+        self: typing.Self,
+        cat: typing.Annotated[Cat, Body({'application/json': Cat})],
+    ) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+    @post('/kitten')
+    async def add_kitten(
+        self: typing.Self,
+        cat: typing.Annotated[Kitten, Body({'application/json': Kitten})],
+    ) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+    @post('/any')
+    async def add_any(
+        self: typing.Self,
+        cat: typing.Annotated[MutableCat, Body({'application/json': MutableCat})],
+    ) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+
+def mk_client(cache: BodyCache, bodies: list[bytes]) -> CatClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return httpx.Response(204)
+
+    return CatClient(base_url='http://example.com', transport=httpx.MockTransport(handler), body_cache=cache)
+
+
+@pytest.mark.asyncio
+async def test_frozen_body_encoded_once_across_operations() -> None:
+    cache = BodyCache()
+    bodies: list[bytes] = []
+    cat = Cat(name='Tom')
+    async with mk_client(cache, bodies) as client:
+        for _ in range(3):
+            await client.add_cat(cat=cat)
+        await client.put_cat(cat=cat)
+        await client.add_cat(cat=Cat(name='Felix'))
+
+    assert bodies == [b'{"name":"Tom"}'] * 4 + [b'{"name":"Felix"}']
+    assert (cache.misses, cache.hits) == (2, 3)
+
+
+@pytest.mark.asyncio
+async def test_body_cache_keyed_by_declared_type() -> None:
+    cache = BodyCache()
+    bodies: list[bytes] = []
+    kitten = Kitten(name='Tom', age=1)
+    async with mk_client(cache, bodies) as client:
+        await client.add_kitten(cat=kitten)
+        await client.add_cat(cat=kitten)
+
+    assert bodies == [b'{"name":"Tom","age":1}', b'{"name":"Tom"}']
+
+
+@pytest.mark.asyncio
+async def test_body_cache_skips_mutable_and_evicts() -> None:
+    cache = BodyCache(max_entries=1)
+    bodies: list[bytes] = []
+    cat = MutableCat(name='Tom')
+    async with mk_client(cache, bodies) as client:
+        await client.add_any(cat=cat)
+        cat.name = 'Felix'
+        await client.add_any(cat=cat)
+        await client.add_cat(cat=Cat(name='a'))
+        await client.add_cat(cat=Cat(name='b'))
+
+    assert bodies[:2] == [b'{"name":"Tom"}', b'{"name":"Felix"}']
+    assert (cache.misses, cache.hits) == (2, 0)
+    assert len(cache._entries) == 1
+
+
+def test_immutable_types() -> None:
+    cache = BodyCache(immutable_types=[MutableCat])
+    assert cache.is_immutable(MutableCat(name='Tom'))
+    assert cache.is_immutable(Cat(name='Tom'))
+    assert not BodyCache().is_immutable(MutableCat(name='Tom'))
+    with pytest.raises(ValueError):
+        BodyCache(max_entries=0)
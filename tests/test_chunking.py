@@ -0,0 +1,70 @@
+import httpx
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, Chunking, ClientBase, Query, Response, Responses, SimpleMultimap, get
+
+RESPONSES = Responses({'2XX': Response(Body({'application/json': list[int]}))})
+
+requests: list[httpx.Request] = []
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    requests.append(request)
+    ids = [int(value) for values in request.url.params.get_list('id') for value in values.split(',')]
+    return httpx.Response(200, json=ids)
+
+
+class ChunkingClient(ClientBase):
+    @get('/by_count')
+    async def by_count(
+        self: typing.Self,
+        ids: typing.Annotated[list[int], Query('id', chunking=Chunking(max_items=3, concurrency=2))],
+    ) -> typing.Annotated[tuple[list[int], None], RESPONSES]:
+        pass
+
+    @get('/by_length')
+    async def by_length(
+        self: typing.Self,
+        ids: typing.Annotated[list[int], Query('id', style=SimpleMultimap, chunking=Chunking(max_url_length=60))],
+    ) -> typing.Annotated[tuple[list[int], None], RESPONSES]:
+        pass
+
+    @get('/merged')
+    async def merged(
+        self: typing.Self,
+        ids: typing.Annotated[list[int], Query('id', chunking=Chunking(max_items=2, merge=lambda results: (len(results), None)))],
+    ) -> typing.Annotated[tuple[list[int], None], RESPONSES]:
+        pass
+
+
+@pytest.fixture
+def client() -> ChunkingClient:
+    requests.clear()
+    return ChunkingClient(transport=httpx.MockTransport(handler), base_url='http://example.com')
+
+
+@pytest.mark.asyncio
+async def test_chunk_by_item_count(client: ChunkingClient):
+    body, _ = await client.by_count(ids=list(range(1, 11)))
+    assert body == list(range(1, 11))
+    assert len(requests) == 4
+
+    requests.clear()
+    body, _ = await client.by_count(ids=[1, 2])
+    assert body == [1, 2]
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_chunk_by_url_length(client: ChunkingClient):
+    body, _ = await client.by_length(ids=list(range(100, 130)))
+    assert body == list(range(100, 130))
+    assert len(requests) > 1
+    assert all(len(str(request.url)) <= 60 for request in requests)
+
+
+@pytest.mark.asyncio
+async def test_custom_merge(client: ChunkingClient):
+    body, _ = await client.merged(ids=list(range(5)))
+    assert body == 3
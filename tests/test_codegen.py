@@ -0,0 +1,121 @@
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, Cookie, Header, Path, Query, Response, Responses, UnexpectedResponse, get, post
+from lapidary.runtime.model.request import RequestAdapter
+
+
+class Cat(pydantic.BaseModel):
+    id: int
+    name: str = ''
+
+
+class CatHeaders(pydantic.BaseModel):
+    count: typing.Annotated[int, Header('X-Count')]
+
+
+def operations(codegen: bool) -> type[ClientBase]:
+    class CatClient(ClientBase):
+        @get('/{tenant}/cats/{cat_id}', codegen=codegen)
+        async def get_cat(
+            self: typing.Self,
+            tenant: typing.Annotated[str, Path],
+            cat_id: typing.Annotated[int, Path],
+            version: typing.Annotated[str, Header('X-Version')],
+            tags: typing.Annotated[typing.Optional[list[str]], Query('tag')] = None,
+            limit: typing.Annotated[typing.Optional[int], Query, pydantic.Field(gt=0)] = None,
+        ) -> typing.Annotated[
+            tuple[Cat, CatHeaders],
+            Responses(
+                {
+                    '2XX': Response(Body({'application/json': Cat}), CatHeaders),
+                    '4XX': Response(Body({'application/json': Cat})),
+                }
+            ),
+        ]:
+            pass
+
+        @post('/cats', codegen=codegen)
+        async def add_cat(
+            self: typing.Self,
+            cat: typing.Annotated[Cat, Body({'application/json': Cat})],
+        ) -> typing.Annotated[tuple[Cat, None], Responses({'2XX': Response(Body({'application/json': Cat}))})]:
+            pass
+
+        @get('/session', codegen=codegen)
+        async def session(
+            self: typing.Self,
+            session: typing.Annotated[str, Cookie],
+        ) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+            pass
+
+    return CatClient
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.method == 'POST':
+        return httpx.Response(201, content=request.content, headers={'Content-Type': 'application/json'})
+    cat_id = int(request.url.path.rsplit('/', 1)[-1])
+    if cat_id == 0:
+        return httpx.Response(200, json={'name': 'missing id'})
+    return httpx.Response(200 if cat_id < 400 else cat_id, json={'id': cat_id}, headers={'X-Count': '3'})
+
+
+async def exchange(codegen: bool) -> tuple[list, list[httpx.Request]]:
+    requests: list[httpx.Request] = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+
+    client_type = operations(codegen)
+    client = client_type(base_url='http://example.com', transport=httpx.MockTransport(record))
+    client = client.lapidary_view(headers={'X-Tenant': 't', 'X-Version': 'default'})
+    results: list = []
+    async with client:
+        results.append(await client.get_cat(tenant='acme', cat_id=1, version='2', tags=['a', 'b'], limit=5))
+        results.append(await client.get_cat(tenant='acme', cat_id=2, version='2'))
+        results.append(await client.add_cat(cat=Cat(id=3, name='Tom')))
+        prepared = client.lapidary_prepare(client.get_cat, tenant='acme', version='3')
+        results.append(await prepared(cat_id=4))
+        for kwargs in ({'tenant': 'a', 'cat_id': 1}, {'tenant': 'a', 'cat_id': 1, 'version': '1', 'color': 'black'}, {'cat': None}):
+            with pytest.raises(TypeError):
+                await client.get_cat(**kwargs)
+        with pytest.raises(TypeError):
+            await client.get_cat(tenant='a', cat_id=1, version='1', limit=0)
+        with pytest.raises(UnexpectedResponse):
+            await client.get_cat(tenant='acme', cat_id=0, version='2')
+        try:
+            await client.get_cat(tenant='acme', cat_id=404, version='2')
+        except Exception as error:
+            results.append((type(error), error.status_code, error.body))
+    return results, requests
+
+
+def summary(request: httpx.Request) -> tuple:
+    # the generic request builder adds query parameters in arbitrary order
+    query = sorted(request.url.params.multi_items())
+    return request.method, request.url.copy_with(query=None), query, sorted(request.headers.multi_items()), request.content
+
+
+@pytest.mark.asyncio
+async def test_generated_same_as_generic() -> None:
+    generated_results, generated_requests = await exchange(True)
+    generic_results, generic_requests = await exchange(False)
+
+    assert generated_results == generic_results
+    assert generated_results[0] == (Cat(id=1), CatHeaders(count=3))
+    assert [summary(request) for request in generated_requests] == [summary(request) for request in generic_requests]
+
+
+def test_generated_and_fallback() -> None:
+    client_type = operations(True)
+    request_adapter, response_handler = client_type.get_cat.lapidary_plan.compile()  # type: ignore[attr-defined]
+    assert 'build_request' in vars(request_adapter)
+    assert 'handle_response' in vars(response_handler.response_map['2XX']['application/json'])
+
+    request_adapter, _ = client_type.session.lapidary_plan.compile()  # type: ignore[attr-defined]
+    assert 'build_request' not in vars(request_adapter)
+    assert isinstance(request_adapter, RequestAdapter)
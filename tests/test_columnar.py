@@ -0,0 +1,95 @@
+import array
+import json
+
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, Columnar, ModelBase, Response, Responses, get
+from lapidary.runtime.model.columnar import mk_columnar_adapter
+
+
+class Reading(ModelBase):
+    sensor_id: int = pydantic.Field(alias='sensorId')
+    value: float
+    valid: bool
+    unit: str = 'C'
+    note: typing.Optional[int] = None
+
+
+class ColumnarClient(ClientBase):
+    @get('/readings')
+    async def readings(
+        self: typing.Self,
+    ) -> typing.Annotated[
+        tuple[dict[str, typing.Sequence], None],
+        Responses({'2XX': Response(Body({'application/json': typing.Annotated[list[Reading], Columnar]}))}),
+    ]:
+        pass
+
+
+ROWS = [
+    {'sensorId': 1, 'value': 1.5, 'valid': True},
+    {'sensorId': 2, 'value': 2, 'valid': False, 'unit': 'F', 'note': 3},
+]
+
+
+@pytest.mark.asyncio
+async def test_columns() -> None:
+    client = ColumnarClient(base_url='http://example.com', transport=httpx.MockTransport(lambda _: httpx.Response(200, json=ROWS)))
+    columns, _ = await client.readings()
+    assert columns == {
+        'sensor_id': array.array('q', [1, 2]),
+        'value': array.array('d', [1.5, 2.0]),
+        'valid': [True, False],
+        'unit': ['C', 'F'],
+        'note': [None, 3],
+    }
+
+
+def test_invalid_value() -> None:
+    parse = mk_columnar_adapter(list[Reading], Columnar())
+    with pytest.raises(pydantic.ValidationError):
+        parse(b'[{"sensorId": "x", "value": 1, "valid": true}]')
+    with pytest.raises(ValueError):
+        parse(b'[{"value": 1, "valid": true}]')
+
+
+def test_int_overflow_falls_back_to_list() -> None:
+    big = 2**64
+    rows = json.dumps([{'sensorId': big, 'value': 1, 'valid': True}, {'sensorId': 1, 'value': 2, 'valid': True}])
+    columns = mk_columnar_adapter(list[Reading], Columnar())(rows)
+    assert columns['sensor_id'] == [big, 1]
+    assert columns['value'] == array.array('d', [1.0, 2.0])
+
+
+class Tagged(ModelBase):
+    tags: list[str] = []
+    labels: list[str] = pydantic.Field(default_factory=list)
+
+
+def test_default_per_row() -> None:
+    columns = mk_columnar_adapter(list[Tagged], Columnar())(b'[{}, {}]')
+    tags, labels = columns['tags'], columns['labels']
+    assert tags == [[], []] and labels == [[], []]
+    assert tags[0] is not tags[1]
+    assert labels[0] is not labels[1]
+
+
+def test_not_a_list_of_models() -> None:
+    with pytest.raises(TypeError):
+        mk_columnar_adapter(Reading, Columnar())
+
+
+def test_numpy() -> None:
+    numpy = pytest.importorskip('numpy')
+    columns = mk_columnar_adapter(list[Reading], Columnar(numpy=True))(json.dumps(ROWS))
+    assert columns['sensor_id'].dtype == numpy.int64
+    assert columns['valid'].tolist() == [True, False]
+    assert columns['unit'] == ['C', 'F']
+
+    big = 2**64
+    columns = mk_columnar_adapter(list[Reading], Columnar(numpy=True))(json.dumps([{'sensorId': big, 'value': 1, 'valid': True}]))
+    assert columns['sensor_id'].dtype == object
+    assert columns['sensor_id'].tolist() == [big]
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, DeadlineExceeded, Query, Response, Responses, deadline, get, iter_pages
+
+RESPONSES = Responses({'2XX': Response(Body({'application/json': typing.Optional[int]}))})
+
+
+class DeadlineClient(ClientBase):
+    @get('/page', deadline=5)
+    async def page(
+        self: typing.Self,
+        cursor: typing.Annotated[typing.Optional[int], Query] = None,
+    ) -> typing.Annotated[tuple[typing.Optional[int], None], RESPONSES]:
+        pass
+
+    @get('/slow', deadline=0.05)
+    async def slow(self: typing.Self) -> typing.Annotated[tuple[typing.Optional[int], None], RESPONSES]:
+        pass
+
+
+requests: list[httpx.Request] = []
+
+
+async def handler(request: httpx.Request) -> httpx.Response:
+    requests.append(request)
+    if request.url.path == '/slow':
+        await asyncio.sleep(10)
+    cursor = int(request.url.params.get('cursor', 0))
+    await asyncio.sleep(0.02)
+    return httpx.Response(200, json=cursor + 1)
+
+
+@pytest.fixture
+def client() -> DeadlineClient:
+    requests.clear()
+    return DeadlineClient(transport=httpx.MockTransport(handler), base_url='http://example.com', deadline_header='X-Timeout-Ms')
+
+
+@pytest.mark.asyncio
+async def test_operation_deadline(client: DeadlineClient):
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        await client.slow()
+    assert time.monotonic() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_context(client: DeadlineClient):
+    with deadline(1):
+        await client.page()
+    request = requests[-1]
+    assert 0 < request.extensions['timeout']['read'] <= 1
+    assert 0 < int(request.headers['X-Timeout-Ms']) <= 1000
+
+    with deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            await client.page()
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_deadline(client: DeadlineClient):
+    pages = []
+    with pytest.raises(DeadlineExceeded):
+        async for page, _ in iter_pages(client.page, 'cursor', lambda result: result[0], deadline=0.1)():
+            pages.append(page)
+    assert 1 < len(pages) < 10
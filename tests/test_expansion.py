@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, Header, Path, Response, Responses, UnexpectedResponse, expand, get
+
+
+class Person(pydantic.BaseModel):
+    id: int
+
+
+class Cat(pydantic.BaseModel):
+    name: str
+    owner_id: typing.Optional[int] = None
+
+
+class CatClient(ClientBase):
+    @get('/person/{person_id}')
+    async def get_person(
+        self: typing.Self,
+        person_id: typing.Annotated[int, Path],
+        tenant: typing.Annotated[typing.Optional[str], Header('X-Tenant')] = None,
+    ) -> typing.Annotated[Person, Responses({'2XX': Response(Body({'application/json': Person}))})]:
+        pass
+
+
+class Upstream:
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        person_id = int(request.url.path.rsplit('/', 1)[-1])
+        if person_id < 0:
+            return httpx.Response(404, json={})
+        return httpx.Response(200, json={'id': person_id})
+
+
+def mk_client(upstream: Upstream) -> CatClient:
+    return CatClient(base_url='http://example.com', transport=httpx.MockTransport(upstream.handle))
+
+
+@pytest.mark.asyncio
+async def test_expand_deduplicates() -> None:
+    upstream = Upstream()
+    cats = [Cat(name='Tom', owner_id=2), Cat(name='Felix', owner_id=1), Cat(name='Stray'), Cat(name='Kitty', owner_id=2)]
+    async with mk_client(upstream) as client:
+        owners = await expand(cats, lambda cat: cat.owner_id, client.get_person, 'person_id', tenant='a')
+
+    assert owners == {2: (Person(id=2), None), 1: (Person(id=1), None)}
+    assert len(upstream.requests) == 2
+    assert {request.headers['X-Tenant'] for request in upstream.requests} == {'a'}
+
+
+@pytest.mark.asyncio
+async def test_expand_concurrency() -> None:
+    upstream = Upstream()
+    async with mk_client(upstream) as client:
+        owners = await expand(range(10), lambda idx: idx, client.get_person, 'person_id', concurrency=3)
+
+    assert list(owners) == list(range(10))
+    assert upstream.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_expand_error() -> None:
+    upstream = Upstream()
+    async with mk_client(upstream) as client:
+        with pytest.raises(UnexpectedResponse):
+            await expand([1, -1, 2], lambda idx: idx, client.get_person, 'person_id', concurrency=None)
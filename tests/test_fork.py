@@ -0,0 +1,228 @@
+import asyncio
+import http.server
+import os
+import threading
+import time
+from collections.abc import Iterator
+
+import httpx
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import (
+    AIMD,
+    AdaptiveLimiter,
+    Body,
+    ClientBase,
+    H11Transport,
+    PoolGroup,
+    PriorityScheduler,
+    Response,
+    Responses,
+    StaleWhileRevalidate,
+    get,
+)
+from lapidary.runtime.model import pool
+
+
+class CatClient(ClientBase):
+    @get('/cat', pool='slow')
+    async def cat(
+        self: typing.Self,
+    ) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+    @get('/config', swr=StaleWhileRevalidate(ttl=10))
+    async def config(
+        self: typing.Self,
+    ) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+
+def mk_client() -> CatClient:
+    return CatClient(
+        base_url='http://example.com',
+        transport=httpx.MockTransport(lambda _: httpx.Response(204)),
+        pools={'slow': PoolGroup(max_concurrency=2)},
+    )
+
+
+def test_event_loop_change() -> None:
+    client = mk_client()
+    plan = CatClient.cat.lapidary_plan  # type: ignore[attr-defined]
+
+    asyncio.run(client.cat())
+    default = client._client
+    slow = client._sessions.session('slow')
+    compiled = plan._compiled
+    asyncio.run(client.cat())
+
+    assert client._client is not default
+    assert client._sessions.session('slow') is not slow
+    assert plan._compiled is compiled
+
+
+def test_event_loop_change_closes_old_sessions() -> None:
+    client = mk_client()
+
+    asyncio.run(client.cat())
+    default = client._client
+    slow = client._sessions.session('slow')
+    asyncio.run(client.cat())
+
+    assert default.is_closed
+    assert slow.is_closed
+
+
+def test_event_loop_change_closes_old_sessions_in_their_loop() -> None:
+    client = mk_client()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        asyncio.run_coroutine_threadsafe(client.cat(), loop).result(1)
+        default = client._client
+        asyncio.run(client.cat())
+        # closed by the loop that's still running
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result(1)
+        assert default.is_closed
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+@pytest.mark.asyncio
+async def test_fork_forgets_requests_in_flight() -> None:
+    release = asyncio.Event()
+    requests: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        await release.wait()
+        return httpx.Response(204)
+
+    client = CatClient(
+        base_url='http://example.com',
+        transport=httpx.MockTransport(handler),
+        limiter=AdaptiveLimiter(AIMD(initial=2, max_limit=2)),
+        scheduler=PriorityScheduler(max_in_flight=2),
+    )
+    # inherited by the child process, and never finished there
+    parent_calls = [asyncio.ensure_future(client.cat()), asyncio.ensure_future(client.config())]
+    await asyncio.sleep(0.01)
+    assert requests == ['/cat', '/config']
+
+    pool._after_fork()
+    calls = asyncio.gather(client.cat(), client.config())
+    await asyncio.sleep(0.01)
+    # neither waits for the slots or the refresh of the parent
+    assert requests == ['/cat', '/config', '/cat', '/config']
+
+    release.set()
+    await calls
+    await asyncio.gather(*parent_calls)
+
+
+@pytest.mark.asyncio
+async def test_same_loop_keeps_sessions() -> None:
+    client = mk_client()
+    default = client._client
+    await client.cat()
+    await client.cat()
+    assert client._client is default
+
+
+@pytest.mark.asyncio
+async def test_fork_shared_by_views() -> None:
+    client = mk_client()
+    view = client.lapidary_view(headers={'X-Tenant': 'a'})
+    await client.cat()
+    default = client._client
+
+    pool._after_fork()
+    await view.cat()
+
+    assert client._client is not default
+    assert view._client is client._client
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+def test_fork() -> None:
+    client = mk_client()
+    asyncio.run(client.cat())
+    default = client._client
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        code = 1
+        try:
+            asyncio.run(client.cat())
+            code = 0 if client._client is not default else 2
+        finally:
+            os._exit(code)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert client._client is default
+
+
+class CountingServer(http.server.ThreadingHTTPServer):
+    opened = 0
+    closed = 0
+
+
+class NoContentHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: CountingServer
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.opened += 1
+
+    def finish(self) -> None:
+        super().finish()
+        self.server.closed += 1
+
+    def do_GET(self) -> None:
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args: typing.Any) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[CountingServer]:
+    # runs in a thread, so it outlives event loops of the test
+    server = CountingServer(('127.0.0.1', 0), NoContentHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_event_loop_change_renews_transport(server: CountingServer) -> None:
+    client = CatClient(base_url=f'http://127.0.0.1:{server.server_address[1]}', transport=H11Transport())
+
+    asyncio.run(client.cat())
+    asyncio.run(client.cat())
+
+    # the second loop opened its own connection, and the idle connection of the first loop was closed
+    for _ in range(100):
+        if server.closed:
+            break
+        time.sleep(0.01)
+    assert server.opened == 2
+    assert server.closed == 1
+
+
+@pytest.mark.asyncio
+async def test_fork_rejects_transport_that_cannot_be_renewed() -> None:
+    client = CatClient(base_url='http://example.com', transport=httpx.AsyncHTTPTransport())
+    client._sessions.ensure_owner()
+
+    pool._after_fork()
+    with pytest.raises(RuntimeError):
+        client._sessions.ensure_owner()
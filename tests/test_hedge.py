@@ -0,0 +1,141 @@
+import asyncio
+
+import httpx
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, HedgePolicy, HttpxMiddleware, Response, Responses, get, post
+from lapidary.runtime.model.hedge import Hedger
+
+RESPONSES = Responses({'2XX': Response(Body({'application/json': str}))})
+
+
+class HedgeClient(ClientBase):
+    @get('/slow', hedge=HedgePolicy(delay=0.01, max_ratio=1))
+    async def slow(self: typing.Self) -> typing.Annotated[tuple[str, None], RESPONSES]:
+        pass
+
+
+class CountingMiddleware(HttpxMiddleware[None]):
+    def __init__(self) -> None:
+        self.responses: list[httpx.Response] = []
+
+    async def handle_request(self, request: httpx.Request) -> None:
+        pass
+
+    async def handle_response(self, response: httpx.Response, request: httpx.Request, state: None) -> None:
+        self.responses.append(response)
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins():
+    calls = 0
+    cancelled = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return httpx.Response(200, json='slow')
+        return httpx.Response(200, json='fast')
+
+    middleware = CountingMiddleware()
+    client = HedgeClient(middlewares=[middleware], transport=httpx.MockTransport(handler), base_url='http://example.com')
+    body, _ = await client.slow()
+
+    assert body == 'fast'
+    assert calls == 2
+    assert cancelled.is_set()
+    assert len(middleware.responses) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedging_budget():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return httpx.Response(200)
+
+    hedger = Hedger(HedgePolicy(delay=0.001, max_ratio=0.5))
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url='http://example.com')
+    for _ in range(4):
+        await hedger.send(client.send, client.build_request('GET', '/'))
+    assert calls == 6
+
+
+@pytest.mark.asyncio
+async def test_retryable_status_waits_for_other_request():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        call = calls
+        await asyncio.sleep(0.03 if call == 1 else 0.05)
+        return httpx.Response(503 if call == 1 else 200, json=call)
+
+    hedger = Hedger(HedgePolicy(delay=0.01, max_ratio=1))
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url='http://example.com')
+    response = await hedger.send(client.send, client.build_request('GET', '/'))
+    assert (response.status_code, response.json()) == (200, 2)
+
+
+@pytest.mark.asyncio
+async def test_all_retryable_statuses_return_primary_response():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        call = calls
+        await asyncio.sleep(0.05 if call == 1 else 0.01)
+        return httpx.Response(503, json=call)
+
+    hedger = Hedger(HedgePolicy(delay=0.01, max_ratio=1))
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url='http://example.com')
+    response = await hedger.send(client.send, client.build_request('GET', '/'))
+    assert (response.status_code, response.json()) == (503, 1)
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_not_hedged():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await request.aread()
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=request.content.decode())
+
+    async def body() -> typing.AsyncIterator[bytes]:
+        yield b'streamed'
+
+    hedger = Hedger(HedgePolicy(delay=0.01, max_ratio=1))
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url='http://example.com')
+    response = await hedger.send(client.send, client.build_request('GET', '/', content=body()))
+    assert response.json() == 'streamed'
+    assert calls == 1
+
+
+def test_percentile_delay():
+    hedger = Hedger(HedgePolicy(delay=1, percentile=0.9, min_samples=10, window=10))
+    for latency in range(9):
+        hedger.record(latency / 100)
+    assert hedger.delay() == 1
+
+    hedger.record(0.09)
+    assert hedger.delay() == 0.09
+
+
+def test_hedge_requires_idempotent_method():
+    with pytest.raises(ValueError):
+        post('/', hedge=HedgePolicy())
@@ -0,0 +1,132 @@
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, Lazy, ModelBase, Response, Responses, UnexpectedResponse, get, materialize
+from lapidary.runtime.model.lazy import LazyList, LazyModel
+
+
+class Toy(pydantic.BaseModel):
+    name: str
+    price: typing.Annotated[int, pydantic.Field(gt=0)]
+
+
+class Owner(ModelBase):
+    name: str
+    email: typing.Optional[str] = None
+
+
+class Cat(ModelBase):
+    id: int
+    owner: typing.Optional[Owner] = None
+    toys: list[Toy] = []
+    nick_name: str = pydantic.Field(alias='nickName')
+
+    @property
+    def label(self) -> str:
+        return f'{self.nick_name} #{self.id}'
+
+    def owned_by(self, name: str) -> bool:
+        return self.owner is not None and self.owner.name == name
+
+
+class LazyClient(ClientBase):
+    @get('/cat')
+    async def cat(
+        self: typing.Self,
+    ) -> typing.Annotated[
+        tuple[Cat, None],
+        Responses({'2XX': Response(Body({'application/json': typing.Annotated[Cat, Lazy]}))}),
+    ]:
+        pass
+
+    @get('/cats')
+    async def cats(
+        self: typing.Self,
+    ) -> typing.Annotated[
+        tuple[list[Cat], None],
+        Responses({'2XX': Response(Body({'application/json': typing.Annotated[list[Cat], Lazy]}))}),
+    ]:
+        pass
+
+
+CAT = {
+    'id': 1,
+    'nickName': 'Tom',
+    'owner': {'name': 'Jerry', 'extra': True},
+    'toys': [{'name': 'ball', 'price': 1}, {'name': 'broken', 'price': -1}],
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=CAT if request.url.path == '/cat' else [CAT, CAT])
+
+
+@pytest.fixture
+def client() -> LazyClient:
+    return LazyClient(transport=httpx.MockTransport(handler), base_url='http://example.com')
+
+
+@pytest.mark.asyncio
+async def test_lazy_model(client: LazyClient):
+    cat, _ = await client.cat()
+    assert isinstance(cat, LazyModel)
+    assert cat.id == 1
+    assert cat.nick_name == 'Tom'
+    assert isinstance(cat.owner, LazyModel)
+    assert cat.owner.name == 'Jerry'
+    assert cat.owner.email is None
+    assert cat.owner.extra is True
+    assert cat.owner is cat.owner
+
+    assert isinstance(cat.toys, LazyList)
+    assert cat.toys[0].price == 1
+    # invalid data is only reported when accessed
+    with pytest.raises(UnexpectedResponse) as exc_info:
+        cat.toys[1].price
+    error = exc_info.value.__cause__
+    assert isinstance(error, pydantic.ValidationError)
+    assert error.title == 'Toy'
+    assert [err['loc'] for err in error.errors()] == [('price',)]
+    with pytest.raises(UnexpectedResponse):
+        materialize(cat)
+
+
+@pytest.mark.asyncio
+async def test_lazy_model_class_attributes(client: LazyClient):
+    cat, _ = await client.cat()
+    assert isinstance(cat, Cat)
+    assert cat.label == 'Tom #1'
+    assert cat.owned_by('Jerry')
+    assert 'label' in dir(cat)
+    assert cat.owner.model_dump() == {'name': 'Jerry', 'email': None, 'extra': True}
+    with pytest.raises(UnexpectedResponse):
+        # validates the whole model
+        cat.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_lazy_list(client: LazyClient):
+    cats, _ = await client.cats()
+    assert isinstance(cats, LazyList)
+    assert len(cats) == 2
+    assert cats[1].owner.name == 'Jerry'
+    assert [cat.id for cat in cats] == [1, 1]
+
+
+def test_materialize():
+    cat = LazyModel(Cat, {'id': 2, 'nickName': 'Benny'})
+    assert materialize(cat) == Cat(id=2, nickName='Benny')
+    assert cat == Cat(id=2, nickName='Benny')
+    assert Cat(id=2, nickName='Benny') == cat
+    with pytest.raises(AttributeError):
+        cat.missing
+
+
+def test_invalid_field():
+    cat = LazyModel(Cat, {'id': 'one', 'nickName': 'Benny'})
+    with pytest.raises(pydantic.ValidationError) as exc_info:
+        cat.id
+    assert exc_info.value.title == 'Cat'
+    assert [err['loc'] for err in exc_info.value.errors()] == [('id',)]
@@ -0,0 +1,86 @@
+import asyncio
+
+import httpx
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import (
+    AIMD,
+    AdaptiveLimiter,
+    Body,
+    ClientBase,
+    ConcurrencyLimitExceeded,
+    Gradient,
+    HttpErrorResponse,
+    Response,
+    Responses,
+    Vegas,
+    get,
+)
+
+
+class LimitedClient(ClientBase):
+    @get('/cat')
+    async def cat(
+        self: typing.Self,
+    ) -> typing.Annotated[
+        tuple[str, None],
+        Responses({'2XX': Response(Body({'application/json': str})), '5XX': Response(Body({'application/json': str}))}),
+    ]:
+        pass
+
+
+def mk_client(limiter: AdaptiveLimiter, status: int = 200, delay: float = 0.0) -> LimitedClient:
+    async def handler(_: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        return httpx.Response(status, json='cat')
+
+    return LimitedClient(base_url='http://example.com', transport=httpx.MockTransport(handler), limiter=limiter)
+
+
+@pytest.mark.asyncio
+async def test_aimd_grows_when_used() -> None:
+    limiter = AdaptiveLimiter(AIMD(initial=2, max_limit=5))
+    client = mk_client(limiter, delay=0.01)
+    await asyncio.gather(*[client.cat() for _ in range(20)])
+    assert limiter.limit() == 5
+    assert limiter.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_aimd_backs_off_on_errors() -> None:
+    limiter = AdaptiveLimiter(AIMD(initial=10, backoff=0.5))
+    client = mk_client(limiter, status=503)
+    with pytest.raises(HttpErrorResponse):
+        await client.cat()
+    assert limiter.limit() == 5
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout() -> None:
+    limiter = AdaptiveLimiter(AIMD(initial=1, max_limit=1), queue_timeout=0.01)
+    client = mk_client(limiter, delay=0.1)
+    results = await asyncio.gather(client.cat(), client.cat(), return_exceptions=True)
+    assert results[0] == ('cat', None)
+    assert isinstance(results[1], ConcurrencyLimitExceeded)
+    assert limiter.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_per_host() -> None:
+    limiter = AdaptiveLimiter(AIMD(initial=3), per_host=True)
+    await mk_client(limiter).cat()
+    assert set(limiter.limits) == {'example.com'}
+
+
+def test_gradient_shrinks_on_latency_increase() -> None:
+    algorithm = Gradient(smoothing=1.0, tolerance=1.0)
+    limit = algorithm.update(100, 0.01, 50, False)
+    assert algorithm.update(limit, 0.1, 50, False) < limit
+
+
+def test_vegas() -> None:
+    algorithm = Vegas()
+    assert algorithm.update(100, 0.01, 50, False) > 100
+    assert algorithm.update(100, 1.0, 50, False) < 100
+    assert algorithm.update(100, 0.01, 50, True) < 100
@@ -0,0 +1,86 @@
+import asyncio
+import io
+import tracemalloc
+
+import httpx
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, MemoryProfiler, Response, Responses, get
+
+
+class ProfiledClient(ClientBase):
+    @get('/items')
+    async def items(
+        self: typing.Self,
+    ) -> typing.Annotated[
+        tuple[list[str], None],
+        Responses({'2XX': Response(Body({'application/json': list[str]}))}),
+    ]:
+        pass
+
+
+def handler(_: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=[f'item {idx}' for idx in range(1000)])
+
+
+@pytest.mark.asyncio
+async def test_attributes_allocations_to_phases() -> None:
+    profiler = MemoryProfiler(sample_rate=1)
+    client = ProfiledClient(base_url='http://example.com', transport=httpx.MockTransport(handler), memory_profiler=profiler)
+    for _ in range(3):
+        await client.items()
+
+    # kept running between calls
+    assert tracemalloc.is_tracing()
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
+    stats = {stats.phase: stats for stats in profiler.top()}
+    assert set(stats) == {'build', 'read', 'extract'}
+    assert all(entry.operation == 'items' and entry.samples == 3 for entry in stats.values())
+    # extracted list of strings is retained
+    assert stats['extract'].retained > 3 * 1000 * len('item 000')
+    assert profiler.top(1, 'peak')[0].peak >= stats['extract'].peak
+
+    out = io.StringIO()
+    profiler.dump(file=out)
+    assert 'items' in out.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_keep_their_peaks() -> None:
+    allocated = asyncio.Event()
+
+    async def slow_handler(_: httpx.Request) -> httpx.Response:
+        if not allocated.is_set():
+            # the first call allocates and frees a large buffer, and keeps reading
+            buffer = bytearray(10_000_000)
+            del buffer
+            allocated.set()
+            await asyncio.sleep(0.05)
+        return httpx.Response(200, json=[])
+
+    profiler = MemoryProfiler(sample_rate=1)
+    client = ProfiledClient(base_url='http://example.com', transport=httpx.MockTransport(slow_handler), memory_profiler=profiler)
+    slow = asyncio.ensure_future(client.items())
+    await allocated.wait()
+    # phases of this call start and end while the slow call is reading
+    await client.items()
+    await slow
+    profiler.stop()
+
+    assert profiler.top(1, 'peak')[0].peak >= 10_000_000
+    assert profiler.top(1, 'peak')[0].samples == 2
+
+
+@pytest.mark.asyncio
+async def test_unsampled() -> None:
+    profiler = MemoryProfiler(sample_rate=0.000001)
+    client = ProfiledClient(base_url='http://example.com', transport=httpx.MockTransport(handler), memory_profiler=profiler)
+    await client.items()
+    assert profiler.top() == []
+
+
+def test_sample_rate() -> None:
+    with pytest.raises(ValueError):
+        MemoryProfiler(sample_rate=0)
@@ -0,0 +1,63 @@
+import concurrent.futures
+import threading
+
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, Response, Responses, get
+
+threads: list[int] = []
+
+
+class Item(pydantic.BaseModel):
+    name: str
+
+    @pydantic.field_validator('name')
+    @classmethod
+    def record_thread(cls, value: str) -> str:
+        threads.append(threading.get_ident())
+        return value
+
+
+class OffloadClient(ClientBase):
+    @get('/items')
+    async def items(
+        self: typing.Self,
+    ) -> typing.Annotated[
+        tuple[list[Item], None],
+        Responses({'2XX': Response(Body({'application/json': list[Item]}))}),
+    ]:
+        pass
+
+
+def mk_client(base_url: str, executor: typing.Optional[concurrent.futures.Executor] = None) -> OffloadClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=[{'name': 'item'}] * (100 if request.url.host == 'large' else 1))
+
+    return OffloadClient(base_url=base_url, transport=httpx.MockTransport(handler), offload_threshold=1000, offload_executor=executor)
+
+
+@pytest.mark.asyncio
+async def test_small_body_inline() -> None:
+    threads.clear()
+    client = mk_client('http://small')
+    await client.items()
+    assert threads == [threading.get_ident()]
+
+
+@pytest.mark.asyncio
+async def test_large_body_offloaded() -> None:
+    threads.clear()
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        client = mk_client('http://large', executor)
+        items, _ = await client.items()
+    assert len(items) == 100
+    assert len(set(threads)) == 1
+    assert threads[0] != threading.get_ident()
+
+
+def test_process_pool_rejected() -> None:
+    with concurrent.futures.ProcessPoolExecutor(1) as executor, pytest.raises(TypeError):
+        mk_client('http://large', executor)
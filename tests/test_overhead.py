@@ -0,0 +1,95 @@
+"""Import and client construction overhead. Timing budgets are loose, to catch large regressions on slow CI machines."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import lapidary.runtime
+from lapidary.runtime import ClientBase
+from lapidary.runtime.model import pool
+
+IMPORT_BUDGET_MS = 1000
+CONSTRUCTION_BUDGET_MS = 50
+
+
+def run_python(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)},
+    ).stdout
+
+
+def test_optional_modules_not_imported() -> None:
+    loaded = run_python('import sys, lapidary.runtime; print(*sys.modules)').split()
+    for module in (
+        'httpx_auth',
+        'mimeparse',
+        'multiprocessing',
+        'h11',
+        'lapidary.runtime.sharding',
+        'lapidary.runtime.model.balancer',
+        'lapidary.runtime.model.hedge',
+        'lapidary.runtime.model.scheduler',
+        'lapidary.runtime.model.memprof',
+        'lapidary.runtime.model.codegen',
+    ):
+        assert module not in loaded
+
+
+def test_lazy_exports() -> None:
+    from lapidary.runtime import H11Transport, ShardedClient, priority
+
+    assert ShardedClient.__module__ == 'lapidary.runtime.sharding'
+    assert H11Transport.__module__ == 'lapidary.runtime.model.transport'
+    assert callable(priority)
+    assert set(lapidary.runtime.__all__) <= set(dir(lapidary.runtime))
+    with pytest.raises(AttributeError):
+        lapidary.runtime.missing  # noqa: B018
+
+
+def test_ssl_context_shared_per_settings() -> None:
+    assert pool.default_ssl_context(True, True, False) is pool.default_ssl_context(True, True, False)
+    assert pool.default_ssl_context(True, True, False) is not pool.default_ssl_context(True, True, True)
+    assert pool.default_ssl_context(True, True, True) is not pool.default_ssl_context(True, False, True)
+    assert pool.default_ssl_context(True, True, False) is not pool.default_ssl_context(False, True, False)
+
+
+class EmptyClient(ClientBase):
+    pass
+
+
+def test_custom_verify_kept(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    monkeypatch.setattr(pool, 'default_ssl_context', lambda *args: calls.append(args))
+    EmptyClient(base_url='https://example.com', verify=False)
+    assert calls == []
+    EmptyClient(base_url='https://example.com', http2=True)
+    assert calls == [(True, True, True)]
+
+
+@pytest.mark.benchmark
+def test_import_time() -> None:
+    start = time.perf_counter()
+    run_python('import lapidary.runtime')
+    with_package_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    run_python('import httpx, pydantic')
+    dependencies_ms = (time.perf_counter() - start) * 1000
+    assert with_package_ms - dependencies_ms < IMPORT_BUDGET_MS
+
+
+@pytest.mark.benchmark
+def test_construction_time() -> None:
+    EmptyClient(base_url='https://example.com')
+    count = 50
+    start = time.perf_counter()
+    for _ in range(count):
+        EmptyClient(base_url='https://example.com')
+    mean_ms = (time.perf_counter() - start) / count * 1000
+    assert mean_ms < CONSTRUCTION_BUDGET_MS
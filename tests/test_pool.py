@@ -0,0 +1,87 @@
+import asyncio
+
+import httpx
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, PoolGroup, Response, Responses, get
+
+
+class PoolClient(ClientBase):
+    @get('/export', pool='bulk')
+    async def export(self: typing.Self) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+    @get('/lookup')
+    async def lookup(self: typing.Self) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+    @get('/other')
+    async def other(self: typing.Self) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+
+class SessionRecorder:
+    def __init__(self, handler: typing.Callable) -> None:
+        self.handler = handler
+        self.kwargs: list[dict] = []
+
+    def __call__(self, **kwargs) -> httpx.AsyncClient:
+        self.kwargs.append(kwargs)
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler), **kwargs)
+
+
+def test_pool_sessions_created_lazily():
+    recorder = SessionRecorder(lambda request: httpx.Response(204))
+    limits = httpx.Limits(max_connections=2)
+    client = PoolClient(
+        session_factory=recorder,
+        pools={'bulk': PoolGroup(limits=limits, http2=True)},
+        base_url='http://example.com',
+    )
+    assert recorder.kwargs == [{'base_url': 'http://example.com'}]
+
+    session = client._sessions.session('bulk')
+    assert session is not client._client
+    assert recorder.kwargs[1] == {'base_url': 'http://example.com', 'limits': limits, 'http2': True}
+    assert client._sessions.session('bulk') is session
+
+
+def test_pool_assignment_from_client_config():
+    client = PoolClient(
+        session_factory=SessionRecorder(lambda request: httpx.Response(204)),
+        pools={'heavy': PoolGroup(operations=['export', 'other'])},
+    )
+    assert client._sessions.pool_name('export', 'bulk') == 'heavy'
+    assert client._sessions.pool_name('other', None) == 'heavy'
+    assert client._sessions.pool_name('lookup', None) is None
+
+
+@pytest.mark.asyncio
+async def test_pool_max_concurrency():
+    in_flight = 0
+    max_in_flight = 0
+    lookups_done = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        if request.url.path == '/export':
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await lookups_done.wait()
+            in_flight -= 1
+        return httpx.Response(204)
+
+    async with PoolClient(
+        session_factory=SessionRecorder(handler),
+        pools={'bulk': PoolGroup(max_concurrency=2)},
+        base_url='http://example.com',
+    ) as client:
+        exports = [asyncio.create_task(client.export()) for _ in range(5)]
+        await asyncio.sleep(0)
+        # lookups are not queued behind the saturated bulk group
+        await asyncio.gather(client.lookup(), client.other())
+        lookups_done.set()
+        await asyncio.gather(*exports)
+
+    assert max_in_flight == 2
@@ -0,0 +1,105 @@
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, Header, Path, Query, Response, Responses, StaleWhileRevalidate, get
+
+
+class Cat(pydantic.BaseModel):
+    id: int
+
+
+class CatClient(ClientBase):
+    @get('/{tenant}/cats/{cat_id}')
+    async def get_cat(
+        self: typing.Self,
+        tenant: typing.Annotated[str, Path],
+        cat_id: typing.Annotated[int, Path],
+        version: typing.Annotated[str, Header('X-Version')],
+        limit: typing.Annotated[typing.Optional[int], Query, pydantic.Field(gt=0)] = None,
+    ) -> typing.Annotated[Cat, Responses({'2XX': Response(Body({'application/json': Cat}))})]:
+        pass
+
+    @get('/cached/{cat_id}', swr=StaleWhileRevalidate(ttl=60))
+    async def get_cached(
+        self: typing.Self,
+        tenant: typing.Annotated[str, Header('X-Tenant')],
+        cat_id: typing.Annotated[int, Path],
+    ) -> typing.Annotated[Cat, Responses({'2XX': Response(Body({'application/json': Cat}))})]:
+        pass
+
+
+def mk_client(requests: list[httpx.Request]) -> CatClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={'id': int(request.url.path.rsplit('/', 1)[-1])})
+
+    return CatClient(base_url='http://example.com', transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_prepared_call_same_as_full_call() -> None:
+    requests: list[httpx.Request] = []
+    async with mk_client(requests) as client:
+        get_cat = client.lapidary_prepare(client.get_cat, tenant='acme', version='2', limit=10)
+        assert await get_cat(cat_id=1) == (Cat(id=1), None)
+        assert await get_cat(cat_id=2) == (Cat(id=2), None)
+        assert await client.get_cat(tenant='acme', version='2', limit=10, cat_id=3) == (Cat(id=3), None)
+
+    assert [str(request.url) for request in requests] == [
+        'http://example.com/acme/cats/1?limit=10',
+        'http://example.com/acme/cats/2?limit=10',
+        'http://example.com/acme/cats/3?limit=10',
+    ]
+    assert [request.headers['X-Version'] for request in requests] == ['2', '2', '2']
+
+
+@pytest.mark.asyncio
+async def test_prepare_again() -> None:
+    requests: list[httpx.Request] = []
+    async with mk_client(requests) as client:
+        for_tenant = client.lapidary_prepare(client.get_cat, tenant='acme')
+        get_cat = client.lapidary_prepare(for_tenant, version='3')
+        await get_cat(cat_id=1)
+        await for_tenant(cat_id=2, version='4')
+
+    assert [(str(request.url), request.headers['X-Version']) for request in requests] == [
+        ('http://example.com/acme/cats/1', '3'),
+        ('http://example.com/acme/cats/2', '4'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_prepare_validates_bound_arguments() -> None:
+    async with mk_client([]) as client:
+        with pytest.raises(TypeError):
+            client.lapidary_prepare(client.get_cat, limit=0)
+        with pytest.raises(TypeError):
+            client.lapidary_prepare(client.get_cat, color='black')
+        with pytest.raises(TypeError):
+            client.lapidary_prepare(lambda: None)
+
+
+@pytest.mark.asyncio
+async def test_prepared_call_rejects_bound_and_missing_arguments() -> None:
+    async with mk_client([]) as client:
+        get_cat = client.lapidary_prepare(client.get_cat, tenant='acme', version='2')
+        with pytest.raises(TypeError):
+            await get_cat(cat_id=1, tenant='other')
+        with pytest.raises(TypeError):
+            await get_cat()
+
+
+@pytest.mark.asyncio
+async def test_prepared_call_cache_key_includes_bound_arguments() -> None:
+    requests: list[httpx.Request] = []
+    async with mk_client(requests) as client:
+        tenant_a = client.lapidary_prepare(client.get_cached, tenant='a')
+        tenant_b = client.lapidary_prepare(client.get_cached, tenant='b')
+        await tenant_a(cat_id=1)
+        await tenant_a(cat_id=1)
+        await tenant_b(cat_id=1)
+        await client.get_cached(tenant='a', cat_id=1)
+
+    assert [request.headers['X-Tenant'] for request in requests] == ['a', 'b']
@@ -0,0 +1,93 @@
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, ModelBase, Projection, Query, Response, Responses, get
+
+
+class Owner(ModelBase):
+    name: str
+    email: str
+
+
+class Cat(ModelBase):
+    id: int
+    nick_name: str = pydantic.Field(alias='nickName')
+    owner: typing.Optional[Owner] = None
+    weight: int
+
+
+class CatSummary(ModelBase):
+    id: int
+
+
+class ProjectionClient(ClientBase):
+    @get('/cats')
+    async def cats(
+        self: typing.Self,
+    ) -> typing.Annotated[
+        tuple[list[Cat], None],
+        Responses(
+            {'2XX': Response(Body({'application/json': typing.Annotated[list[Cat], Projection({'nick_name', 'owner.name'}, 'fields')]}))}
+        ),
+    ]:
+        pass
+
+    @get('/cat')
+    async def cat(
+        self: typing.Self,
+        fields: typing.Annotated[typing.Optional[str], Query] = None,
+    ) -> typing.Annotated[
+        tuple[CatSummary, None],
+        Responses({'2XX': Response(Body({'application/json': typing.Annotated[Cat, Projection(CatSummary, 'fields')]}))}),
+    ]:
+        pass
+
+
+CAT = {'id': 1, 'nickName': 'Tom', 'owner': {'name': 'Jerry', 'email': None}, 'weight': 'heavy'}
+
+
+@pytest.fixture
+def requests() -> list[httpx.Request]:
+    return []
+
+
+@pytest.fixture
+def client(requests: list[httpx.Request]) -> ProjectionClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=[CAT] if request.url.path == '/cats' else CAT)
+
+    return ProjectionClient(base_url='http://example.com', transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_skips_fields_outside_projection(client: ProjectionClient, requests: list[httpx.Request]) -> None:
+    cats, _ = await client.cats()
+    assert len(cats) == 1
+    assert cats[0].nick_name == 'Tom'
+    assert cats[0].owner.name == 'Jerry'
+    assert not hasattr(cats[0], 'weight')
+    assert not hasattr(cats[0].owner, 'email')
+    assert requests[0].url.params['fields'] == 'nickName,owner.name'
+
+
+@pytest.mark.asyncio
+async def test_projection_model(client: ProjectionClient, requests: list[httpx.Request]) -> None:
+    cat, _ = await client.cat()
+    assert isinstance(cat, CatSummary)
+    assert cat.id == 1
+    assert not hasattr(cat, 'weight')
+    assert requests[0].url.params['fields'] == 'id'
+
+
+@pytest.mark.asyncio
+async def test_explicit_query_param_wins(client: ProjectionClient, requests: list[httpx.Request]) -> None:
+    await client.cat(fields='id,weight')
+    assert requests[0].url.params.get_list('fields') == ['id,weight']
+
+
+def test_unknown_field() -> None:
+    with pytest.raises(TypeError):
+        Projection({'name'}).projected_type(Cat)
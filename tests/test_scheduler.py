@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, Path, Priority, PriorityScheduler, RequestShed, Response, Responses, get, priority
+
+
+class CatClient(ClientBase):
+    @get('/cat/{id}')
+    async def cat(
+        self: typing.Self,
+        id: typing.Annotated[int, Path],
+    ) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+    @get('/report/{id}', priority=Priority.BACKGROUND)
+    async def report(
+        self: typing.Self,
+        id: typing.Annotated[int, Path],
+    ) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+
+def mk_client(scheduler: PriorityScheduler, paths: list[str], delay: float = 0.02) -> CatClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        await asyncio.sleep(delay)
+        return httpx.Response(204)
+
+    return CatClient(base_url='http://example.com', transport=httpx.MockTransport(handler), scheduler=scheduler)
+
+
+@pytest.mark.asyncio
+async def test_high_priority_first() -> None:
+    scheduler = PriorityScheduler(max_in_flight=1)
+    paths: list[str] = []
+    client = mk_client(scheduler, paths)
+
+    async def interactive(idx: int) -> None:
+        with priority(Priority.INTERACTIVE):
+            await client.cat(id=idx)
+
+    first = asyncio.ensure_future(client.cat(id=0))
+    await asyncio.sleep(0)
+    calls = [client.report(id=1), client.cat(id=2), interactive(3), client.report(id=4)]
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    await asyncio.sleep(0)
+    assert scheduler.queued == 4
+    await asyncio.gather(first, *tasks)
+
+    assert paths == ['/cat/0', '/cat/3', '/cat/2', '/report/1', '/report/4']
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_shed_low_priority() -> None:
+    scheduler = PriorityScheduler(max_in_flight=1, shed_after=0.05)
+    paths: list[str] = []
+    client = mk_client(scheduler, paths, delay=0.2)
+
+    tasks = [asyncio.ensure_future(client.cat(id=0)), asyncio.ensure_future(client.cat(id=1))]
+    await asyncio.sleep(0)
+    with pytest.raises(RequestShed):
+        await client.report(id=2)
+    # the normal priority request has been waiting too long already, so background ones fail right away
+    with pytest.raises(RequestShed):
+        await asyncio.wait_for(client.report(id=3), 0.01)
+    await asyncio.gather(*tasks)
+
+    assert paths == ['/cat/0', '/cat/1']
+    assert scheduler.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter() -> None:
+    scheduler = PriorityScheduler(max_in_flight=1)
+    client = mk_client(scheduler, [])
+
+    first = asyncio.ensure_future(client.cat(id=0))
+    await asyncio.sleep(0)
+    waiting = asyncio.ensure_future(client.cat(id=1))
+    await asyncio.sleep(0)
+    assert scheduler.queued == 1
+    waiting.cancel()
+    await first
+
+    assert scheduler.queued == 0
+    assert scheduler.in_flight == 0
@@ -0,0 +1,161 @@
+import asyncio
+import multiprocessing
+import pickle
+import threading
+
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import (
+    Body,
+    ClientBase,
+    HttpErrorResponse,
+    Path,
+    Response,
+    Responses,
+    ShardedClient,
+    deadline,
+    get,
+    priority,
+    sharding,
+)
+from lapidary.runtime.model.error import DeadlineExceeded
+from lapidary.runtime.model.scheduler import resolve_priority
+
+
+class Cat(pydantic.BaseModel):
+    id: int
+    thread: str
+
+
+class CatClient(ClientBase):
+    @get('/cat/{id}')
+    async def cat(
+        self: typing.Self,
+        id: typing.Annotated[int, Path],
+    ) -> typing.Annotated[
+        Cat,
+        Responses(
+            {
+                '2XX': Response(Body({'application/json': Cat})),
+                '4XX': Response(Body({'application/json': Cat})),
+            }
+        ),
+    ]:
+        pass
+
+
+# ids with special behaviour
+SLOW = -1
+CANCELLABLE = -2
+CANCELLED_COUNT = 1000
+PRIORITY = 1001
+
+cancelled: list[int] = []
+
+
+async def handle(request: httpx.Request) -> httpx.Response:
+    cat_id = int(request.url.path.rsplit('/', 1)[-1])
+    if cat_id == SLOW:
+        await asyncio.sleep(1)
+    elif cat_id == CANCELLABLE:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(cat_id)
+            raise
+    elif cat_id == CANCELLED_COUNT:
+        cat_id = len(cancelled)
+    elif cat_id == PRIORITY:
+        cat_id = resolve_priority(None)
+    return httpx.Response(404 if cat_id == 404 else 200, json={'id': cat_id, 'thread': threading.current_thread().name})
+
+
+def mk_client() -> CatClient:
+    return CatClient(base_url='http://example.com', transport=httpx.MockTransport(handle))
+
+
+@pytest.mark.asyncio
+async def test_thread_shards() -> None:
+    async with ShardedClient(mk_client, shards=2, mode='thread') as sharded:
+        results = await asyncio.gather(*(sharded.cat(id=idx) for idx in range(10)))
+        assert sharded.in_flight == [0, 0]
+
+    assert [cat.id for cat, _ in results] == list(range(10))
+    assert {cat.thread for cat, _ in results} == {'lapidary-shard-0', 'lapidary-shard-1'}
+
+
+@pytest.mark.asyncio
+async def test_thread_shard_errors_and_deadline() -> None:
+    async with ShardedClient(mk_client, shards=1, mode='thread') as sharded:
+        with pytest.raises(HttpErrorResponse) as error:
+            await sharded.call('cat', id=404)
+        assert error.value.status_code == 404
+
+        with pytest.raises(DeadlineExceeded), deadline(0.05):
+            await sharded.cat(id=SLOW)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('mode', ['thread', 'process'])
+async def test_context_and_cancellation(mode: sharding.Mode) -> None:
+    async with ShardedClient(mk_client, shards=1, mode=mode) as sharded:
+        with priority(42):
+            cat, _ = await sharded.cat(id=PRIORITY)
+        assert cat.id == 42
+
+        count, _ = await sharded.cat(id=CANCELLED_COUNT)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(sharded.cat(id=CANCELLABLE), 0.2)
+        # the call in the shard is cancelled, instead of running to the end
+        for _ in range(50):
+            count_after, _ = await sharded.cat(id=CANCELLED_COUNT)
+            if count_after.id > count.id:
+                break
+            await asyncio.sleep(0.01)
+        assert count_after.id == count.id + 1
+        assert sharded.in_flight == [0]
+
+
+@pytest.mark.asyncio
+async def test_process_shards() -> None:
+    async with ShardedClient(mk_client, shards=2, mode='process') as sharded:
+        results = await asyncio.gather(*(sharded.cat(id=idx) for idx in range(4)))
+        with pytest.raises(HttpErrorResponse) as error:
+            await sharded.cat(id=404)
+
+    assert [cat.id for cat, _ in results] == list(range(4))
+    assert error.value.body == Cat(id=404, thread='MainThread')
+
+
+@pytest.mark.asyncio
+async def test_closed() -> None:
+    sharded = ShardedClient(mk_client, shards=1, mode='thread')
+    with pytest.raises(RuntimeError):
+        await sharded.cat(id=1)
+
+
+def test_errors_pickle() -> None:
+    error = pickle.loads(pickle.dumps(HttpErrorResponse(404, None, Cat(id=1, thread=''))))
+    assert (error.status_code, error.body) == (404, Cat(id=1, thread=''))
+
+
+def test_shard_process_stops_when_parent_dies() -> None:
+    parent_conn, child_conn = multiprocessing.Pipe()
+    clients: list[CatClient] = []
+
+    def factory() -> CatClient:
+        clients.append(mk_client())
+        return clients[-1]
+
+    serve = threading.Thread(target=sharding._serve, args=(factory, child_conn), daemon=True)
+    serve.start()
+    assert parent_conn.recv() == (0, True, None)
+    # closed without sending the stop message
+    parent_conn.close()
+    serve.join(5)
+
+    assert not serve.is_alive()
+    assert clients[0]._client.is_closed
@@ -0,0 +1,82 @@
+import asyncio
+
+import httpx
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, Query, Response, Responses, StaleWhileRevalidate, get
+
+
+class ConfigClient(ClientBase):
+    @get('/config', swr=StaleWhileRevalidate(ttl=0.05, max_stale=10, error_backoff=10))
+    async def config(
+        self: typing.Self,
+        section: typing.Annotated[str, Query],
+    ) -> typing.Annotated[
+        tuple[int, None],
+        Responses({'2XX': Response(Body({'application/json': int})), '5XX': Response(Body({'application/json': int}))}),
+    ]:
+        pass
+
+
+class Upstream:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.version = 1
+        self.status = 200
+        self.delay = delay
+        self.requests: list[httpx.Request] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        await asyncio.sleep(self.delay)
+        return httpx.Response(self.status, json=self.version)
+
+
+def mk_client(upstream: Upstream) -> ConfigClient:
+    return ConfigClient(base_url='http://example.com', transport=httpx.MockTransport(upstream))
+
+
+@pytest.mark.asyncio
+async def test_serves_stale_and_refreshes() -> None:
+    upstream = Upstream()
+    async with mk_client(upstream) as client:
+        assert await asyncio.gather(client.config(section='a'), client.config(section='a')) == [(1, None), (1, None)]
+        assert len(upstream.requests) == 1
+
+        await client.config(section='b')
+        assert len(upstream.requests) == 2
+
+        upstream.version = 2
+        await asyncio.sleep(0.06)
+        # stale result, refresh started
+        assert await client.config(section='a') == (1, None)
+        await asyncio.sleep(0.01)
+        assert await client.config(section='a') == (2, None)
+        assert len(upstream.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_error_keeps_stale_result() -> None:
+    upstream = Upstream()
+    async with mk_client(upstream) as client:
+        await client.config(section='a')
+        upstream.status = 500
+        await asyncio.sleep(0.06)
+        assert await client.config(section='a') == (1, None)
+        await asyncio.sleep(0.01)
+        # backing off
+        assert await client.config(section='a') == (1, None)
+        assert len(upstream.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_cancelled_on_exit() -> None:
+    upstream = Upstream()
+    async with mk_client(upstream) as client:
+        await client.config(section='a')
+        upstream.delay = 10
+        await asyncio.sleep(0.06)
+        await client.config(section='a')
+        tasks = set(client._refresher._tasks)
+        assert len(tasks) == 1
+    assert all(task.cancelled() for task in tasks)
@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, H11Transport, Response, Responses, get, post
+
+
+class Cat(pydantic.BaseModel):
+    name: str
+
+
+class CatClient(ClientBase):
+    @get('/cat')
+    async def get_cat(
+        self: typing.Self,
+    ) -> typing.Annotated[Cat, Responses({'2XX': Response(Body({'application/json': Cat}))})]:
+        pass
+
+    @post('/cat')
+    async def add_cat(
+        self: typing.Self,
+        cat: typing.Annotated[Cat, Body({'application/json': Cat})],
+    ) -> typing.Annotated[Cat, Responses({'2XX': Response(Body({'application/json': Cat}))})]:
+        pass
+
+
+class Server:
+    """Minimal HTTP/1.1 server answering with the request body, or a fixed cat."""
+
+    def __init__(self, close: bool = False, delay: float = 0.0) -> None:
+        self.close = close
+        self.delay = delay
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while head := await reader.readuntil(b'\r\n\r\n'):
+                lines = head.decode().split('\r\n')
+                headers = dict(line.lower().split(': ', 1) for line in lines[1:] if line)
+                content = await reader.readexactly(int(headers.get('content-length', 0)))
+                await asyncio.sleep(self.delay)
+                body = content or json.dumps({'name': 'Tom'}).encode()
+                connection = 'close' if self.close else 'keep-alive'
+                response_headers = f'content-type: application/json\r\ncontent-length: {len(body)}\r\nconnection: {connection}\r\n'
+                writer.write(f'HTTP/1.1 200 OK\r\n{response_headers}\r\n'.encode() + body)
+                await writer.drain()
+                if self.close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # client closed the connection, or the test ended
+            pass
+        finally:
+            writer.close()
+
+
+async def start(server: Server) -> tuple[asyncio.Server, str]:
+    tcp_server = await asyncio.start_server(server.handle, '127.0.0.1', 0)
+    port = tcp_server.sockets[0].getsockname()[1]
+    return tcp_server, f'http://127.0.0.1:{port}'
+
+
+@pytest.mark.asyncio
+async def test_keep_alive() -> None:
+    server = Server()
+    tcp_server, base_url = await start(server)
+    async with tcp_server, CatClient(base_url=base_url, transport=H11Transport()) as client:
+        assert await client.get_cat() == (Cat(name='Tom'), None)
+        assert await client.add_cat(cat=Cat(name='Felix')) == (Cat(name='Felix'), None)
+        assert await client.get_cat() == (Cat(name='Tom'), None)
+
+    assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_connection_close() -> None:
+    server = Server(close=True)
+    tcp_server, base_url = await start(server)
+    async with tcp_server, CatClient(base_url=base_url, transport=H11Transport()) as client:
+        await client.get_cat()
+        await client.get_cat()
+
+    assert server.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_and_keepalive_limit() -> None:
+    server = Server(delay=0.05)
+    tcp_server, base_url = await start(server)
+    transport = H11Transport(max_keepalive_connections=2)
+    async with tcp_server, CatClient(base_url=base_url, transport=transport) as client:
+        await asyncio.gather(*(client.get_cat() for _ in range(4)))
+        assert server.connections == 4
+        assert sum(len(idle) for idle in transport._idle.values()) == 2
+
+    assert not transport._idle
+
+
+@pytest.mark.asyncio
+async def test_errors() -> None:
+    server = Server(delay=1)
+    tcp_server, base_url = await start(server)
+    async with tcp_server, CatClient(base_url=base_url, transport=H11Transport(), timeout=0.05) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get_cat()
+
+    async with CatClient(base_url=base_url, transport=H11Transport()) as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.get_cat()
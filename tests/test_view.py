@@ -0,0 +1,48 @@
+import httpx
+import httpx_auth
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, Header, Response, Responses, get
+
+
+class TenantClient(ClientBase):
+    @get('/cat', security=[{'api_key': []}])
+    async def cat(
+        self: typing.Self,
+        trace: typing.Annotated[typing.Optional[str], Header('X-Trace')] = None,
+    ) -> typing.Annotated[tuple[None, None], Responses({'2XX': Response(Body({}))})]:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_views_share_sessions() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(204)
+
+    async with TenantClient(base_url='http://example.com', transport=httpx.MockTransport(handler)) as parent:
+        async with parent.lapidary_view(headers={'X-Tenant': 'a', 'X-Trace': 'default'}) as tenant_a:
+            tenant_a.lapidary_authenticate(api_key=httpx_auth.HeaderApiKey('key-a', 'Authorization'))
+            await tenant_a.cat()
+            await tenant_a.cat(trace='call')
+
+        tenant_b = parent.lapidary_view(headers={'X-Tenant': 'b'})
+        tenant_b.lapidary_authenticate(api_key=httpx_auth.HeaderApiKey('key-b', 'Authorization'))
+        await tenant_b.cat()
+
+        assert tenant_a._client is parent._client
+        assert not parent._client.is_closed
+
+        with pytest.raises(ValueError):
+            await parent.cat()
+
+    assert [(request.headers['X-Tenant'], request.headers['Authorization'], request.headers['X-Trace']) for request in requests[:2]] == [
+        ('a', 'key-a', 'default'),
+        ('a', 'key-a', 'call'),
+    ]
+    assert requests[2].headers['X-Tenant'] == 'b'
+    assert requests[2].headers['Authorization'] == 'key-b'
+    assert 'X-Trace' not in requests[2].headers
@@ -0,0 +1,106 @@
+import asyncio
+
+import httpx
+import pydantic
+import pytest
+import typing_extensions as typing
+
+from lapidary.runtime import Body, ClientBase, H11Transport, Lazy, PoolGroup, Response, Responses, get
+from lapidary.runtime.model import lazy
+
+
+class Toy(pydantic.BaseModel):
+    name: typing.Annotated[str, pydantic.Field(min_length=1)]
+
+
+class Cat(pydantic.BaseModel):
+    toys: list[Toy]
+
+
+class WarmClient(ClientBase):
+    @get('/cats')
+    async def cats(
+        self: typing.Self,
+    ) -> typing.Annotated[tuple[list[str], None], Responses({'2XX': Response(Body({'application/json': list[str]}))})]:
+        pass
+
+    @get('/cat')
+    async def cat(
+        self: typing.Self,
+    ) -> typing.Annotated[tuple[Cat, None], Responses({'2XX': Response(Body({'application/json': typing.Annotated[Cat, Lazy]}))})]:
+        pass
+
+    @get('/dogs', pool='bulk')
+    async def dogs(
+        self: typing.Self,
+    ) -> typing.Annotated[tuple[list[str], None], Responses({'2XX': Response(Body({'application/json': list[str]}))})]:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_warm_up() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(404)
+
+    client = WarmClient(
+        base_url='http://example.com/api',
+        transport=httpx.MockTransport(handler),
+        pools={'bulk': PoolGroup(max_concurrency=1)},
+    )
+    await client.lapidary_warm_up(connections=2, urls=['http://other.example.com/'])
+    assert [(request.method, str(request.url)) for request in requests] == [
+        ('HEAD', 'http://example.com/api/'),
+    ] * 4 + [('HEAD', 'http://other.example.com/')] * 2
+
+
+def test_operation_compiled_on_definition() -> None:
+    assert WarmClient.cats.lapidary_plan._compiled is not None  # type: ignore[attr-defined]
+
+    with pytest.raises(TypeError):
+
+        class BadClient(ClientBase):
+            @get('/cats')
+            async def cats(self: typing.Self) -> typing.Annotated[tuple[list[str], None], None]:
+                pass
+
+
+@pytest.mark.asyncio
+async def test_warm_up_builds_lazy_validators() -> None:
+    client = WarmClient(transport=httpx.MockTransport(lambda _: httpx.Response(200)))
+    lazy._cached_type_adapter.cache_clear()
+
+    await client.lapidary_warm_up()
+
+    built = lazy._cached_type_adapter.cache_info().currsize
+    cat = lazy.LazyModel(Cat, {'toys': [{'name': 'ball'}]})
+    assert cat.toys[0].name == 'ball'
+    assert lazy._cached_type_adapter.cache_info().currsize == built
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('transport', [None, H11Transport])
+async def test_warm_up_opens_connections(transport: typing.Optional[type[H11Transport]]) -> None:
+    connections = 0
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        nonlocal connections
+        connections += 1
+        try:
+            while await reader.readuntil(b'\r\n\r\n'):
+                await asyncio.sleep(0.02)
+                writer.write(b'HTTP/1.1 204 No Content\r\n\r\n')
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    kwargs = {'transport': transport()} if transport else {}
+    async with server, WarmClient(base_url=f'http://127.0.0.1:{port}', **kwargs) as client:
+        await client.lapidary_warm_up(connections=3)
+        assert connections == 3